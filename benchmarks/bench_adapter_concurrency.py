@@ -0,0 +1,70 @@
+"""
+Measure run throughput of the openai adapter against the local Responses stub.
+
+    python benchmarks/bench_adapter_concurrency.py [--cases 200] [--latency lognormal:80,0.6]
+
+Starts the stub server in-process, points OPENAI_BASE_URL at it and runs
+run_eval over a synthetic dataset at several --concurrency levels. Nothing
+leaves the machine and no API key is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from eval_harness.adapters.stub_server import StubConfig, make_stub_server
+from eval_harness.core.runner import run_eval
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=200)
+    ap.add_argument("--latency", default="lognormal:80,0.6")
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = ap.parse_args()
+
+    config = StubConfig(latency=args.latency, rate_limit_rate=args.rate_limit_rate, seed=0)
+    server = make_stub_server(config=config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.update(
+        OPENAI_API_KEY="stub", OPENAI_MODEL="gpt-4o-mini", OPENAI_BASE_URL=server.base_url
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = Path(tmp) / "bench.jsonl"
+        dataset.write_text(
+            "".join(
+                json.dumps({"id": f"c{i}", "input": {"text": f"Marc will send email {i}."}}) + "\n"
+                for i in range(args.cases)
+            ),
+            encoding="utf-8",
+        )
+        print(f"{'concurrency':>11} {'seconds':>8} {'cases/s':>8}  ({args.latency})")
+        for c in args.concurrency:
+            start = time.perf_counter()
+            run_eval(
+                dataset_path=str(dataset),
+                prompt_path=str(REPO_ROOT / "prompts" / "task_extraction" / "v1.md"),
+                schema_path=str(REPO_ROOT / "schemas" / "task_extraction.schema.json"),
+                adapter_name="openai",
+                out_dir=tmp,
+                concurrency=c,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{c:>11} {elapsed:>8.2f} {args.cases / elapsed:>8.1f}")
+
+    print("stub counts:", dict(server.state.counts))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare JSON backends on harness-shaped workloads.
+
+    python benchmarks/bench_json_backends.py [--cases 200000]
+
+Measures dataset line parsing (load_jsonl's hot loop), report serialization
+(indent=2, as run_eval writes it) and adapter-output parsing for the stdlib and,
+if installed, orjson backends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from eval_harness.core import jsonio
+
+
+def _dataset_lines(n: int) -> list[bytes]:
+    line = {
+        "id": "",
+        "input": {"text": "Action items: Marc to send the project update email by Friday."},
+        "expected": {
+            "tasks": [
+                {
+                    "title": "Send update email",
+                    "assignee": "Marc",
+                    "due_date": None,
+                    "confidence": 0.85,
+                }
+            ]
+        },
+        "meta": {"tags": ["happy-path"]},
+    }
+    out = []
+    for i in range(n):
+        line["id"] = f"case-{i:07d}"
+        out.append(json.dumps(line).encode("utf-8"))
+    return out
+
+
+def _report(n: int) -> dict:
+    results = [
+        {
+            "id": f"case-{i:07d}",
+            "schema_valid": True,
+            "schema_errors": [],
+            "exact_match": i % 3 == 0,
+            "f1": (i % 7) / 7,
+            "latency_ms": 40 + i % 50,
+            "usage": {"input_tokens": 320, "output_tokens": 60},
+            "cost_usd": 0.000123 + i * 1e-9,
+            "output_fingerprint": f"{i:032x}",
+        }
+        for i in range(n)
+    ]
+    return {"meta": {"run_id": "run-bench"}, "summary": {"total": n}, "results": results}
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=200_000)
+    args = ap.parse_args()
+
+    lines = _dataset_lines(args.cases)
+    report = _report(args.cases)
+    outputs = [
+        b'{"tasks": [{"title": "x", "assignee": "y", "due_date": null, "confidence": 0.5}]}'
+    ] * args.cases
+
+    backends = [jsonio.STDLIB]
+    try:
+        backends.append(jsonio.get_backend("orjson"))
+    except ValueError:
+        print("orjson not installed; only the stdlib backend is measured")
+
+    print(
+        f"{'backend':<8} {'dataset':>10} {'report':>10} {'outputs':>10}  (seconds, {args.cases} cases)"
+    )
+    for b in backends:
+        t_dataset = _time(lambda: [b.loads(x) for x in lines])
+        t_report = _time(lambda: b.dumps_pretty(report))
+        t_outputs = _time(lambda: [b.loads(x) for x in outputs])
+        print(f"{b.name:<8} {t_dataset:>10.3f} {t_report:>10.3f} {t_outputs:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
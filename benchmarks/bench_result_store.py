@@ -0,0 +1,118 @@
+"""
+Compare peak memory of holding a run's results as a list of row dicts (as
+run_eval did) with the ResultStore, including writing the report.
+
+    python benchmarks/bench_result_store.py [--cases 1000000]
+
+Each layout runs in a fresh subprocess, so its peak RSS (ru_maxrss) is its own.
+Rows are shaped like an OpenAI-adapter run: Responses API usage, cost, a
+fingerprint and, for some cases, schema errors. The dict layout writes the report
+as before (one dumps_pretty over the whole report); the store streams it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+from eval_harness.core import jsonio
+from eval_harness.core.result_store import ResultStore
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+_ERRORS = ["'title' is a required property", "None is not of type 'string'"]
+
+
+def _row(i: int) -> dict[str, Any]:
+    invalid = i % 20 == 0
+    return {
+        "id": f"case-{i:07d}",
+        "schema_valid": not invalid,
+        "schema_errors": list(_ERRORS) if invalid else [],
+        "exact_match": i % 3 == 0,
+        "f1": (i % 7) / 7,
+        "latency_ms": 40 + i % 50,
+        "usage": {
+            "input_tokens": 320 + i % 40,
+            "input_tokens_details": {"cached_tokens": 256},
+            "output_tokens": 60 + i % 25,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": 380 + i % 65,
+        },
+        "cost_usd": 0.000123 + i * 1e-9,
+        "output_fingerprint": hashlib.blake2b(str(i).encode(), digest_size=16).hexdigest(),
+    }
+
+
+def _peak_mb() -> float:
+    assert resource is not None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _measure(layout: str, cases: int) -> dict[str, float]:
+    start = time.perf_counter()
+    if layout == "dicts":
+        rows: Any = [_row(i) for i in range(cases)]
+    else:
+        rows = ResultStore()
+        for i in range(cases):
+            rows.append(_row(i))
+    collected = time.perf_counter()
+    collect_mb = _peak_mb()
+
+    meta = {"run_id": "run-bench"}
+    summary = {"total": cases}
+    with open(os.devnull, "w", encoding="utf-8") as f:
+        if layout == "dicts":
+            f.write(jsonio.dumps_pretty({"meta": meta, "summary": summary, "results": rows}))
+        else:
+            jsonio.write_pretty(f, {"meta": meta, "summary": summary}, "results", rows)
+    return {
+        "collect_s": collected - start,
+        "write_s": time.perf_counter() - collected,
+        "collect_peak_mb": collect_mb,
+        "write_peak_mb": _peak_mb(),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=1_000_000)
+    ap.add_argument("--layout", choices=["dicts", "store"], help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if resource is None:
+        sys.exit("peak RSS needs the resource module (Linux/macOS)")
+    if args.layout:
+        print(json.dumps(_measure(args.layout, args.cases)))
+        return
+
+    print(f"{'layout':<6} {'collect':>9} {'write':>9} {'peak RSS':>10} {'+ write':>10}")
+    print(f"{'':<6} {'(s)':>9} {'(s)':>9} {'(MB)':>10} {'(MB)':>10}   {args.cases} cases")
+    for layout in ("dicts", "store"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--cases", str(args.cases), "--layout", layout],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        m = json.loads(out)
+        print(
+            f"{layout:<6} {m['collect_s']:>9.2f} {m['write_s']:>9.2f} "
+            f"{m['collect_peak_mb']:>10.0f} {m['write_peak_mb']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Time the task_f1 scorer on cases with hundreds of tasks whose titles share words.
+
+    python benchmarks/bench_task_match.py [--tasks 50 100 200 300 600]
+
+Every title starts with "follow up on the", so all tasks of a case fall into one
+connected component. Components above MAX_EXACT_ASSIGNMENT_WORK are matched
+greedily; --exact-only raises the bound so the whole case goes through the
+Hungarian solver, for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from eval_harness.core import metrics
+
+
+def _case(rng: random.Random, n: int) -> dict[str, Any]:
+    words = [f"w{i}" for i in range(400)]
+    return {
+        "tasks": [
+            {
+                "title": "follow up on the " + " ".join(rng.sample(words, 3)),
+                "assignee": rng.choice(["marc", "nina"]),
+                "due_date": None,
+            }
+            for _ in range(n)
+        ]
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, nargs="+", default=[50, 100, 200, 300, 600])
+    ap.add_argument("--exact-only", action="store_true")
+    args = ap.parse_args()
+    if args.exact_only:
+        metrics.MAX_EXACT_ASSIGNMENT_WORK = float("inf")
+
+    rng = random.Random(1)
+    print(f"{'tasks':>6} {'seconds':>9} {'f1':>8}")
+    for n in args.tasks:
+        pred, exp = _case(rng, n), _case(rng, n)
+        start = time.perf_counter()
+        score = metrics.task_match(pred, exp)
+        print(f"{n:>6} {time.perf_counter() - start:>9.3f} {score.f1:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import threading
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Protocol
+from typing import Any, Optional, Protocol
 
 
 @dataclass(frozen=True)
@@ -12,9 +14,33 @@ class ModelResult:
     # Adapters must normalize to JSON-serializable data.
     usage: Any | None = None
     cost_usd: float | None = None
+    # Streaming calls only: time to the first output token and output rate.
+    ttft_ms: int | None = None
+    output_tokens_per_s: float | None = None
+    # Why the stream was cut short (the partial output could no longer match the
+    # schema), and an estimate of the output tokens that were not generated.
+    stream_aborted: str | None = None
+    tokens_saved: int | None = None
+    # Endpoint that served the call, when a router chose between several.
+    endpoint: str | None = None
+
+
+# Set by a caller that may abandon an in-flight call (the router cancels the
+# losing request of a hedged pair). Streaming adapters check it between chunks.
+CANCEL_EVENT: ContextVar[Optional[threading.Event]] = ContextVar(
+    "eval_harness_cancel", default=None
+)
 
 
 class ModelAdapter(Protocol):
     name: str
 
     def generate_structured(self, *, prompt: str, input_obj: dict[str, Any]) -> ModelResult: ...
+
+
+class SamplingAdapter(ModelAdapter, Protocol):
+    """An adapter that can draw n outputs in one request (a provider-side `n`)."""
+
+    def generate_samples(
+        self, *, prompt: str, input_obj: dict[str, Any], n: int
+    ) -> list[ModelResult]: ...
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from eval_harness.core import jsonio
+from eval_harness.core.scheduler import request_key
+
+from .base import ModelAdapter, ModelResult
+from .pricing import lookup_pricing
+
+CASSETTE_VERSION = 1
+
+# ModelResult fields written only when set (streaming and routed calls).
+_OPTIONAL_FIELDS = (
+    "ttft_ms",
+    "output_tokens_per_s",
+    "stream_aborted",
+    "tokens_saved",
+    "endpoint",
+)
+
+
+def _entry(key: str, result: ModelResult) -> dict[str, Any]:
+    entry: dict[str, Any] = {
+        "key": key,
+        "output": result.output,
+        "raw_text": result.raw_text,
+        "latency_ms": result.latency_ms,
+        "usage": result.usage,
+        "cost_usd": result.cost_usd,
+    }
+    for name in _OPTIONAL_FIELDS:
+        value = getattr(result, name)
+        if value is not None:
+            entry[name] = value
+    return entry
+
+
+def _result(entry: dict[str, Any]) -> ModelResult:
+    return ModelResult(
+        output=entry["output"],
+        raw_text=entry.get("raw_text"),
+        latency_ms=int(entry.get("latency_ms", 0)),
+        usage=entry.get("usage"),
+        cost_usd=entry.get("cost_usd"),
+        **{name: entry[name] for name in _OPTIONAL_FIELDS if name in entry},
+    )
+
+
+class RecordingAdapter:
+    """
+    Wraps any adapter and appends every call to a cassette: one compact JSON line
+    per response (request fingerprint, output, raw_text, latency, usage, cost),
+    after a header line naming the recorded adapter and model. Appending to an
+    existing cassette adds to it. generate_samples() is forwarded, one line per
+    sample, only when the wrapped adapter has it.
+    """
+
+    def __init__(self, inner: ModelAdapter, path: str | Path):
+        self.inner = inner
+        self.name = f"record:{inner.name}"
+        self.model = getattr(inner, "model", None)
+        self.pricing = getattr(inner, "pricing", None)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file: IO[str] = self.path.open("a", encoding="utf-8")
+        if new:
+            header = {"cassette": CASSETTE_VERSION, "adapter": inner.name, "model": self.model}
+            self._file.write(jsonio.dumps_line(header) + "\n")
+            self._file.flush()
+        # The scheduler checks for generate_samples to choose one n-request over
+        # fan-out, so recording must not change which one it picks.
+        if callable(getattr(inner, "generate_samples", None)):
+            self.generate_samples = self._generate_samples
+
+    def generate_structured(self, *, prompt: str, input_obj: dict[str, Any]) -> ModelResult:
+        result = self.inner.generate_structured(prompt=prompt, input_obj=input_obj)
+        self._write(request_key(prompt, input_obj), [result])
+        return result
+
+    def _generate_samples(
+        self, *, prompt: str, input_obj: dict[str, Any], n: int
+    ) -> list[ModelResult]:
+        results = self.inner.generate_samples(  # type: ignore[attr-defined]
+            prompt=prompt, input_obj=input_obj, n=n
+        )
+        self._write(request_key(prompt, input_obj), results)
+        return results
+
+    def _write(self, key: str, results: list[ModelResult]) -> None:
+        lines = "".join(jsonio.dumps_line(_entry(key, r)) + "\n" for r in results)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ReplayAdapter:
+    """
+    Serves responses from a cassette instead of calling a model. The whole file is
+    indexed by request fingerprint at construction, so calls are dictionary
+    lookups. A request recorded several times (e.g. with --samples) gets its
+    recordings in order, cycling; generate_samples() serves the next n of them.
+    A request that was never recorded raises ValueError.
+
+    With replay_latency, each call sleeps for its recorded latency, so concurrency
+    and timing behave as in the recorded run.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str | Path, *, replay_latency: bool = False):
+        self.path = Path(path)
+        self.replay_latency = replay_latency
+        self.model: Optional[str] = None
+        self._results: dict[str, list[ModelResult]] = defaultdict(list)
+        self._served: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        with self.path.open("rb") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    obj = jsonio.loads(line)
+                    if "cassette" in obj:
+                        self.model = self.model or obj.get("model")
+                        continue
+                    self._results[obj["key"]].append(_result(obj))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"Invalid cassette entry in {self.path}:{lineno}: {e}") from e
+        # Budget projections price the recorded model, when it is known.
+        self.pricing = lookup_pricing(self.model) if self.model else None
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._results.values())
+
+    def generate_structured(self, *, prompt: str, input_obj: dict[str, Any]) -> ModelResult:
+        return self._serve(prompt, input_obj, 1)[0]
+
+    def generate_samples(
+        self, *, prompt: str, input_obj: dict[str, Any], n: int
+    ) -> list[ModelResult]:
+        return self._serve(prompt, input_obj, n)
+
+    def _serve(self, prompt: str, input_obj: dict[str, Any], n: int) -> list[ModelResult]:
+        key = request_key(prompt, input_obj)
+        recorded = self._results.get(key)
+        if not recorded:
+            raise ValueError(
+                f"No recording in {self.path} for request {key[:16]} "
+                f"(input: {str(input_obj.get('text', ''))[:60]!r})"
+            )
+        with self._lock:
+            start = self._served[key]
+            self._served[key] = start + n
+        results = [recorded[i % len(recorded)] for i in range(start, start + n)]
+        # Samples from one request arrive together, after the slowest of them.
+        latency_ms = max(r.latency_ms for r in results)
+        if self.replay_latency and latency_ms > 0:
+            time.sleep(latency_ms / 1000.0)
+        return results
+
+
+def from_env() -> ReplayAdapter:
+    """EVAL_HARNESS_CASSETTE (required) and EVAL_HARNESS_REPLAY_LATENCY=1 (optional)."""
+    path = os.environ.get("EVAL_HARNESS_CASSETTE", "").strip()
+    if not path:
+        raise ValueError("Missing required environment variable: EVAL_HARNESS_CASSETTE")
+    latency = os.environ.get("EVAL_HARNESS_REPLAY_LATENCY", "").strip().lower()
+    return ReplayAdapter(path, replay_latency=latency in ("1", "true", "yes"))
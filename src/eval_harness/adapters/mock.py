@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import copy
 import re
 import time
+from dataclasses import replace
 from typing import Any, Dict, List, Optional
 
 from .base import ModelResult
+from .pricing import ModelPricing
 
 
 class MockModel:
@@ -21,6 +24,8 @@ class MockModel:
     """
 
     name = "mock"
+    # Every call is free (cost_usd=0.0), so a --max-cost-usd run never halts.
+    pricing = ModelPricing(input_per_1m=0.0, cached_input_per_1m=0.0, output_per_1m=0.0)
 
     # Verbs that commonly indicate actionable tasks
     _VERBS = [
@@ -118,6 +123,17 @@ class MockModel:
             cost_usd=0.0,
         )
 
+    def generate_samples(
+        self, *, prompt: str, input_obj: Dict[str, Any], n: int
+    ) -> List[ModelResult]:
+        # Deterministic, so one generation stands in for all n (like a provider `n`).
+        # Each sample is its own object, so changing one never changes the others.
+        first = self.generate_structured(prompt=prompt, input_obj=input_obj)
+        return [first] + [
+            replace(first, output=copy.deepcopy(first.output), usage=copy.deepcopy(first.usage))
+            for _ in range(n - 1)
+        ]
+
     def _extract_due_date(self, text: str) -> Optional[str]:
         m = self._DUE_DATE_RE.search(text)
         return m.group(1) if m else None
@@ -1,14 +1,34 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, TypedDict
 
-from openai import OpenAI
+from eval_harness.core import jsonio, tracing
+from eval_harness.core.partial_json import PartialJsonCheck
 
-from .base import ModelResult
+from .base import CANCEL_EVENT, ModelResult
+from .pricing import ModelPricing, cost_from_usage, estimate_tokens, lookup_pricing, token_counts
 from .usage import normalize_usage
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+STREAM_MODES = ("off", "on", "abort")
+
+
+def compose_request(prompt: str, input_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Split a case into a stable prefix and a variable suffix.
+
+    The prompt file is sent verbatim as `instructions`, so every call in a run starts
+    with byte-identical tokens and provider-side prompt caching can reuse it. Only
+    the case text varies, and it always comes last.
+    """
+    text = input_obj.get("text", "")
+    return {"instructions": prompt, "input": f"Input:\n{text}"}
+
 
 class OpenAIV1Model:
     """
@@ -17,50 +37,78 @@ class OpenAIV1Model:
     - Azure OpenAI / Azure AI Foundry 'OpenAI-compatible v1' endpoints via base_url
 
     It uses the Responses API (preferred) and expects the model to return valid JSON.
+    With stream=True the response is consumed as server-sent events.
     """
 
     name = "openai_v1"
 
-    def __init__(self, *, api_key: str, model: str, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        model: str,
+        base_url: Optional[str] = None,
+        pricing: Optional[ModelPricing] = None,
+        pricing_model: Optional[str] = None,
+        stream: bool = False,
+        abort_invalid: bool = False,
+    ):
         if not api_key:
             raise ValueError("api_key is required")
         if not model:
             raise ValueError("model is required")
 
+        # Imported here, not at module level, so selecting the mock adapter (or just
+        # running --help) never pays for loading the SDK, httpx and pydantic.
+        from openai import OpenAI
+
         # base_url optional:
         # - OpenAI: omit base_url (or use https://api.openai.com/v1)
         # - Azure/Foundry: set base_url to .../openai/v1/  (see README below)
-        self.client = (
+        self.client: OpenAI = (
             OpenAI(api_key=api_key, base_url=base_url) if base_url else OpenAI(api_key=api_key)
         )
         self.model = model
+        # Azure deployment names are arbitrary, so pricing can be resolved from a
+        # separate model name (or passed in directly). Unknown models cost None.
+        self.pricing = pricing or lookup_pricing(pricing_model or model)
+        # Streaming records time-to-first-token; abort_invalid (implies stream) stops a
+        # stream as soon as the partial output cannot match the schema's shape.
+        self.stream = stream or abort_invalid
+        self.abort_invalid = abort_invalid
+        self._stream_lock = threading.Lock()
+        self._completed_streams = 0
+        self._completed_output_tokens = 0
 
     def generate_structured(self, *, prompt: str, input_obj: Dict[str, Any]) -> ModelResult:
         start = time.time()
 
-        # Simple “prompt + input” shape; keep consistent for eval repeatability
-        text = input_obj.get("text", "")
-        composed = f"{prompt}\n\nInput:\n{text}"
+        with tracing.span("compose"):
+            request = compose_request(prompt, input_obj)
+
+        if self.stream:
+            return self._generate_streaming(request, start)
 
         # Responses API is the unified API in OpenAI docs and is recommended in Azure docs too.
-        resp = self.client.responses.create(
-            model=self.model,
-            input=composed,
-            # Encourage strict JSON only
-            text={"format": {"type": "json_object"}},
-        )
+        with tracing.span(
+            "responses.create",
+            attributes={"gen_ai.request.model": self.model},
+            kind=tracing.KIND_CLIENT,
+        ) as span:
+            resp = self.client.responses.create(
+                model=self.model,
+                **request,
+                # Encourage strict JSON only
+                text={"format": {"type": "json_object"}},
+            )
+            span.set_attribute("gen_ai.response.id", getattr(resp, "id", None))
 
         # Extract text output
         out_text = getattr(resp, "output_text", None) or ""
-        try:
-            parsed = json.loads(out_text)
-        except Exception:
-            # If model returns non-JSON, fail “structured” contract clearly
-            parsed = {"_parse_error": True, "raw": out_text}
+        parsed = _parse_output(out_text)
 
         latency_ms = int((time.time() - start) * 1000)
 
-        # Usage/cost fields vary by provider; keep placeholders
         usage = normalize_usage(getattr(resp, "usage", None))
 
         return ModelResult(
@@ -68,5 +116,173 @@ class OpenAIV1Model:
             raw_text=out_text,
             latency_ms=latency_ms,
             usage=usage,
-            cost_usd=None,
+            cost_usd=cost_from_usage(usage, self.pricing),
+        )
+
+    def _generate_streaming(self, request: Dict[str, Any], start: float) -> ModelResult:
+        # The SDK is already loaded (self.client exists); these are its event models.
+        from openai.types.responses import (
+            ResponseCompletedEvent,
+            ResponseFailedEvent,
+            ResponseIncompleteEvent,
+            ResponseTextDeltaEvent,
         )
+
+        # Stream events that carry the final response object (and its usage).
+        final_events = (ResponseCompletedEvent, ResponseIncompleteEvent, ResponseFailedEvent)
+        check = PartialJsonCheck() if self.abort_invalid else None
+        cancel = CANCEL_EVENT.get()
+        parts: list[str] = []
+        first_token: Optional[float] = None
+        resp: Any = None
+        aborted: Optional[str] = None
+
+        with tracing.span(
+            "responses.create",
+            attributes={"gen_ai.request.model": self.model, "eval.stream": True},
+            kind=tracing.KIND_CLIENT,
+        ) as span:
+            stream = self.client.responses.create(
+                model=self.model,
+                **request,
+                text={"format": {"type": "json_object"}},
+                stream=True,
+            )
+            try:
+                for event in stream:
+                    if cancel is not None and cancel.is_set():
+                        aborted = "cancelled"
+                        break
+                    if isinstance(event, ResponseTextDeltaEvent):
+                        if first_token is None:
+                            first_token = time.time()
+                        parts.append(event.delta)
+                        if check is not None and check.feed(event.delta) is not None:
+                            aborted = check.violation
+                            break
+                    elif isinstance(event, final_events):
+                        resp = event.response
+            finally:
+                # Closing the connection is what stops generation (and billing) early.
+                stream.close()
+            end = time.time()
+            ttft_ms = int((first_token - start) * 1000) if first_token is not None else None
+            span.set_attribute("gen_ai.response.id", getattr(resp, "id", None))
+            span.set_attribute("eval.ttft_ms", ttft_ms)
+            span.set_attribute("eval.stream_aborted", aborted)
+
+        out_text = "".join(parts)
+        if aborted is not None:
+            parsed: Dict[str, Any] = {"_parse_error": True, "raw": out_text}
+        else:
+            parsed = _parse_output(out_text)
+
+        usage = normalize_usage(getattr(resp, "usage", None))
+        if usage is None and aborted is not None:
+            # No usage event arrives for an aborted stream; bill what was sent and seen.
+            usage = {
+                "input_tokens": estimate_tokens(request["instructions"] + request["input"]),
+                "output_tokens": estimate_tokens(out_text),
+                "estimated": True,
+            }
+        counts = token_counts(usage)
+        output_tokens = counts.output_tokens if counts is not None else estimate_tokens(out_text)
+
+        tokens_saved = None
+        if aborted is not None:
+            expected = self._expected_output_tokens()
+            if expected is not None:
+                tokens_saved = max(expected - output_tokens, 0)
+        elif resp is not None:
+            self._record_output_tokens(output_tokens)
+
+        return ModelResult(
+            output=parsed,
+            raw_text=out_text,
+            latency_ms=int((end - start) * 1000),
+            usage=usage,
+            cost_usd=cost_from_usage(usage, self.pricing),
+            ttft_ms=ttft_ms,
+            output_tokens_per_s=(
+                output_tokens / (end - first_token)
+                if first_token is not None and end > first_token
+                else None
+            ),
+            stream_aborted=aborted,
+            tokens_saved=tokens_saved,
+        )
+
+    def _record_output_tokens(self, n: int) -> None:
+        with self._stream_lock:
+            self._completed_streams += 1
+            self._completed_output_tokens += n
+
+    def _expected_output_tokens(self) -> Optional[int]:
+        """Mean output length of completed streams: what an aborted call would have cost."""
+        with self._stream_lock:
+            if not self._completed_streams:
+                return None
+            return round(self._completed_output_tokens / self._completed_streams)
+
+
+def _parse_output(out_text: str) -> Dict[str, Any]:
+    with tracing.span("parse") as span:
+        try:
+            return jsonio.loads(out_text)
+        except Exception:
+            # If model returns non-JSON, fail “structured” contract clearly
+            span.set_attribute("eval.parse_error", True)
+            return {"_parse_error": True, "raw": out_text}
+
+
+def _require_env(name: str) -> str:
+    v = os.environ.get(name, "").strip()
+    if not v:
+        raise ValueError(f"Missing required environment variable: {name}")
+    return v
+
+
+class StreamOptions(TypedDict):
+    stream: bool
+    abort_invalid: bool
+
+
+def stream_options_from_env() -> StreamOptions:
+    """EVAL_HARNESS_STREAM: off (default), on, or abort (stream and stop on invalid shape)."""
+    mode = os.environ.get("EVAL_HARNESS_STREAM", "").strip().lower() or "off"
+    if mode not in STREAM_MODES:
+        raise ValueError(
+            f"Invalid EVAL_HARNESS_STREAM: {mode}. Expected one of: {', '.join(STREAM_MODES)}"
+        )
+    return {"stream": mode != "off", "abort_invalid": mode == "abort"}
+
+
+def from_openai_env() -> OpenAIV1Model:
+    """OpenAI public endpoint: OPENAI_API_KEY, OPENAI_MODEL, optional OPENAI_BASE_URL."""
+    api_key = _require_env("OPENAI_API_KEY")
+    model = _require_env("OPENAI_MODEL")
+    base_url = os.environ.get("OPENAI_BASE_URL", "").strip() or None  # optional
+    pricing_model = os.environ.get("OPENAI_PRICING_MODEL", "").strip() or None  # optional
+    return OpenAIV1Model(
+        api_key=api_key,
+        model=model,
+        base_url=base_url,
+        pricing_model=pricing_model,
+        **stream_options_from_env(),
+    )
+
+
+def from_azure_env() -> OpenAIV1Model:
+    """Azure OpenAI / Foundry v1 endpoint: AZURE_OPENAI_API_KEY, _MODEL, _BASE_URL."""
+    api_key = _require_env("AZURE_OPENAI_API_KEY")
+    model = _require_env("AZURE_OPENAI_MODEL")
+    base_url = _require_env("AZURE_OPENAI_BASE_URL")
+    # Deployment names rarely match model names; set this to price the run.
+    pricing_model = os.environ.get("AZURE_OPENAI_PRICING_MODEL", "").strip() or None
+    return OpenAIV1Model(
+        api_key=api_key,
+        model=model,
+        base_url=base_url,
+        pricing_model=pricing_model,
+        **stream_options_from_env(),
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class ModelPricing:
+    """USD prices per 1M tokens."""
+
+    input_per_1m: float
+    cached_input_per_1m: float
+    output_per_1m: float
+
+    def cost_usd(self, counts: TokenCounts) -> float:
+        cached = min(counts.cached_input_tokens, counts.input_tokens)
+        uncached = counts.input_tokens - cached
+        return (
+            uncached * self.input_per_1m
+            + cached * self.cached_input_per_1m
+            + counts.output_tokens * self.output_per_1m
+        ) / 1_000_000
+
+
+@dataclass(frozen=True)
+class TokenCounts:
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+
+
+# List prices (USD per 1M tokens). Keys are matched as model-name prefixes so dated
+# snapshots ("gpt-4o-2024-08-06") resolve to their family; longest prefix wins.
+PRICING_TABLE: dict[str, ModelPricing] = {
+    "gpt-5": ModelPricing(1.25, 0.125, 10.00),
+    "gpt-5-mini": ModelPricing(0.25, 0.025, 2.00),
+    "gpt-5-nano": ModelPricing(0.05, 0.005, 0.40),
+    "gpt-4.1": ModelPricing(2.00, 0.50, 8.00),
+    "gpt-4.1-mini": ModelPricing(0.40, 0.10, 1.60),
+    "gpt-4.1-nano": ModelPricing(0.10, 0.025, 0.40),
+    "gpt-4o": ModelPricing(2.50, 1.25, 10.00),
+    "gpt-4o-mini": ModelPricing(0.15, 0.075, 0.60),
+    "o3": ModelPricing(2.00, 0.50, 8.00),
+    "o3-mini": ModelPricing(1.10, 0.55, 4.40),
+    "o4-mini": ModelPricing(1.10, 0.275, 4.40),
+}
+
+
+def lookup_pricing(model: str) -> Optional[ModelPricing]:
+    """Resolve a model (or deployment) name to its pricing, or None if unknown."""
+    name = (model or "").strip().lower()
+    best: Optional[str] = None
+    for key in PRICING_TABLE:
+        if name == key or name.startswith(key + "-"):
+            if best is None or len(key) > len(best):
+                best = key
+    return PRICING_TABLE[best] if best is not None else None
+
+
+def _as_int(value: Any) -> int:
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    return 0
+
+
+def token_counts(usage: Any) -> Optional[TokenCounts]:
+    """
+    Read token counts from a normalized usage object (see `normalize_usage`).
+
+    Understands both the Responses API shape (input_tokens / output_tokens /
+    input_tokens_details.cached_tokens) and the Chat Completions shape
+    (prompt_tokens / completion_tokens / prompt_tokens_details.cached_tokens).
+    Returns None when the usage carries no token counts (e.g. the mock adapter).
+    """
+    if not isinstance(usage, Mapping):
+        return None
+
+    input_tokens = usage.get("input_tokens", usage.get("prompt_tokens"))
+    output_tokens = usage.get("output_tokens", usage.get("completion_tokens"))
+    if input_tokens is None and output_tokens is None:
+        return None
+
+    details = usage.get("input_tokens_details") or usage.get("prompt_tokens_details")
+    cached = details.get("cached_tokens") if isinstance(details, Mapping) else None
+
+    return TokenCounts(
+        input_tokens=_as_int(input_tokens),
+        cached_input_tokens=_as_int(cached),
+        output_tokens=_as_int(output_tokens),
+    )
+
+
+def cost_from_usage(usage: Any, pricing: Optional[ModelPricing]) -> Optional[float]:
+    if pricing is None:
+        return None
+    counts = token_counts(usage)
+    if counts is None:
+        return None
+    return pricing.cost_usd(counts)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; only used for budget projection.
+    return math.ceil(len(text) / 4)
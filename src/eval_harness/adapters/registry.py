@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from importlib import import_module, metadata
+from typing import Callable, Union
+
+from .base import ModelAdapter
+
+AdapterFactory = Callable[[], ModelAdapter]
+
+# Third-party packages expose adapters under this entry-point group, e.g. in their
+# pyproject.toml:
+#
+#   [project.entry-points."eval_harness.adapters"]
+#   my-model = "my_package.adapter:build"
+#
+# The target is a zero-argument callable (a factory or an adapter class) that reads
+# its own configuration, typically from environment variables.
+ENTRY_POINT_GROUP = "eval_harness.adapters"
+
+# Built-ins are "module:attribute" strings so nothing is imported until selected;
+# the OpenAI SDK (and httpx/pydantic with it) only loads for openai/azure runs.
+_BUILTIN: dict[str, str] = {
+    "mock": "eval_harness.adapters.mock:MockModel",
+    "openai": "eval_harness.adapters.openai_v1:from_openai_env",
+    "azure": "eval_harness.adapters.openai_v1:from_azure_env",
+    "replay": "eval_harness.adapters.cassette:from_env",
+    "router": "eval_harness.adapters.router:from_env",
+}
+
+_registered: dict[str, Union[AdapterFactory, str]] = {}
+
+
+def register_adapter(name: str, factory: Union[AdapterFactory, str]) -> None:
+    """Register a factory (or a lazy "module:attribute" path) under `name`."""
+    _registered[name] = factory
+
+
+def _entry_points() -> dict[str, metadata.EntryPoint]:
+    return {ep.name: ep for ep in metadata.entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def available_adapters() -> list[str]:
+    return sorted(set(_BUILTIN) | set(_registered) | set(_entry_points()))
+
+
+def _load(path: str) -> AdapterFactory:
+    module_name, _, attr = path.partition(":")
+    return getattr(import_module(module_name), attr)
+
+
+def build_adapter(name: str) -> ModelAdapter:
+    """
+    Resolve and construct an adapter by name.
+
+    Lookup order: register_adapter() registrations, built-ins, then installed
+    entry points. Only the selected adapter's module is imported.
+    """
+    target = _registered.get(name) or _BUILTIN.get(name)
+    if target is None:
+        ep = _entry_points().get(name)
+        if ep is None:
+            raise ValueError(
+                f"Unknown adapter: {name}. Expected one of: {', '.join(available_adapters())}"
+            )
+        target = ep.load()
+
+    factory = _load(target) if isinstance(target, str) else target
+    return factory()
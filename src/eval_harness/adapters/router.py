@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import contextvars
+import dataclasses
+import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from eval_harness.core import jsonio
+from eval_harness.core.budget import CostBudget
+from eval_harness.core.progress import LatencyHistogram
+from eval_harness.core.report_types import EndpointReport, RoutingReport
+
+from .base import CANCEL_EVENT, ModelAdapter, ModelResult
+
+# Smoothing for the per-endpoint latency and error-rate averages.
+_EWMA_ALPHA = 0.2
+# An endpoint whose recent calls all failed keeps this share of its weight, so it
+# is still probed occasionally and can recover.
+_MIN_HEALTH = 0.02
+
+
+@dataclass
+class Endpoint:
+    name: str
+    adapter: ModelAdapter
+    weight: float = 1.0
+
+
+class _EndpointStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+        self.wins = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.ewma_latency_ms: Optional[float] = None
+        self.ewma_error = 0.0
+        self.latency = LatencyHistogram()
+
+
+@dataclass
+class _Attempt:
+    endpoint: Endpoint
+    stats: _EndpointStats
+    hedge: bool
+    cancel: threading.Event
+
+
+class RouterAdapter:
+    """
+    Spreads calls over several endpoints (deployments, regions, providers).
+
+    Each call goes to an endpoint picked at random in proportion to its weight times
+    its health: an exponentially weighted average of latency and error rate, and
+    the calls it has in flight. A call that fails is retried once on another
+    endpoint.
+
+    Hedging: once hedge_min_samples calls have completed, a call still running at
+    the hedge_percentile latency of the last `window` calls (read from a sliding
+    latency histogram, so no sort per call) gets a duplicate on another
+    endpoint. The first result wins; the loser is cancelled. A streaming adapter
+    stops reading at its next chunk; a blocking request cannot be interrupted,
+    so its result is discarded when it arrives. The winner's latency_ms is the
+    whole call's, from generate_structured() entry.
+
+    The loser is still billed. Its cost is added to loser_cost_usd when it
+    finishes (reported as hedge_loser_cost_usd). With a budget (use_budget()),
+    each hedge reserves its projected cost before it is sent, and is not sent
+    if that does not fit; the loser's cost then settles that reservation.
+    """
+
+    name = "router"
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        *,
+        hedge_percentile: Optional[float] = 0.95,
+        hedge_min_samples: int = 20,
+        window: int = 256,
+        max_workers: int = 64,
+        seed: Optional[int] = None,
+    ):
+        if not endpoints:
+            raise ValueError("router needs at least one endpoint")
+        if len({ep.name for ep in endpoints}) != len(endpoints):
+            raise ValueError("router endpoint names must be unique")
+        if any(ep.weight <= 0 for ep in endpoints):
+            raise ValueError("router endpoint weights must be > 0")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise ValueError("hedge_percentile must be between 0 and 1")
+        self.endpoints = list(endpoints)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.model = getattr(self.endpoints[0].adapter, "model", None)
+        self.pricing = getattr(self.endpoints[0].adapter, "pricing", None)
+
+        self._stats = {ep.name: _EndpointStats() for ep in self.endpoints}
+        # Latencies of the last `window` successful calls, and their histogram.
+        self._recent: deque[float] = deque()
+        self._recent_latency = LatencyHistogram()
+        self._window = window
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eval-router")
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.loser_cost_usd = 0.0
+        self._losers_pending = 0
+        self.budget: Optional[CostBudget] = None
+
+    def use_budget(self, budget: CostBudget) -> None:
+        """Reserve hedges in the run's budget and settle it with the losers' costs."""
+        self.budget = budget
+
+    def _health(self, stats: _EndpointStats, default_latency_ms: float) -> float:
+        latency = stats.ewma_latency_ms if stats.ewma_latency_ms is not None else default_latency_ms
+        success = max((1.0 - stats.ewma_error) ** 2, _MIN_HEALTH)
+        return success / (max(latency, 1.0) * (1 + stats.in_flight))
+
+    def _pick(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if ep is not exclude] or self.endpoints
+            known = [
+                s.ewma_latency_ms
+                for s in (self._stats[ep.name] for ep in candidates)
+                if s.ewma_latency_ms is not None
+            ]
+            default = sum(known) / len(known) if known else 1.0
+            scores = [ep.weight * self._health(self._stats[ep.name], default) for ep in candidates]
+            return self._rng.choices(candidates, weights=scores)[0]
+
+    def hedge_deadline_ms(self) -> Optional[float]:
+        """Latency after which a call is hedged, or None while hedging is off."""
+        if self.hedge_percentile is None or len(self.endpoints) < 2:
+            return None
+        with self._lock:
+            if len(self._recent) < self.hedge_min_samples:
+                return None
+            return self._recent_latency.percentile(self.hedge_percentile)
+
+    def _run_attempt(
+        self, attempt: _Attempt, prompt: str, input_obj: dict[str, Any]
+    ) -> ModelResult:
+        stats = attempt.stats
+        with self._lock:
+            stats.requests += 1
+            stats.hedges += attempt.hedge
+            stats.in_flight += 1
+        token = CANCEL_EVENT.set(attempt.cancel)
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = attempt.endpoint.adapter.generate_structured(
+                prompt=prompt, input_obj=input_obj
+            )
+            ok = True
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            CANCEL_EVENT.reset(token)
+            with self._lock:
+                stats.in_flight -= 1
+                # A cancelled attempt's outcome says little about the endpoint.
+                if not attempt.cancel.is_set():
+                    if ok:
+                        stats.latency.record(elapsed_ms)
+                        stats.ewma_latency_ms = (
+                            elapsed_ms
+                            if stats.ewma_latency_ms is None
+                            else stats.ewma_latency_ms
+                            + _EWMA_ALPHA * (elapsed_ms - stats.ewma_latency_ms)
+                        )
+                        self._recent.append(elapsed_ms)
+                        self._recent_latency.record(elapsed_ms)
+                        if len(self._recent) > self._window:
+                            self._recent_latency.discard(self._recent.popleft())
+                    else:
+                        stats.errors += 1
+                    stats.ewma_error += _EWMA_ALPHA * ((0.0 if ok else 1.0) - stats.ewma_error)
+
+    def _attempt(self, endpoint: Endpoint, *, hedge: bool = False) -> _Attempt:
+        return _Attempt(endpoint, self._stats[endpoint.name], hedge, threading.Event())
+
+    def _submit(
+        self, attempt: _Attempt, prompt: str, input_obj: dict[str, Any]
+    ) -> Future[ModelResult]:
+        # Carry the caller's context (its trace span) onto the pool thread.
+        ctx = contextvars.copy_context()
+        return self._pool.submit(ctx.run, self._run_attempt, attempt, prompt, input_obj)
+
+    def _won(self, attempt: _Attempt, result: ModelResult, start: float) -> ModelResult:
+        with self._lock:
+            attempt.stats.wins += 1
+            if attempt.hedge:
+                self.hedge_wins += 1
+        return dataclasses.replace(
+            result,
+            endpoint=attempt.endpoint.name,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+        )
+
+    def _reserve_hedge(self, prompt: str, input_obj: dict[str, Any]) -> Optional[float]:
+        """Projected cost reserved for a hedge, or None if the budget has no room."""
+        if self.budget is None:
+            return 0.0
+        projected = self.budget.projected_cost_usd(prompt=prompt, input_obj=input_obj)
+        # Skipping a hedge only costs latency, so a refusal does not halt the run.
+        if not self.budget.try_reserve(projected, halt=False):
+            return None
+        return projected
+
+    def generate_structured(self, *, prompt: str, input_obj: dict[str, Any]) -> ModelResult:
+        start = time.perf_counter()
+        primary = self._attempt(self._pick())
+        deadline_ms = self.hedge_deadline_ms()
+        if deadline_ms is None:
+            # No hedging: call on the caller's thread, failing over once.
+            try:
+                return self._won(primary, self._run_attempt(primary, prompt, input_obj), start)
+            except Exception:
+                if len(self.endpoints) < 2:
+                    raise
+            fallback = self._attempt(self._pick(exclude=primary.endpoint))
+            return self._won(fallback, self._run_attempt(fallback, prompt, input_obj), start)
+
+        pending = {self._submit(primary, prompt, input_obj): primary}
+        done, _ = wait(pending, timeout=deadline_ms / 1000.0)
+        tried = [primary.endpoint]
+        # Budget reserved for the hedge; settled by whichever call loses.
+        hedge_reserved: Optional[float] = None
+        if not done:
+            hedge_reserved = self._reserve_hedge(prompt, input_obj)
+            if hedge_reserved is None:
+                with self._lock:
+                    self.hedges_skipped += 1
+            else:
+                hedge = self._attempt(self._pick(exclude=primary.endpoint), hedge=True)
+                with self._lock:
+                    self.hedges += 1
+                pending[self._submit(hedge, prompt, input_obj)] = hedge
+                tried.append(hedge.endpoint)
+
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    attempt = pending.pop(fut)
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    self._cancel(pending, hedge_reserved, prompt, input_obj)
+                    hedge_reserved = None
+                    return self._won(attempt, result, start)
+                if not pending and len(tried) == 1:
+                    # The primary failed before the deadline: fail over once.
+                    fallback = self._attempt(self._pick(exclude=primary.endpoint))
+                    pending[self._submit(fallback, prompt, input_obj)] = fallback
+                    tried.append(fallback.endpoint)
+        finally:
+            # No loser to bill (the other call failed), so the hedge's reservation lapses.
+            if hedge_reserved and self.budget is not None:
+                self.budget.release(hedge_reserved)
+        assert error is not None
+        raise error
+
+    def _cancel(
+        self,
+        pending: dict[Future[ModelResult], _Attempt],
+        reserved: Optional[float],
+        prompt: str,
+        input_obj: dict[str, Any],
+    ) -> None:
+        for fut, attempt in pending.items():
+            attempt.cancel.set()
+            fut.cancel()
+            with self._lock:
+                attempt.stats.cancelled += 1
+                self._losers_pending += 1
+            fut.add_done_callback(lambda f: self._bill_loser(f, reserved or 0.0, prompt, input_obj))
+        if not pending and reserved and self.budget is not None:
+            self.budget.release(reserved)
+
+    def _bill_loser(
+        self,
+        fut: Future[ModelResult],
+        reserved: float,
+        prompt: str,
+        input_obj: dict[str, Any],
+    ) -> None:
+        result = None if fut.cancelled() or fut.exception() is not None else fut.result()
+        with self._lock:
+            self._losers_pending -= 1
+            if result is not None:
+                self.loser_cost_usd += result.cost_usd or 0.0
+        if self.budget is None:
+            return
+        if result is not None:
+            self.budget.settle(reserved, result, prompt=prompt, input_obj=input_obj)
+        else:
+            self.budget.release(reserved)
+
+    def routing_report(self) -> RoutingReport:
+        with self._lock:
+            total_wins = sum(s.wins for s in self._stats.values()) or 1
+            endpoints: dict[str, EndpointReport] = {}
+            for ep in self.endpoints:
+                s = self._stats[ep.name]
+                endpoints[ep.name] = {
+                    "weight": ep.weight,
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "hedges": s.hedges,
+                    "wins": s.wins,
+                    "cancelled": s.cancelled,
+                    "share": s.wins / total_wins,
+                    "p50_ms": s.latency.percentile(0.5),
+                    "p95_ms": s.latency.percentile(0.95),
+                }
+            return {
+                "endpoints": endpoints,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+                "hedges_skipped": self.hedges_skipped,
+                "hedge_loser_cost_usd": self.loser_cost_usd,
+                "hedge_losers_pending": self._losers_pending,
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _build_endpoint(spec: dict[str, Any]) -> Endpoint:
+    name = spec.get("name")
+    if not name:
+        raise ValueError("router endpoint needs a name")
+    if "adapter" in spec:
+        from .registry import build_adapter
+
+        adapter = build_adapter(spec["adapter"])
+    else:
+        from .openai_v1 import OpenAIV1Model, stream_options_from_env
+
+        key_env = spec.get("api_key_env", "AZURE_OPENAI_API_KEY")
+        adapter = OpenAIV1Model(
+            api_key=os.environ.get(key_env, "").strip(),
+            model=spec.get("model", ""),
+            base_url=spec.get("base_url"),
+            pricing_model=spec.get("pricing_model"),
+            **stream_options_from_env(),
+        )
+    return Endpoint(name=name, adapter=adapter, weight=float(spec.get("weight", 1.0)))
+
+
+def load_router(path: str | Path) -> RouterAdapter:
+    """
+    Build a router from a JSON file:
+
+        {"endpoints": [{"name": "eastus", "base_url": "...", "model": "...", "weight": 2},
+                       {"name": "westeu", "base_url": "...", "model": "...",
+                        "api_key_env": "WESTEU_API_KEY"},
+                       {"name": "local", "adapter": "mock", "weight": 0.5}],
+         "hedge_percentile": 0.95, "hedge_min_samples": 20}
+
+    Endpoints with base_url/model are OpenAI-compatible v1 endpoints (api_key_env
+    defaults to AZURE_OPENAI_API_KEY); "adapter" selects any registered adapter.
+    Set "hedge_percentile" to null to turn hedging off.
+    """
+    config = jsonio.loads(Path(path).read_bytes())
+    if not isinstance(config, dict) or not isinstance(config.get("endpoints"), list):
+        raise ValueError(f"Invalid router config {path}: expected an 'endpoints' list")
+    return RouterAdapter(
+        [_build_endpoint(spec) for spec in config["endpoints"]],
+        hedge_percentile=config.get("hedge_percentile", 0.95),
+        hedge_min_samples=int(config.get("hedge_min_samples", 20)),
+    )
+
+
+def from_env() -> RouterAdapter:
+    """EVAL_HARNESS_ROUTER: path to the router's JSON config (see load_router())."""
+    path = os.environ.get("EVAL_HARNESS_ROUTER", "").strip()
+    if not path:
+        raise ValueError("Missing required environment variable: EVAL_HARNESS_ROUTER")
+    return load_router(path)
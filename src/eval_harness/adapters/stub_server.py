@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+from .mock import MockModel
+from .pricing import estimate_tokens
+
+# Providers only cache prompt prefixes of at least this many tokens.
+_MIN_CACHED_PREFIX_TOKENS = 1024
+
+# Streamed output is split into deltas of about one token (see estimate_tokens).
+_CHARS_PER_DELTA = 4
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency distribution in milliseconds:
+
+    - "50"               fixed
+    - "uniform:20,80"    uniform between bounds
+    - "lognormal:50,0.5" log-normal with the given median and sigma (long tail)
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        if not args:
+            fixed = float(kind)
+            return lambda rng: fixed
+        params = [float(a) for a in args.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}") from None
+
+    if kind == "uniform" and len(params) == 2:
+        lo, hi = params
+        return lambda rng: rng.uniform(lo, hi)
+    if kind == "lognormal" and len(params) == 2:
+        median, sigma = params
+        mu = math.log(median) if median > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(
+        f"Invalid latency spec: {spec!r}. Expected N, uniform:LO,HI or lognormal:MEDIAN,SIGMA"
+    )
+
+
+@dataclass(frozen=True)
+class StubConfig:
+    latency: str = "0"
+    # Fractions of requests (0..1) answered with HTTP 500, HTTP 429, a 200 whose
+    # output_text is truncated JSON, or a 200 that wraps the JSON in prose.
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    prose_rate: float = 0.0
+    # Delay between output deltas of a streamed ("stream": true) response.
+    token_latency_ms: float = 0.0
+    # Sent as retry-after-ms on 429s; the OpenAI SDK honours it between retries.
+    retry_after_ms: int = 50
+    seed: Optional[int] = None
+
+
+class StubState:
+    """Fault decisions and counters shared by all request threads."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.latency_ms = parse_latency(config.latency)
+        self.model = MockModel()
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes: set[str] = set()
+        self.counts: Counter[str] = Counter()
+
+    def draw(self) -> tuple[str, float]:
+        """Outcome ("error" | "rate_limited" | "malformed" | "prose" | "ok") and latency."""
+        c = self.config
+        with self._lock:
+            latency = max(0.0, self.latency_ms(self._rng))
+            r = self._rng.random()
+            if r < c.error_rate:
+                outcome = "error"
+            elif r < c.error_rate + c.rate_limit_rate:
+                outcome = "rate_limited"
+            elif r < c.error_rate + c.rate_limit_rate + c.malformed_rate:
+                outcome = "malformed"
+            elif r < c.error_rate + c.rate_limit_rate + c.malformed_rate + c.prose_rate:
+                outcome = "prose"
+            else:
+                outcome = "ok"
+            self.counts["requests"] += 1
+            self.counts[outcome] += 1
+        return outcome, latency
+
+    def record_abort(self, unsent_tokens: int) -> None:
+        with self._lock:
+            self.counts["stream_aborted"] += 1
+            self.counts["output_tokens_unsent"] += unsent_tokens
+
+    def cached_tokens(self, instructions: str, prefix_tokens: int) -> int:
+        """Mimic provider prompt caching: a repeated long instructions prefix is cached."""
+        if prefix_tokens < _MIN_CACHED_PREFIX_TOKENS:
+            return 0
+        key = hashlib.blake2b(instructions.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            if key in self._seen_prefixes:
+                return prefix_tokens
+            self._seen_prefixes.add(key)
+        return 0
+
+
+def _input_text(body: dict[str, Any]) -> str:
+    raw = body.get("input", "")
+    if isinstance(raw, list):
+        # Message-list form: concatenate text content.
+        parts = []
+        for item in raw:
+            content = item.get("content") if isinstance(item, dict) else None
+            if isinstance(content, str):
+                parts.append(content)
+            elif isinstance(content, list):
+                parts.extend(str(c.get("text", "")) for c in content if isinstance(c, dict))
+        raw = "\n".join(parts)
+    text = str(raw)
+    # compose_request() sends "Input:\n<case text>".
+    return text[len("Input:\n") :] if text.startswith("Input:\n") else text
+
+
+def response_body(
+    *, model: str, text: str, input_tokens: int, cached_tokens: int, output_tokens: int
+) -> dict[str, Any]:
+    """A completed Responses API object with one assistant message."""
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [
+            {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": cached_tokens},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the OpenAI Responses API, for offline load and latency tests.
+
+    Implements the subset OpenAIV1Model uses (POST /responses returning a response
+    whose output_text is the model's JSON, or its server-sent event stream when the
+    request sets "stream"), answering with MockModel. Point the openai adapter at it
+    with OPENAI_BASE_URL=<base_url>.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: StubConfig):
+        super().__init__(address, _StubHandler)
+        self.state = StubState(config)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so client connection pooling is exercised.
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle plus the
+        # client's delayed ACK adds ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, obj: Any, headers: Optional[dict[str, str]] = None) -> None:
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str, kind: str, **headers: str) -> None:
+        self._send(status, {"error": {"message": message, "type": kind, "code": None}}, headers)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send(200, dict(self.server.state.counts))
+        else:
+            self._error(404, f"not found: {self.path}", "invalid_request_error")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if not self.path.rstrip("/").endswith("/responses"):
+            self._error(404, f"not found: {self.path}", "invalid_request_error")
+            return
+        try:
+            body = json.loads(raw or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("body must be an object")
+        except ValueError as e:
+            self._error(400, f"invalid JSON body: {e}", "invalid_request_error")
+            return
+
+        state = self.server.state
+        outcome, latency_ms = state.draw()
+        time.sleep(latency_ms / 1000.0)
+
+        if outcome == "error":
+            self._error(500, "injected server error", "server_error")
+            return
+        if outcome == "rate_limited":
+            self._error(
+                429,
+                "injected rate limit",
+                "rate_limit_exceeded",
+                **{"retry-after-ms": str(state.config.retry_after_ms)},
+            )
+            return
+
+        instructions = str(body.get("instructions") or "")
+        text = _input_text(body)
+        result = state.model.generate_structured(prompt=instructions, input_obj={"text": text})
+        out_text = json.dumps(result.output)
+        if outcome == "malformed":
+            # Truncated JSON, as from a cut-off generation.
+            out_text = out_text[: max(1, len(out_text) // 2)]
+        elif outcome == "prose":
+            out_text = f"Sure! Here are the tasks I found in your message:\n\n{out_text}\n"
+
+        prefix_tokens = estimate_tokens(instructions)
+        response = response_body(
+            model=str(body.get("model") or "stub"),
+            text=out_text,
+            input_tokens=prefix_tokens + estimate_tokens(str(body.get("input", ""))),
+            cached_tokens=state.cached_tokens(instructions, prefix_tokens),
+            output_tokens=estimate_tokens(out_text),
+        )
+        if body.get("stream"):
+            self._send_stream(response, out_text)
+        else:
+            self._send(200, response)
+
+    def _send_stream(self, response: dict[str, Any], text: str) -> None:
+        """Responses API event stream: created, one delta per ~token, completed."""
+        state = self.server.state
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # No Content-Length: the end of the stream is the end of the connection.
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        message = response["output"][0]
+        in_progress = {**response, "status": "in_progress", "output": [], "usage": None}
+        events: list[dict[str, Any]] = [{"type": "response.created", "response": in_progress}]
+        deltas = [text[i : i + _CHARS_PER_DELTA] for i in range(0, len(text), _CHARS_PER_DELTA)]
+        for delta in deltas:
+            events.append(
+                {
+                    "type": "response.output_text.delta",
+                    "item_id": message["id"],
+                    "output_index": 0,
+                    "content_index": 0,
+                    "delta": delta,
+                    "logprobs": [],
+                }
+            )
+        events.append({"type": "response.completed", "response": response})
+
+        delay_s = state.config.token_latency_ms / 1000.0
+        sent_chars = 0
+        for seq, event in enumerate(events):
+            if delay_s and event["type"] == "response.output_text.delta" and seq > 1:
+                time.sleep(delay_s)
+            event["sequence_number"] = seq
+            frame = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            try:
+                self.wfile.write(frame.encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # The client hung up mid-stream (an early abort): nothing more is generated.
+                state.record_abort(estimate_tokens(text[sent_chars:]))
+                return
+            if event["type"] == "response.output_text.delta":
+                sent_chars += len(event["delta"])
+
+
+def make_stub_server(
+    host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None
+) -> StubServer:
+    return StubServer((host, port), config or StubConfig())
+
+
+def serve_stub(host: str, port: int, config: StubConfig) -> None:
+    server = make_stub_server(host, port, config)
+    print(f"Responses API stub on {server.base_url} (set OPENAI_BASE_URL to this)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-from typing import Any
+from typing import Any, Callable
 
 
 def normalize_usage(usage: Any) -> Any:
@@ -13,27 +13,63 @@ def normalize_usage(usage: Any) -> Any:
     return _to_jsonable(usage)
 
 
+# Conversion handler per concrete type, resolved once per class by _resolve().
+# The checks _resolve() performs (scalar, Mapping, Sequence, model_dump, __dict__)
+# would otherwise run for every node of every usage object.
+_HANDLERS: dict[type, Callable[[Any], Any]] = {}
+
+
 def _to_jsonable(value: Any) -> Any:
-    if value is None:
-        return None
+    cls = type(value)
+    handler = _HANDLERS.get(cls)
+    if handler is None:
+        handler = _HANDLERS[cls] = _resolve(cls)
+    return handler(value)
 
-    if isinstance(value, (str, int, float, bool)):
-        return value
 
-    if isinstance(value, Mapping):
-        return {str(k): _to_jsonable(v) for k, v in value.items()}
+def _identity(value: Any) -> Any:
+    return value
 
-    # Avoid treating strings/bytes as Sequences here.
-    if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
-        return [_to_jsonable(v) for v in value]
 
+def _none(value: Any) -> None:
+    return None
+
+
+def _from_dict(value: dict[Any, Any]) -> dict[str, Any]:
+    conv = _to_jsonable
+    return {(k if type(k) is str else str(k)): conv(v) for k, v in value.items()}
+
+
+def _from_mapping(value: Mapping[Any, Any]) -> dict[str, Any]:
+    conv = _to_jsonable
+    return {str(k): conv(v) for k, v in value.items()}
+
+
+def _from_sequence(value: Sequence[Any]) -> list[Any]:
+    conv = _to_jsonable
+    return [conv(v) for v in value]
+
+
+def _from_pydantic(value: Any) -> Any:
+    # Pydantic models (the OpenAI SDK's usage types): model_dump() is a class
+    # attribute, so skip the getattr/callable probing of the generic path.
+    try:
+        return _to_jsonable(value.model_dump())
+    except Exception:
+        return _from_attributes(value)
+
+
+def _from_object(value: Any) -> Any:
     model_dump = getattr(value, "model_dump", None)
     if callable(model_dump):
         try:
             return _to_jsonable(model_dump())
         except Exception:
             pass
+    return _from_attributes(value)
+
 
+def _from_attributes(value: Any) -> Any:
     if hasattr(value, "__dict__"):
         try:
             return _to_jsonable(dict(value.__dict__))
@@ -41,3 +77,28 @@ def _to_jsonable(value: Any) -> Any:
             pass
 
     return str(value)
+
+
+def _resolve(cls: type) -> Callable[[Any], Any]:
+    if cls is type(None):
+        return _none
+
+    if issubclass(cls, (str, int, float, bool)):
+        return _identity
+
+    if cls is dict:
+        return _from_dict
+
+    if issubclass(cls, Mapping):
+        return _from_mapping
+
+    # Avoid treating strings/bytes as Sequences here.
+    if cls is list or cls is tuple:
+        return _from_sequence
+    if issubclass(cls, Sequence) and not issubclass(cls, (str, bytes, bytearray)):
+        return _from_sequence
+
+    if callable(getattr(cls, "model_dump", None)) and hasattr(cls, "model_fields"):
+        return _from_pydantic
+
+    return _from_object
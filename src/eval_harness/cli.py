@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Optional
 
-from eval_harness.core.runner import run_eval
+from eval_harness.core import jsonio
 
 
 def _check_threshold(name: str, actual: float, minimum: Optional[float]) -> list[str]:
@@ -18,13 +17,47 @@ def _check_threshold(name: str, actual: float, minimum: Optional[float]) -> list
     return []
 
 
+def _parse_shard(value: str) -> tuple[int, int]:
+    """Parse "I/N" (0-based shard I of N)."""
+    try:
+        i_text, n_text = value.split("/")
+        shard, num_shards = int(i_text), int(n_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {value!r}") from None
+    if num_shards < 1 or not 0 <= shard < num_shards:
+        raise argparse.ArgumentTypeError(f"expected 0 <= I < N, got {value!r}")
+    return shard, num_shards
+
+
+def _int_at_least(value: str, minimum: int) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from None
+    if n < minimum:
+        raise argparse.ArgumentTypeError(f"expected an integer >= {minimum}, got {value!r}")
+    return n
+
+
+def _positive_int(value: str) -> int:
+    return _int_at_least(value, 1)
+
+
+def _non_negative_int(value: str) -> int:
+    return _int_at_least(value, 0)
+
+
+def _format_cost(cost: Optional[float]) -> str:
+    return "unknown" if cost is None else f"{cost:.4f}"
+
+
 def _load_baseline_summary(baseline_path: str) -> dict[str, Any]:
     """
     Baseline can be either:
     - a full report JSON (with 'summary' field), OR
     - a summary-only JSON (just the summary object)
     """
-    obj = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    obj = jsonio.loads(Path(baseline_path).read_bytes())
     if isinstance(obj, dict) and "summary" in obj and isinstance(obj["summary"], dict):
         return obj["summary"]
     if isinstance(obj, dict) and "schema_valid_rate" in obj:
@@ -91,8 +124,104 @@ def main() -> None:
     run.add_argument("--dataset", required=True, help="Path to JSONL dataset")
     run.add_argument("--prompt", required=True, help="Path to prompt markdown file")
     run.add_argument("--schema", required=True, help="Path to JSON schema file")
-    run.add_argument("--adapter", default="mock", help="Adapter: mock | openai | azure")
+    run.add_argument(
+        "--adapter",
+        default="mock",
+        help="Adapter: mock | openai | azure | any adapter installed via entry points",
+    )
     run.add_argument("--out", default="reports", help="Output directory for reports")
+    run.add_argument(
+        "--scorer",
+        default="title_f1",
+        help="F1 scorer: title_f1 (exact title sets) | task_f1 (field-aware optimal matching)",
+    )
+
+    run.add_argument(
+        "--score-workers",
+        type=_non_negative_int,
+        default=0,
+        help=(
+            "Validate and score in this many worker processes (0 = in-process). "
+            "Scoring is per case; the speedup comes only from running chunks in parallel."
+        ),
+    )
+    run.add_argument(
+        "--score-chunk-size",
+        type=_positive_int,
+        default=64,
+        help="Number of cases validated and scored per batch.",
+    )
+
+    run.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=1,
+        help="Number of adapter calls in flight at once.",
+    )
+    run.add_argument(
+        "--samples",
+        type=_positive_int,
+        default=1,
+        metavar="K",
+        help="Draw K outputs per case and report pass@k, F1 mean/variance and agreement.",
+    )
+    run.add_argument(
+        "--no-coalesce",
+        action="store_true",
+        help="Call the model for every case, even when cases share an identical request.",
+    )
+
+    run.add_argument(
+        "--only",
+        action="append",
+        default=None,
+        metavar="ID",
+        help="Run only this case id (repeatable). Uses the dataset's byte-offset index.",
+    )
+    run.add_argument(
+        "--shard",
+        type=_parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Run shard I (0-based) of N contiguous shards. Uses the dataset's byte-offset index.",
+    )
+
+    run.add_argument(
+        "--profile",
+        choices=("cpu", "alloc"),
+        default=None,
+        help="Profile the run (cProfile or tracemalloc); artifacts are written next to the report.",
+    )
+
+    run.add_argument(
+        "--trace-file",
+        default=None,
+        help="Append OTLP/JSON trace spans (one per case, plus children) to this file.",
+    )
+
+    run.add_argument(
+        "--record",
+        default=None,
+        metavar="CASSETTE",
+        help="Append every adapter response to this cassette for later --adapter replay.",
+    )
+
+    run.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show a live status line on stderr (rate, in-flight, p95 latency, errors, ETA).",
+    )
+    run.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Rewrite live metrics to this file (Prometheus text format, or JSON if *.json).",
+    )
+    run.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between progress updates and metrics-file rewrites (default: 1).",
+    )
 
     # Quality gates (absolute thresholds)
     run.add_argument(
@@ -114,6 +243,14 @@ def main() -> None:
         "--fail-on-empty", action="store_true", help="Fail if dataset contains zero cases."
     )
 
+    # Cost budget (enforced while the run is in flight)
+    run.add_argument(
+        "--max-cost-usd",
+        type=float,
+        default=None,
+        help="Halt the run before a call whose projected cost would exceed this budget (USD).",
+    )
+
     # Baseline regression gates
     run.add_argument("--baseline", default=None, help="Path to baseline JSON (report or summary).")
     run.add_argument(
@@ -142,26 +279,167 @@ def main() -> None:
         help="Write current summary to this JSON path (summary-only).",
     )
 
+    serve = sub.add_parser(
+        "serve",
+        help="Run a local daemon that keeps datasets, schemas and adapters warm",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Address to bind (default: localhost)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        help="Seconds between file checks for runs submitted with watch=true.",
+    )
+
+    stub = sub.add_parser(
+        "stub-server",
+        help="Serve a local OpenAI Responses API stand-in (use as OPENAI_BASE_URL)",
+    )
+    stub.add_argument("--host", default="127.0.0.1", help="Address to bind (default: localhost)")
+    stub.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    stub.add_argument(
+        "--latency",
+        default="0",
+        help="Latency in ms: N | uniform:LO,HI | lognormal:MEDIAN,SIGMA",
+    )
+    stub.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with 500.")
+    stub.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction answered with 429."
+    )
+    stub.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="Fraction answered with truncated (invalid) JSON output.",
+    )
+    stub.add_argument(
+        "--prose-rate",
+        type=float,
+        default=0.0,
+        help="Fraction answered with the JSON wrapped in prose (invalid from the first token).",
+    )
+    stub.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.0,
+        help="Delay in ms between output deltas of streamed responses.",
+    )
+    stub.add_argument("--seed", type=int, default=None, help="Seed for latency/fault draws.")
+
     args = parser.parse_args()
 
-    if args.cmd == "run":
-        report_path, summary = run_eval(
-            dataset_path=args.dataset,
-            prompt_path=args.prompt,
-            schema_path=args.schema,
-            adapter_name=args.adapter,
-            out_dir=args.out,
+    if args.cmd == "stub-server":
+        from eval_harness.adapters.stub_server import StubConfig, parse_latency, serve_stub
+
+        try:
+            parse_latency(args.latency)
+        except ValueError as e:
+            parser.error(str(e))
+        config = StubConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            malformed_rate=args.malformed_rate,
+            prose_rate=args.prose_rate,
+            token_latency_ms=args.token_latency,
+            seed=args.seed,
         )
+        serve_stub(args.host, args.port, config)
+        return
+
+    if args.cmd == "serve":
+        from eval_harness.core.daemon import serve as serve_forever
+
+        serve_forever(args.host, args.port, watch_interval_s=args.watch_interval)
+        return
+
+    if args.cmd == "run":
+        # Deferred so `--help` and argument errors return without loading the
+        # runner (jsonschema, scoring, adapters).
+        from eval_harness.core.profiling import make_profiler
+        from eval_harness.core.runner import run_eval
+
+        tracer = None
+        if args.trace_file:
+            from eval_harness.core.tracing import OtlpJsonFileExporter, Tracer
+
+            tracer = Tracer(OtlpJsonFileExporter(args.trace_file))
+
+        telemetry = None
+        if args.progress or args.metrics_file:
+            from eval_harness.core.progress import RunTelemetry
+
+            telemetry = RunTelemetry(
+                stream=sys.stderr if args.progress else None,
+                snapshot_path=args.metrics_file,
+                interval_s=args.metrics_interval,
+            )
+
+        profiler = make_profiler(args.profile)
+        profiler.start()
+        try:
+            report_path, summary = run_eval(
+                dataset_path=args.dataset,
+                prompt_path=args.prompt,
+                schema_path=args.schema,
+                adapter_name=args.adapter,
+                out_dir=args.out,
+                max_cost_usd=args.max_cost_usd,
+                scorer=args.scorer,
+                score_chunk_size=args.score_chunk_size,
+                score_workers=args.score_workers,
+                concurrency=args.concurrency,
+                coalesce=not args.no_coalesce,
+                samples=args.samples,
+                record_path=args.record,
+                only_ids=args.only,
+                shard=args.shard,
+                profiler=profiler,
+                tracer=tracer,
+                telemetry=telemetry,
+            )
+        finally:
+            profiler.stop()
+            if tracer is not None:
+                tracer.shutdown()
 
         print(f"Wrote report: {report_path}")
+        for artifact in profiler.write(Path(report_path).with_suffix("")):
+            print(f"Wrote profile: {artifact}")
+        for line in profiler.summary_lines():
+            print(line)
         print(
             "Summary:",
             f"total={summary.get('total')}, "
             f"schema_valid_rate={summary.get('schema_valid_rate'):.3f}, "
             f"exact_match_rate={summary.get('exact_match_rate'):.3f}, "
             f"avg_f1={summary.get('avg_f1'):.3f}, "
-            f"avg_latency_ms={summary.get('avg_latency_ms'):.1f}",
+            f"avg_latency_ms={summary.get('avg_latency_ms'):.1f}, "
+            f"total_cost_usd={_format_cost(summary.get('total_cost_usd'))}, "
+            f"cache_hit_rate={summary.get('cache_hit_rate'):.3f}, "
+            f"coalesced_calls_saved={summary.get('coalesced_calls_saved')}",
         )
+        routing = summary.get("routing")
+        if routing:
+            print(
+                f"Routing: hedges={routing['hedges']}, "
+                f"hedge_win_rate={routing['hedge_win_rate']:.3f}"
+            )
+            for name, ep in routing["endpoints"].items():
+                p95 = ep["p95_ms"]
+                print(
+                    f"  {name}: requests={ep['requests']}, errors={ep['errors']}, "
+                    f"share={ep['share']:.3f}, p95_ms={'-' if p95 is None else f'{p95:.0f}'}"
+                )
+        if "pass_at_k" in summary:
+            print(
+                f"Samples: k={summary.get('samples_per_case')}, "
+                f"pass@1={summary.get('pass_at_1'):.3f}, "
+                f"pass@k={summary.get('pass_at_k'):.3f}, "
+                f"avg_f1_variance={summary.get('avg_f1_variance'):.4f}, "
+                f"avg_agreement={summary.get('avg_agreement'):.3f}",
+            )
 
         failures: list[str] = []
 
@@ -169,6 +447,13 @@ def main() -> None:
         if args.fail_on_empty and int(summary.get("total", 0)) == 0:
             failures.append("dataset is empty (total=0)")
 
+        if summary.get("budget_exhausted"):
+            failures.append(
+                f"cost budget exhausted: {summary.get('skipped_count')} case(s) not run "
+                f"(spent {_format_cost(summary.get('total_cost_usd'))} "
+                f"of {args.max_cost_usd:.4f} USD)"
+            )
+
         failures += _check_threshold(
             "schema_valid_rate",
             float(summary.get("schema_valid_rate", 0.0)),
@@ -195,7 +480,7 @@ def main() -> None:
         # Write baseline summary if requested
         if args.write_baseline:
             Path(args.write_baseline).parent.mkdir(parents=True, exist_ok=True)
-            Path(args.write_baseline).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+            Path(args.write_baseline).write_text(jsonio.dumps_pretty(summary), encoding="utf-8")
             print(f"Wrote baseline summary: {args.write_baseline}")
 
         if failures:
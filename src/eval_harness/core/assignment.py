@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+
+def max_weight_assignment(weights: Sequence[Sequence[float]]) -> list[tuple[int, int]]:
+    """
+    Optimal one-to-one assignment maximizing the total weight.
+
+    `weights` is a dense rows x cols matrix (rectangular is fine). Returns
+    (row, col) pairs covering min(rows, cols) entries. Shortest augmenting path
+    Hungarian algorithm, O(n^2 * m) with n = min(rows, cols); pure Python so the
+    harness keeps its dependency footprint.
+    """
+    n_rows = len(weights)
+    if n_rows == 0:
+        return []
+    n_cols = len(weights[0])
+    if n_cols == 0:
+        return []
+
+    transposed = n_rows > n_cols
+    if transposed:
+        cost = [[-weights[r][c] for r in range(n_rows)] for c in range(n_cols)]
+        n, m = n_cols, n_rows
+    else:
+        cost = [[-w for w in row] for row in weights]
+        n, m = n_rows, n_cols
+
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    # p[j]: row (1-based) assigned to column j; way[j]: previous column on the path.
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - ui0 - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    pairs: list[tuple[int, int]] = []
+    for j in range(1, m + 1):
+        if p[j]:
+            r, c = p[j] - 1, j - 1
+            pairs.append((c, r) if transposed else (r, c))
+    pairs.sort()
+    return pairs
+
+
+def greedy_assignment(edges: Mapping[tuple[int, int], float]) -> list[tuple[int, int]]:
+    """
+    One-to-one assignment taking the heaviest remaining edge first.
+
+    `edges` maps (row, col) to a weight; absent pairs cannot be matched. At least
+    half the optimal total weight, in O(E log E) for E edges. Ties go to the
+    lowest (row, col), so the result is deterministic.
+    """
+    used_rows: set[int] = set()
+    used_cols: set[int] = set()
+    pairs: list[tuple[int, int]] = []
+    for (r, c), w in sorted(edges.items(), key=lambda item: (-item[1], item[0])):
+        if w <= 0.0 or r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        pairs.append((r, c))
+    pairs.sort()
+    return pairs
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from jsonschema import Draft202012Validator
+
+from eval_harness.core.canonical import fingerprint
+from eval_harness.core.metrics import exact_match_batch
+from eval_harness.core.schemas import load_schema, validate_batch
+from eval_harness.core.scorers import CaseScore, get_scorer, score_batch
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """Per-case metrics for one chunk, index-aligned with the chunk's outputs."""
+
+    schema_valid: list[bool]
+    schema_errors: list[list[str]]
+    exact_match: list[bool]
+    f1: array  # array("d")
+    field_scores: list[Optional[dict[str, dict[str, float]]]]
+    output_fingerprint: list[str]
+    # Wall-clock (time.time_ns) bounds of the chunk's validate and score phases:
+    # (validate_start, validate_end, score_start, score_end).
+    phase_ns: tuple[int, int, int, int] = (0, 0, 0, 0)
+
+
+class ScoreMemo:
+    """
+    Results keyed by canonical fingerprint, so identical outputs are validated once
+    (per output) and scored once (per output/expected pair) within a run.
+    Cleared wholesale when it reaches max_entries to keep memory bounded.
+    """
+
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self.validation: dict[str, tuple[bool, list[str]]] = {}
+        self.scores: dict[tuple[str, str], CaseScore] = {}
+
+    def trim(self) -> None:
+        if len(self.validation) >= self.max_entries:
+            self.validation.clear()
+        if len(self.scores) >= self.max_entries:
+            self.scores.clear()
+
+
+def score_chunk(
+    validator: Draft202012Validator,
+    scorer: str,
+    outputs: Sequence[dict[str, Any]],
+    expected: Sequence[dict[str, Any]],
+    memo: Optional[ScoreMemo] = None,
+) -> BatchScores:
+    memo = memo if memo is not None else ScoreMemo()
+    memo.trim()
+    out_fps = [fingerprint(o) for o in outputs]
+    exp_fps = [fingerprint(e) for e in expected]
+
+    # Validate and score only what the memo has not seen yet.
+    validate_start = time.time_ns()
+    new_outputs = {fp: o for fp, o in zip(out_fps, outputs) if fp not in memo.validation}
+    if new_outputs:
+        oks, errors = validate_batch(validator, list(new_outputs.values()))
+        memo.validation.update(zip(new_outputs, zip(oks, errors)))
+
+    validate_end = time.time_ns()
+
+    new_pairs: dict[tuple[str, str], tuple[dict[str, Any], dict[str, Any]]] = {}
+    for key, o, e in zip(zip(out_fps, exp_fps), outputs, expected):
+        if key not in memo.scores:
+            new_pairs[key] = (o, e)
+    if new_pairs:
+        pairs = list(new_pairs.values())
+        new_scores = score_batch(scorer, [o for o, _ in pairs], [e for _, e in pairs])
+        memo.scores.update(zip(new_pairs, new_scores))
+    score_end = time.time_ns()
+
+    validation = [memo.validation[fp] for fp in out_fps]
+    scores: list[CaseScore] = [memo.scores[key] for key in zip(out_fps, exp_fps)]
+    return BatchScores(
+        schema_valid=[ok for ok, _ in validation],
+        schema_errors=[list(errs) for _, errs in validation],
+        exact_match=exact_match_batch(outputs, expected, out_fps, exp_fps),
+        f1=array("d", (s.f1 for s in scores)),
+        field_scores=[s.field_scores for s in scores],
+        output_fingerprint=out_fps,
+        phase_ns=(validate_start, validate_end, validate_end, score_end),
+    )
+
+
+# Worker-process state, set once per process by _init_worker.
+_worker_validator: Optional[Draft202012Validator] = None
+_worker_scorer: str = ""
+_worker_memo = ScoreMemo()
+
+
+def _init_worker(schema_path: str, scorer: str) -> None:
+    global _worker_validator, _worker_scorer
+    _worker_validator = load_schema(schema_path)
+    _worker_scorer = scorer
+
+
+def _score_in_worker(
+    outputs: Sequence[dict[str, Any]], expected: Sequence[dict[str, Any]]
+) -> BatchScores:
+    assert _worker_validator is not None
+    return score_chunk(_worker_validator, _worker_scorer, outputs, expected, _worker_memo)
+
+
+class ChunkScorer:
+    """
+    Scores chunks of (output, expected) pairs, in-process or in a process pool.
+
+    With workers > 0, chunks are validated and scored in separate processes so the
+    CPU-bound work overlaps the I/O-bound adapter calls of the next chunk. Scoring
+    itself is a per-case loop either way (nothing is vectorized): the speedup comes
+    only from that process parallelism, and each chunk is pickled to and from a
+    worker, so small chunks mostly pay transfer overhead. Each
+    worker compiles the schema once and keeps its own ScoreMemo; scorers are
+    resolved by name, so custom scorers must be registered at import time to be
+    visible to workers.
+    Per-case results are identical in both modes.
+    """
+
+    def __init__(
+        self,
+        validator: Draft202012Validator,
+        *,
+        schema_path: str,
+        scorer: str,
+        workers: int = 0,
+    ):
+        get_scorer(scorer)  # fail fast on unknown names, before any worker starts
+        self.validator = validator
+        self.scorer = scorer
+        self._memo = ScoreMemo()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(schema_path, scorer),
+            )
+
+    def submit(
+        self, outputs: Sequence[dict[str, Any]], expected: Sequence[dict[str, Any]]
+    ) -> Future[BatchScores]:
+        if self._pool is not None:
+            return self._pool.submit(_score_in_worker, list(outputs), list(expected))
+        fut: Future[BatchScores] = Future()
+        fut.set_result(score_chunk(self.validator, self.scorer, outputs, expected, self._memo))
+        return fut
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
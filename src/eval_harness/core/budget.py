@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.adapters.pricing import (
+    ModelPricing,
+    TokenCounts,
+    estimate_tokens,
+    token_counts,
+)
+
+# Output-token guess used until the first real response arrives. Deliberately
+# generous so an early projection errs toward halting rather than overspending.
+_DEFAULT_OUTPUT_TOKENS = 512
+
+
+class CostBudget:
+    """
+    In-flight spend limit for a run (`--max-cost-usd`).
+
+    Before each model call the runner asks for a projected cost and reserves it;
+    the call is only dispatched if spent + reserved + projected stays within the
+    budget. Once the call returns, the reservation is replaced with the actual
+    cost. Projections come from token estimates priced with the adapter's
+    `ModelPricing`, calibrated against the usage observed so far. Without pricing
+    nothing can be projected, so a budget needs an adapter that has it.
+    Thread-safe: an adapter may reserve and settle extra calls of its own (router
+    hedges) from its worker threads.
+    """
+
+    def __init__(self, max_cost_usd: float, pricing: ModelPricing):
+        if max_cost_usd < 0:
+            raise ValueError("max_cost_usd must be >= 0")
+        self.max_cost_usd = max_cost_usd
+        self.pricing = pricing
+        self.spent_usd = 0.0
+        self.reserved_usd = 0.0
+        self.exhausted = False
+
+        self._calls = 0
+        self._estimated_input_tokens = 0
+        self._observed_input_tokens = 0
+        self._observed_output_tokens = 0
+        self._observed_token_calls = 0
+        self._lock = threading.Lock()
+
+    def projected_cost_usd(self, *, prompt: str, input_obj: dict[str, Any]) -> float:
+        with self._lock:
+            input_tokens = self._input_scale() * (
+                estimate_tokens(prompt) + estimate_tokens(str(input_obj.get("text", "")))
+            )
+            if self._observed_token_calls:
+                output_tokens = self._observed_output_tokens / self._observed_token_calls
+            else:
+                output_tokens = _DEFAULT_OUTPUT_TOKENS
+        return self.pricing.cost_usd(
+            TokenCounts(input_tokens=round(input_tokens), output_tokens=round(output_tokens))
+        )
+
+    def try_reserve(self, projected_usd: float, *, halt: bool = True) -> bool:
+        """
+        Reserve projected_usd if it fits. A refusal marks the budget exhausted
+        unless halt is False (for optional calls, which are simply not made).
+        """
+        with self._lock:
+            if self.spent_usd + self.reserved_usd + projected_usd > self.max_cost_usd:
+                self.exhausted = self.exhausted or halt
+                return False
+            self.reserved_usd += projected_usd
+            return True
+
+    def release(self, projected_usd: float) -> None:
+        """Drop a reservation whose call was never billed (cancelled before it ran)."""
+        with self._lock:
+            self.reserved_usd = max(0.0, self.reserved_usd - projected_usd)
+
+    def settle(
+        self,
+        projected_usd: float,
+        result: ModelResult,
+        *,
+        prompt: str,
+        input_obj: dict[str, Any],
+    ) -> None:
+        counts = token_counts(result.usage)
+        with self._lock:
+            self.reserved_usd = max(0.0, self.reserved_usd - projected_usd)
+            self.spent_usd += result.cost_usd or 0.0
+            self._calls += 1
+            if counts is not None:
+                self._estimated_input_tokens += estimate_tokens(prompt) + estimate_tokens(
+                    str(input_obj.get("text", ""))
+                )
+                self._observed_input_tokens += counts.input_tokens
+                self._observed_output_tokens += counts.output_tokens
+                self._observed_token_calls += 1
+
+    def _input_scale(self) -> float:
+        # Ratio of real to estimated input tokens; corrects the chars/4 heuristic
+        # for the tokenizer and any provider-side framing overhead.
+        if self._estimated_input_tokens and self._observed_input_tokens:
+            return self._observed_input_tokens / self._estimated_input_tokens
+        return 1.0
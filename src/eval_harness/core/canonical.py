@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, float):
+        # 1.0 and 1 compare equal in Python (and -0.0 == 0.0); give them one form.
+        return int(value) if value.is_integer() else value
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def canonical_json(value: Any) -> str:
+    """
+    Deterministic JSON text for a JSON-like value: sorted keys, no whitespace,
+    integral floats written as integers. Two values with the same canonical JSON
+    are equal as JSON documents. Unlike Python `==`, `true` and `1` differ.
+    """
+    return json.dumps(_normalize(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def fingerprint(value: Any) -> str:
+    """Short stable hash of `canonical_json(value)`; equal fingerprints mean equal JSON."""
+    return hashlib.blake2b(canonical_json(value).encode("utf-8"), digest_size=16).hexdigest()
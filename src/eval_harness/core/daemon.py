@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import os
+import select
+import socket
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from jsonschema import Draft202012Validator
+
+from eval_harness.adapters.base import ModelAdapter
+from eval_harness.core import jsonio
+from eval_harness.core.canonical import fingerprint
+from eval_harness.core.dataset import DatasetCase, load_jsonl
+from eval_harness.core.dataset_index import select_positions
+from eval_harness.core.runner import RunLoader, run_eval
+from eval_harness.core.schemas import load_schema
+from eval_harness.core.scorers import DEFAULT_SCORER
+
+T = TypeVar("T")
+
+# (mtime_ns, size): a file is reloaded only when this changes.
+Stamp = tuple[int, int]
+
+
+def _stamp(path: str) -> Stamp:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass(frozen=True)
+class _Cached(Generic[T]):
+    stamp: Stamp
+    value: T
+
+
+@dataclass(frozen=True)
+class CachedDataset:
+    stamp: Stamp
+    cases: list[DatasetCase]
+    # First position of each case id, and a content fingerprint per id.
+    positions: dict[str, int]
+    fingerprints: dict[str, str]
+
+
+def _index_dataset(stamp: Stamp, cases: list[DatasetCase]) -> CachedDataset:
+    positions: dict[str, int] = {}
+    fingerprints: dict[str, str] = {}
+    for i, case in enumerate(cases):
+        if case.id not in positions:
+            positions[case.id] = i
+            fingerprints[case.id] = fingerprint([case.input, case.expected, case.meta])
+    return CachedDataset(stamp, cases, positions, fingerprints)
+
+
+class WarmCache(RunLoader):
+    """
+    RunLoader that keeps parsed datasets, prompts, compiled validators and adapter
+    clients across runs. Files are re-read only when their mtime or size changes;
+    adapters are built once per name. Safe to share between request threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._datasets: dict[str, CachedDataset] = {}
+        self._prompts: dict[str, _Cached[str]] = {}
+        self._validators: dict[str, _Cached[Draft202012Validator]] = {}
+        self._adapters: dict[str, ModelAdapter] = {}
+
+    def _file(self, cache: dict[str, _Cached[T]], path: str, load: Callable[[str], T]) -> T:
+        stamp = _stamp(path)
+        with self._lock:
+            hit = cache.get(path)
+        if hit is not None and hit.stamp == stamp:
+            return hit.value
+        value = load(path)
+        with self._lock:
+            cache[path] = _Cached(stamp, value)
+        return value
+
+    def dataset(self, dataset_path: str) -> CachedDataset:
+        stamp = _stamp(dataset_path)
+        with self._lock:
+            hit = self._datasets.get(dataset_path)
+        if hit is not None and hit.stamp == stamp:
+            return hit
+        loaded = _index_dataset(stamp, load_jsonl(dataset_path))
+        with self._lock:
+            self._datasets[dataset_path] = loaded
+        return loaded
+
+    def cases(
+        self,
+        dataset_path: str,
+        only_ids: Optional[Sequence[str]] = None,
+        shard: Optional[tuple[int, int]] = None,
+    ) -> list[DatasetCase]:
+        ds = self.dataset(dataset_path)
+        positions = select_positions(
+            len(ds.cases), ds.positions.get, only_ids=only_ids, shard=shard, source=dataset_path
+        )
+        return [ds.cases[i] for i in positions]
+
+    def prompt(self, prompt_path: str) -> str:
+        return self._file(self._prompts, prompt_path, super().prompt)
+
+    def validator(self, schema_path: str) -> Draft202012Validator:
+        return self._file(self._validators, schema_path, load_schema)
+
+    def adapter(self, adapter_name: str) -> ModelAdapter:
+        with self._lock:
+            adapter = self._adapters.get(adapter_name)
+        if adapter is None:
+            adapter = super().adapter(adapter_name)
+            with self._lock:
+                adapter = self._adapters.setdefault(adapter_name, adapter)
+        return adapter
+
+    def stats(self) -> dict[str, list[str]]:
+        with self._lock:
+            return {
+                "datasets": sorted(self._datasets),
+                "prompts": sorted(self._prompts),
+                "schemas": sorted(self._validators),
+                "adapters": sorted(self._adapters),
+            }
+
+
+def changed_case_ids(before: CachedDataset, after: CachedDataset) -> list[str]:
+    """Ids that are new in `after` or whose content differs, in `after`'s file order."""
+    return [
+        case_id
+        for case_id, fp in after.fingerprints.items()
+        if before.fingerprints.get(case_id) != fp
+    ]
+
+
+_STR_FIELDS = ("dataset", "prompt", "schema", "adapter", "out_dir", "scorer")
+_INT_FIELDS = ("concurrency", "samples", "score_chunk_size")
+_BOOL_FIELDS = ("coalesce", "watch")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_types(obj: dict[str, Any]) -> None:
+    """Reject JSON values of the wrong type before anything runs."""
+    for key in _STR_FIELDS:
+        if key in obj and not isinstance(obj[key], str):
+            raise ValueError(f"{key} must be a string")
+    for key in _INT_FIELDS:
+        if key in obj and not _is_int(obj[key]):
+            raise ValueError(f"{key} must be an integer")
+    for key in _BOOL_FIELDS:
+        if key in obj and not isinstance(obj[key], bool):
+            raise ValueError(f"{key} must be true or false")
+    cost = obj.get("max_cost_usd")
+    if cost is not None and not (_is_int(cost) or isinstance(cost, float)):
+        raise ValueError("max_cost_usd must be a number or null")
+    only_ids = obj.get("only_ids")
+    if only_ids is not None and not (
+        isinstance(only_ids, list) and all(isinstance(i, str) for i in only_ids)
+    ):
+        raise ValueError("only_ids must be a list of strings or null")
+    shard = obj.get("shard")
+    if shard is not None and not (
+        isinstance(shard, list) and len(shard) == 2 and all(_is_int(x) for x in shard)
+    ):
+        raise ValueError("shard must be [I, N]")
+
+
+@dataclass(frozen=True)
+class RunRequest:
+    dataset: str
+    prompt: str
+    schema: str
+    adapter: str = "mock"
+    out_dir: str = "reports"
+    scorer: str = DEFAULT_SCORER
+    concurrency: int = 1
+    coalesce: bool = True
+    samples: int = 1
+    max_cost_usd: Optional[float] = None
+    only_ids: Optional[list[str]] = None
+    shard: Optional[tuple[int, int]] = None
+    # Rows are streamed per scoring chunk, so small chunks stream sooner.
+    score_chunk_size: int = 1
+    watch: bool = False
+
+    @classmethod
+    def from_json(cls, obj: Any) -> RunRequest:
+        if not isinstance(obj, dict):
+            raise ValueError("request body must be a JSON object")
+        missing = [k for k in ("dataset", "prompt", "schema") if not obj.get(k)]
+        if missing:
+            raise ValueError(f"missing required field(s): {', '.join(missing)}")
+        unknown = set(obj) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"unknown field(s): {', '.join(sorted(unknown))}")
+        _check_types(obj)
+        fields = dict(obj)
+        if fields.get("shard") is not None:
+            fields["shard"] = tuple(fields["shard"])
+        return cls(**fields)
+
+
+class EvalServer(ThreadingHTTPServer):
+    """Local HTTP front end for warm runs; see make_server()."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], cache: WarmCache, watch_interval_s: float) -> None:
+        super().__init__(address, _Handler)
+        self.cache = cache
+        self.watch_interval_s = watch_interval_s
+        self.stopping = threading.Event()
+
+    def shutdown(self) -> None:
+        self.stopping.set()
+        super().shutdown()
+
+
+class _ClientGone(Exception):
+    pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: EvalServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep the daemon quiet; errors are reported to the client as events.
+        pass
+
+    def _send_json(self, status: int, obj: Any) -> None:
+        body = jsonio.dumps_pretty(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _emit(self, event: dict[str, Any]) -> None:
+        try:
+            self.wfile.write(jsonio.dumps_line(event).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise _ClientGone from e
+
+    def _client_closed(self) -> bool:
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "cached": self.server.cache.stats()})
+        else:
+            self._send_json(404, {"error": f"not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/run":
+            self._send_json(404, {"error": f"not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            req = RunRequest.from_json(jsonio.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            # Snapshot before the first run so edits made while it runs are seen.
+            watch = self._watch_state(req) if req.watch else None
+            self._run(req, req.only_ids)
+            if watch is not None:
+                self._watch(req, *watch)
+        except _ClientGone:
+            pass
+
+    def _run(self, req: RunRequest, only_ids: Optional[list[str]]) -> None:
+        try:
+            report_path, summary = run_eval(
+                dataset_path=req.dataset,
+                prompt_path=req.prompt,
+                schema_path=req.schema,
+                adapter_name=req.adapter,
+                out_dir=req.out_dir,
+                max_cost_usd=req.max_cost_usd,
+                scorer=req.scorer,
+                score_chunk_size=req.score_chunk_size,
+                concurrency=req.concurrency,
+                coalesce=req.coalesce,
+                samples=req.samples,
+                only_ids=only_ids,
+                shard=req.shard,
+                loader=self.server.cache,
+                on_result=lambda row: self._emit({"event": "result", "row": row}),
+            )
+        except _ClientGone:
+            raise
+        except (ValueError, OSError) as e:
+            self._emit({"event": "error", "error": str(e)})
+            return
+        except Exception as e:
+            # Anything else (an adapter bug, a failing scorer) ends this run, not the
+            # stream: the client sees the error and a watch keeps watching.
+            self._emit({"event": "error", "error": f"{type(e).__name__}: {e}"})
+            return
+        self._emit({"event": "summary", "report_path": report_path, "summary": summary})
+
+    def _watch_state(self, req: RunRequest) -> tuple[dict[str, Stamp], Optional[CachedDataset]]:
+        try:
+            stamps = {name: _stamp(path) for name, path in _watched_paths(req).items()}
+            return stamps, self.server.cache.dataset(req.dataset)
+        except (ValueError, OSError):
+            return {}, None  # the first run reports the error; watch for a fix
+
+    def _watch(
+        self, req: RunRequest, stamps: dict[str, Stamp], dataset: Optional[CachedDataset]
+    ) -> None:
+        """
+        Poll prompt/schema/dataset stamps and re-run on change until the client
+        disconnects. A prompt or schema change re-runs every selected case; a
+        dataset change re-runs only cases that are new or whose content changed.
+        """
+        cache = self.server.cache
+        paths = _watched_paths(req)
+
+        while not self.server.stopping.wait(self.server.watch_interval_s):
+            if self._client_closed():
+                return
+            try:
+                current = {name: _stamp(path) for name, path in paths.items()}
+            except OSError:
+                continue  # mid-save (e.g. editor rename); try again next tick
+            changed = [name for name in paths if current[name] != stamps.get(name)]
+            if not changed:
+                continue
+            stamps = current
+
+            if "dataset" in changed:
+                try:
+                    previous, dataset = dataset, cache.dataset(req.dataset)
+                except ValueError as e:
+                    self._emit({"event": "error", "files": changed, "error": str(e)})
+                    continue
+                if previous is not None and "prompt" not in changed and "schema" not in changed:
+                    affected = changed_case_ids(previous, dataset)
+                    if req.only_ids:
+                        wanted = set(req.only_ids)
+                        affected = [i for i in affected if i in wanted]
+                    self._emit({"event": "change", "files": changed, "case_ids": affected})
+                    if not affected:
+                        continue
+                    self._run(req, affected)
+                    continue
+
+            self._emit({"event": "change", "files": changed, "case_ids": None})
+            self._run(req, req.only_ids)
+
+
+def _watched_paths(req: RunRequest) -> dict[str, str]:
+    return {"prompt": req.prompt, "schema": req.schema, "dataset": req.dataset}
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    cache: Optional[WarmCache] = None,
+    watch_interval_s: float = 0.5,
+) -> EvalServer:
+    """
+    Build the eval daemon's HTTP server (call serve_forever() to run it).
+
+    GET  /health  cache contents
+    POST /run     JSON RunRequest; responds with NDJSON events: one "result" per
+                  row as it is scored, then "summary" (or "error"). With
+                  "watch": true the response stays open and each file change
+                  emits "change" followed by the re-run's events.
+    """
+    return EvalServer((host, port), cache or WarmCache(), watch_interval_s)
+
+
+def serve(host: str, port: int, *, watch_interval_s: float = 0.5) -> None:
+    server = make_server(host, port, watch_interval_s=watch_interval_s)
+    print(f"eval-harness serving on http://{host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
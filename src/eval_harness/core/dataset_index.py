@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from eval_harness.core.dataset import DatasetCase, parse_case_line
+
+# Sidecar layout (little-endian), stored next to the dataset as "<dataset>.idx":
+#
+#   header   magic, dataset size, dataset mtime_ns, record count
+#   records  one per case in file order: offset, length, line number,
+#            id hash, content hash
+#   lookup   (id hash, record index) pairs sorted by hash, for binary search
+#
+# The index is trusted only while the dataset's size and mtime match the header;
+# otherwise it is rebuilt in one pass.
+_MAGIC = b"EHDSIDX1"
+_HEADER = struct.Struct("<8sQqQ")
+_RECORD = struct.Struct("<QIIQQ")
+_LOOKUP = struct.Struct("<QQ")
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def index_path_for(dataset_path: Union[str, Path]) -> Path:
+    p = Path(dataset_path)
+    return p.with_name(p.name + ".idx")
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    offset: int
+    length: int
+    lineno: int
+    content_hash: int
+
+
+def shard_range(count: int, shard: int, num_shards: int) -> range:
+    """Contiguous positions of shard `shard` (0-based) out of `num_shards`."""
+    if num_shards < 1 or not 0 <= shard < num_shards:
+        raise ValueError(f"Invalid shard {shard}/{num_shards}: expected 0 <= I < N")
+    return range(count * shard // num_shards, count * (shard + 1) // num_shards)
+
+
+def select_positions(
+    count: int,
+    locate: Callable[[str], Optional[int]],
+    *,
+    only_ids: Optional[Sequence[str]] = None,
+    shard: Optional[tuple[int, int]] = None,
+    source: str = "dataset",
+) -> Sequence[int]:
+    """
+    Positions (in file order) selected by only_ids and/or shard.
+
+    Raises ValueError for ids that are not in the dataset.
+    """
+    if not only_ids:
+        return shard_range(count, *shard) if shard is not None else range(count)
+
+    found = {case_id: locate(case_id) for case_id in dict.fromkeys(only_ids)}
+    missing = [case_id for case_id, i in found.items() if i is None]
+    if missing:
+        raise ValueError(f"Unknown case id(s) in {source}: {', '.join(missing)}")
+    positions = sorted(i for i in found.values() if i is not None)
+    if shard is not None:
+        in_shard = shard_range(count, *shard)
+        positions = [i for i in positions if i in in_shard]
+    return positions
+
+
+def _map(path: Path) -> Buffer:
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file.
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_index(dataset_path: Union[str, Path], data: Buffer, st: os.stat_result) -> bytes:
+    """
+    Scan the dataset once and return the serialized index.
+
+    Every line is parsed, so a malformed dataset fails here with the same
+    error load_jsonl() would raise.
+    """
+    p = Path(dataset_path)
+    records = bytearray()
+    lookup: list[tuple[int, int]] = []
+    pos = 0
+    lineno = 0
+    size = len(data)
+    while pos < size:
+        lineno += 1
+        end = data.find(b"\n", pos)
+        if end < 0:
+            end = size
+        line = data[pos:end]
+        if line.strip():
+            case = parse_case_line(line, path=p, lineno=lineno)
+            id_hash = _hash64(case.id.encode("utf-8"))
+            records += _RECORD.pack(pos, len(line), lineno, id_hash, _hash64(line))
+            lookup.append((id_hash, len(lookup)))
+        pos = end + 1
+
+    lookup.sort()
+    header = _HEADER.pack(_MAGIC, st.st_size, st.st_mtime_ns, len(lookup))
+    return header + bytes(records) + b"".join(_LOOKUP.pack(h, i) for h, i in lookup)
+
+
+class DatasetIndex:
+    """
+    Random access to a JSONL dataset without parsing all of it.
+
+    The dataset is memory-mapped; locate()/get()/case_at() and iter_shard()
+    parse only the lines they return. Use DatasetIndex.open().
+    """
+
+    def __init__(self, dataset_path: Path, data: Buffer, index: Buffer):
+        self.dataset_path = dataset_path
+        self._data = data
+        self._index = index
+        _, _, _, self._count = _HEADER.unpack_from(index, 0)
+        self._lookup_start = _HEADER.size + self._count * _RECORD.size
+
+    @classmethod
+    def open(cls, dataset_path: Union[str, Path], *, write_sidecar: bool = True) -> DatasetIndex:
+        """
+        Open (or build) the index for dataset_path.
+
+        A stale or missing sidecar is rebuilt and written atomically; if the
+        directory is not writable the index is kept in memory for this run.
+        """
+        p = Path(dataset_path)
+        st = p.stat()
+        data = _map(p)
+        idx_path = index_path_for(p)
+
+        index = _load_sidecar(idx_path, st)
+        if index is None:
+            index = build_index(p, data, st)
+            if write_sidecar:
+                _write_atomic(idx_path, index)
+        return cls(p, data, index)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def entry(self, i: int) -> IndexEntry:
+        if not 0 <= i < self._count:
+            raise IndexError(f"case index out of range: {i}")
+        offset, length, lineno, _, content_hash = _RECORD.unpack_from(
+            self._index, _HEADER.size + i * _RECORD.size
+        )
+        return IndexEntry(offset, length, lineno, content_hash)
+
+    def case_at(self, i: int) -> DatasetCase:
+        e = self.entry(i)
+        line = self._data[e.offset : e.offset + e.length]
+        if _hash64(line) != e.content_hash:
+            # Same size and mtime but different bytes: the index cannot be trusted.
+            raise ValueError(
+                f"Dataset {self.dataset_path} changed since its index was built "
+                f"(line {e.lineno}); delete {index_path_for(self.dataset_path)} to rebuild"
+            )
+        return parse_case_line(line, path=self.dataset_path, lineno=e.lineno)
+
+    def locate(self, case_id: str) -> Optional[int]:
+        """Position of the first case with this id, or None."""
+        target = _hash64(case_id.encode("utf-8"))
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            h, _ = _LOOKUP.unpack_from(self._index, self._lookup_start + mid * _LOOKUP.size)
+            if h < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Equal hashes are ordered by record index, so the first verified match
+        # is the first occurrence in the file.
+        while lo < self._count:
+            h, i = _LOOKUP.unpack_from(self._index, self._lookup_start + lo * _LOOKUP.size)
+            if h != target:
+                break
+            if self.case_at(i).id == case_id:
+                return i
+            lo += 1
+        return None
+
+    def get(self, case_id: str) -> Optional[DatasetCase]:
+        i = self.locate(case_id)
+        return self.case_at(i) if i is not None else None
+
+    def shard_range(self, shard: int, num_shards: int) -> range:
+        return shard_range(self._count, shard, num_shards)
+
+    def iter_shard(self, shard: int, num_shards: int) -> Iterator[DatasetCase]:
+        for i in self.shard_range(shard, num_shards):
+            yield self.case_at(i)
+
+    def close(self) -> None:
+        for buf in (self._data, self._index):
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def __enter__(self) -> DatasetIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _load_sidecar(idx_path: Path, st: os.stat_result) -> Optional[Buffer]:
+    try:
+        index = _map(idx_path)
+    except OSError:
+        return None
+    if len(index) >= _HEADER.size:
+        magic, size, mtime_ns, count = _HEADER.unpack_from(index, 0)
+        expected_len = _HEADER.size + count * (_RECORD.size + _LOOKUP.size)
+        if (
+            magic == _MAGIC
+            and size == st.st_size
+            and mtime_ns == st.st_mtime_ns
+            and len(index) == expected_len
+        ):
+            return index
+    if isinstance(index, mmap.mmap):
+        index.close()
+    return None
+
+
+def _write_atomic(idx_path: Path, index: bytes) -> None:
+    tmp = idx_path.with_name(f"{idx_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(index)
+        os.replace(tmp, idx_path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
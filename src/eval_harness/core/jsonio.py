@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Iterable
+from itertools import islice
+from typing import IO, Any, Callable, Optional
+
+try:  # Optional fast backend: pip install "ai-evaluation-harness[fast]"
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+# orjson writes floats outside 1e-4 <= |x| < 1e16 differently from json.dumps
+# ("1.8e-5" vs "1.8e-05", "0.00001" vs "1e-05", "1e16" vs "1e+16", NaN as null).
+# Before serializing, each such float is swapped for a marker string holding the
+# stdlib text; afterwards the quoted markers are replaced by that text.
+_MARK = "\x00"
+# A marker as orjson writes it: a string wrapped in escaped NULs. The float text
+# inside never holds a quote or backslash.
+_MARKED = re.compile(rb'"\\u0000([^"\\]*)\\u0000"')
+
+
+def _mark_floats(obj: Any, marked: list[int]) -> Any:
+    """Copy of obj with the floats orjson writes differently replaced by markers."""
+    cls = type(obj)
+    if cls is float:
+        if obj == 0.0 or 1e-4 <= abs(obj) < 1e16:
+            return obj
+        marked[0] += 1
+        return _MARK + json.dumps(obj) + _MARK
+    if isinstance(obj, dict):
+        return {k: _mark_floats(v, marked) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_mark_floats(v, marked) for v in obj]
+    return obj
+
+
+def _unmark(m: re.Match[bytes]) -> bytes:
+    return m.group(1)
+
+
+class JsonBackend:
+    """
+    loads: parse JSON from str or bytes.
+    dumps_pretty: text identical to json.dumps(obj, indent=2, ensure_ascii=False).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[str | bytes], Any],
+        dumps_pretty: Callable[[Any], str],
+    ):
+        self.name = name
+        self.loads = loads
+        self.dumps_pretty = dumps_pretty
+
+
+def _stdlib_dumps_pretty(obj: Any) -> str:
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+STDLIB = JsonBackend("stdlib", json.loads, _stdlib_dumps_pretty)
+
+
+def _orjson_backend() -> JsonBackend:
+    assert orjson is not None
+    fast = orjson
+
+    def dumps_pretty(obj: Any) -> str:
+        marked = [0]
+        try:
+            out = fast.dumps(_mark_floats(obj, marked), option=fast.OPT_INDENT_2)
+        except TypeError:
+            # Non-str keys, ints beyond 64 bits, lone surrogates, unknown types:
+            # let the stdlib produce (or reject) them exactly as before.
+            return _stdlib_dumps_pretty(obj)
+        if marked[0]:
+            out, found = _MARKED.subn(_unmark, out)
+            if found != marked[0]:
+                # A string of obj looks like a marker: its text cannot be told apart.
+                return _stdlib_dumps_pretty(obj)
+        return out.decode("utf-8")
+
+    return JsonBackend("orjson", fast.loads, dumps_pretty)
+
+
+def get_backend(name: str = "auto") -> JsonBackend:
+    """Resolve "auto" (orjson if installed), "orjson" or "stdlib"."""
+    if name == "stdlib":
+        return STDLIB
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("JSON backend 'orjson' requested but orjson is not installed")
+        return _orjson_backend()
+    if name == "auto":
+        return _orjson_backend() if orjson is not None else STDLIB
+    raise ValueError(f"Unknown JSON backend: {name}. Expected one of: auto, orjson, stdlib")
+
+
+_backend: Optional[JsonBackend] = None
+
+
+def current_backend() -> JsonBackend:
+    """The backend in use, resolved from EVAL_HARNESS_JSON on first use."""
+    global _backend
+    if _backend is None:
+        _backend = get_backend(os.environ.get("EVAL_HARNESS_JSON", "auto").strip() or "auto")
+    return _backend
+
+
+def set_backend(name: Optional[str]) -> None:
+    """Switch the backend; None re-reads EVAL_HARNESS_JSON on next use."""
+    global _backend
+    _backend = get_backend(name) if name is not None else None
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON; raises json.JSONDecodeError (orjson's error subclasses it)."""
+    return current_backend().loads(data)
+
+
+def dumps_pretty(obj: Any) -> str:
+    return current_backend().dumps_pretty(obj)
+
+
+def dumps_line(obj: Any) -> str:
+    """Single-line compact JSON (for NDJSON streams), same float text as dumps_pretty."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_pretty(
+    fp: IO[str], obj: dict[str, Any], key: str, items: Iterable[Any], *, batch: int = 1024
+) -> None:
+    """
+    Write the text of dumps_pretty({**obj, key: list(items)}) to fp, without building
+    the list or the whole text: items are serialized batch by batch.
+    """
+    if key in obj:
+        raise ValueError(f"write_pretty: {key!r} is written from items and must not be in obj")
+    head = dumps_pretty({**obj, key: []})
+    empty = "[]\n}"
+    if not head.endswith(empty):  # pragma: no cover - both backends end this way
+        raise ValueError("write_pretty: obj must serialize as a JSON object")
+    fp.write(head[: -len(empty)])
+
+    it = iter(items)
+    sep = "[\n"
+    while chunk := list(islice(it, batch)):
+        # A list's items sit one level deeper in obj than at the top: indent by 2 more.
+        text = dumps_pretty(chunk)[2:-2]
+        fp.write(sep + "  " + text.replace("\n", "\n  "))
+        sep = ",\n"
+    fp.write("[]\n}" if sep == "[\n" else "\n  ]\n}")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any
 
+from eval_harness.core.assignment import greedy_assignment, max_weight_assignment
+
 
 def exact_match(pred: dict[str, Any], exp: dict[str, Any]) -> bool:
+    """Python equality: key order is ignored, True == 1 and 1 == 1.0."""
     return pred == exp
 
 
@@ -34,3 +40,189 @@ def f1_for_titles(pred: dict[str, Any], exp: dict[str, Any]) -> float:
     if precision + recall == 0:
         return 0.0
     return 2 * (precision * recall) / (precision + recall)
+
+
+# --- Field-aware task matching -------------------------------------------------
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Title similarity dominates; assignee/due_date agreement refines the match.
+TITLE_WEIGHT = 0.6
+ASSIGNEE_WEIGHT = 0.2
+DUE_DATE_WEIGHT = 0.2
+
+TASK_FIELDS = ("title", "assignee", "due_date")
+
+# Largest component solved exactly, as Hungarian work min(r, c)^2 * max(r, c).
+# Titles sharing a common token ("the", "follow up") join one component, so
+# larger ones fall back to greedy matching instead of growing cubically.
+MAX_EXACT_ASSIGNMENT_WORK = 64**3
+
+
+@dataclass(frozen=True)
+class TaskMatchScore:
+    precision: float
+    recall: float
+    f1: float
+    # {"title": {"precision": .., "recall": ..}, "assignee": {...}, "due_date": {...}}
+    fields: dict[str, dict[str, float]]
+
+
+class _Task:
+    __slots__ = ("tokens", "assignee", "due_date")
+
+    def __init__(self, task: dict[str, Any]):
+        title = task.get("title")
+        self.tokens = (
+            frozenset(_TOKEN_RE.findall(title.lower())) if isinstance(title, str) else frozenset()
+        )
+        assignee = task.get("assignee")
+        self.assignee = assignee.strip().lower() if isinstance(assignee, str) else assignee
+        due_date = task.get("due_date")
+        self.due_date = due_date.strip() if isinstance(due_date, str) else due_date
+
+
+def _tasks(obj: dict[str, Any]) -> list[_Task]:
+    tasks = obj.get("tasks", [])
+    if not isinstance(tasks, list):
+        return []
+    return [_Task(t) for t in tasks if isinstance(t, dict)]
+
+
+def _title_overlaps(pred: list[_Task], exp: list[_Task]) -> dict[tuple[int, int], float]:
+    """Token-set (Jaccard) title similarity for every pair sharing at least one token."""
+    postings: dict[str, list[int]] = {}
+    for j, e in enumerate(exp):
+        for tok in e.tokens:
+            postings.setdefault(tok, []).append(j)
+
+    overlaps: dict[tuple[int, int], float] = {}
+    for i, p in enumerate(pred):
+        shared: dict[int, int] = {}
+        for tok in p.tokens:
+            for j in postings.get(tok, ()):
+                shared[j] = shared.get(j, 0) + 1
+        n_p = len(p.tokens)
+        for j, inter in shared.items():
+            overlaps[(i, j)] = inter / (n_p + len(exp[j].tokens) - inter)
+    return overlaps
+
+
+def _components(edges: dict[tuple[int, int], float]) -> list[tuple[list[int], list[int]]]:
+    """Connected components of the bipartite pred/exp graph induced by `edges`."""
+    parent: dict[tuple[int, int], tuple[int, int]] = {}
+
+    def find(x: tuple[int, int]) -> tuple[int, int]:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in edges:
+        a, b = (0, i), (1, j)
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+
+    groups: dict[tuple[int, int], tuple[list[int], list[int]]] = {}
+    for node in parent:
+        rows, cols = groups.setdefault(find(node), ([], []))
+        (rows if node[0] == 0 else cols).append(node[1])
+    return list(groups.values())
+
+
+def task_match(pred: dict[str, Any], exp: dict[str, Any]) -> TaskMatchScore:
+    """
+    Field-aware F1 over tasks with an optimal one-to-one matching.
+
+    Each predicted/expected pair scores
+    TITLE_WEIGHT * jaccard(title tokens) + ASSIGNEE_WEIGHT * [assignee agrees]
+    + DUE_DATE_WEIGHT * [due_date agrees], with pairs whose titles share no token
+    scoring 0. Duplicates are kept (multiset semantics). Precision and recall are
+    the matched similarity mass over the predicted and expected task counts.
+
+    Only pairs sharing a title token are ever materialized, and the assignment is
+    solved independently per connected component. A component larger than
+    MAX_EXACT_ASSIGNMENT_WORK is matched greedily (heaviest pair first, at least
+    half the optimal mass), which bounds the work on lists of hundreds of tasks
+    with a common word.
+    """
+    p_tasks = _tasks(pred)
+    e_tasks = _tasks(exp)
+    n_p, n_e = len(p_tasks), len(e_tasks)
+
+    if not n_p and not n_e:
+        perfect = {"precision": 1.0, "recall": 1.0}
+        return TaskMatchScore(1.0, 1.0, 1.0, {f: dict(perfect) for f in TASK_FIELDS})
+    if not n_p or not n_e:
+        zero = {"precision": 0.0, "recall": 0.0}
+        return TaskMatchScore(0.0, 0.0, 0.0, {f: dict(zero) for f in TASK_FIELDS})
+
+    overlaps = _title_overlaps(p_tasks, e_tasks)
+    sims: dict[tuple[int, int], float] = {}
+    for (i, j), title_sim in overlaps.items():
+        p, e = p_tasks[i], e_tasks[j]
+        sims[(i, j)] = (
+            TITLE_WEIGHT * title_sim
+            + ASSIGNEE_WEIGHT * (p.assignee == e.assignee)
+            + DUE_DATE_WEIGHT * (p.due_date == e.due_date)
+        )
+
+    matched: list[tuple[int, int]] = []
+    # Pred index -> edges of its component, for components matched greedily.
+    greedy: dict[int, dict[tuple[int, int], float]] = {}
+    for rows, cols in _components(sims):
+        if len(rows) == 1 or len(cols) == 1:
+            best = max(((r, c) for r in rows for c in cols), key=lambda rc: sims[rc])
+            matched.append(best)
+            continue
+        small, large = sorted((len(rows), len(cols)))
+        if small * small * large > MAX_EXACT_ASSIGNMENT_WORK:
+            edges: dict[tuple[int, int], float] = {}
+            greedy.update(dict.fromkeys(rows, edges))
+            continue
+        weights = [[sims.get((r, c), 0.0) for c in cols] for r in rows]
+        for ri, ci in max_weight_assignment(weights):
+            if weights[ri][ci] > 0.0:
+                matched.append((rows[ri], cols[ci]))
+    if greedy:
+        for (i, j), sim in sims.items():
+            if i in greedy:
+                greedy[i][(i, j)] = sim
+        for edges in {id(e): e for e in greedy.values()}.values():
+            matched.extend(greedy_assignment(edges))
+
+    total = title = assignee = due_date = 0.0
+    for i, j in matched:
+        p, e = p_tasks[i], e_tasks[j]
+        total += sims[(i, j)]
+        title += overlaps[(i, j)]
+        assignee += p.assignee == e.assignee
+        due_date += p.due_date == e.due_date
+
+    precision = total / n_p
+    recall = total / n_e
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    fields = {
+        name: {"precision": value / n_p, "recall": value / n_e}
+        for name, value in (("title", title), ("assignee", assignee), ("due_date", due_date))
+    }
+    return TaskMatchScore(precision, recall, f1, fields)
+
+
+def exact_match_batch(
+    preds: Sequence[dict[str, Any]],
+    exps: Sequence[dict[str, Any]],
+    pred_fps: Sequence[str],
+    exp_fps: Sequence[str],
+) -> list[bool]:
+    """
+    exact_match() over a chunk, using the fingerprints (see core/canonical.py) the
+    chunk already has: equal fingerprints mean equal values, so only differing
+    ones are compared with ==. (NaN, unequal to itself, matches here.)
+    """
+    return [
+        fp == efp or p == e for p, e, fp, efp in zip(preds, exps, pred_fps, exp_fps, strict=True)
+    ]
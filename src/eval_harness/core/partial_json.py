@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Optional
+
+_WHITESPACE = " \t\r\n"
+
+# Where the scanner is within the top-level object.
+_KEY = 0  # expecting a member name (or "}")
+_VALUE = 1  # after ":", expecting the first character of a member value
+_AFTER_VALUE = 2  # inside or after a member value, until the next "," at depth 1
+
+
+class PartialJsonCheck:
+    """
+    Incremental check that streamed JSON can still be {"<array_key>": [...], ...}.
+
+    feed() takes text deltas as they arrive and returns a reason string as soon as
+    the output can no longer satisfy that shape:
+
+    - the top-level value is not an object
+    - the member `array_key` starts with something other than "["
+    - the object closes without an `array_key` member
+
+    It tracks only string/escape state and nesting depth, not a full parse; the
+    complete text is still parsed and schema-validated as usual. Once the array
+    has started no further violation is possible, and feed() stops scanning.
+    """
+
+    def __init__(self, array_key: str = "tasks"):
+        self.array_key = array_key
+        self.violation: Optional[str] = None
+        self.satisfied = False
+        self._depth = 0
+        self._state = _KEY
+        self._in_string = False
+        self._escape = False
+        # Characters of the depth-1 member name being read, or None.
+        self._key: Optional[list[str]] = None
+        self._last_key = ""
+
+    def _fail(self, reason: str) -> str:
+        self.violation = reason
+        return reason
+
+    def feed(self, delta: str) -> Optional[str]:
+        if self.violation is not None or self.satisfied:
+            return self.violation
+        for ch in delta:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key is not None:
+                        self._last_key = "".join(self._key)
+                        self._key = None
+                    continue
+                if self._key is not None:
+                    self._key.append(ch)
+                continue
+            if ch in _WHITESPACE:
+                continue
+
+            if self._depth == 0:
+                if ch != "{":
+                    return self._fail("top-level value is not an object")
+                self._depth = 1
+                self._state = _KEY
+                continue
+
+            if self._depth == 1 and self._state == _VALUE:
+                self._state = _AFTER_VALUE
+                if self._last_key == self.array_key:
+                    if ch != "[":
+                        return self._fail(f"{self.array_key!r} is not an array")
+                    self.satisfied = True
+                    return None
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == _KEY:
+                    self._key = []
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._fail(f"object has no {self.array_key!r} array")
+            elif self._depth == 1:
+                if ch == ":":
+                    self._state = _VALUE
+                elif ch == ",":
+                    self._state = _KEY
+        return None
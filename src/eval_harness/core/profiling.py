@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Optional
+
+PROFILE_MODES = ("cpu", "alloc")
+
+# Harness stages a profile is attributed to. CPU: cumulative time of the entry
+# functions (file suffix, function name, and optionally the only caller that
+# counts). Calls coming from another entry of the same stage are skipped, so
+# wrappers are not counted twice. Alloc: see _STAGE_FILES.
+_Entry = tuple[str, str, Optional[str]]
+_STAGES: dict[str, tuple[_Entry, ...]] = {
+    "load_jsonl": (
+        ("core/dataset.py", "load_jsonl", None),
+        ("core/dataset_index.py", "open", None),
+        ("core/dataset_index.py", "case_at", None),
+    ),
+    "adapter": (("", "generate_structured", None),),
+    "validate_or_errors": (("core/schemas.py", "validate_or_errors", None),),
+    "metrics": (
+        ("core/scorers.py", "score_batch", None),
+        ("core/metrics.py", "exact_match_batch", None),
+        # Output/expected fingerprints for exact match, not request coalescing keys.
+        ("core/canonical.py", "fingerprint", "score_chunk"),
+    ),
+    "serialization": (
+        ("core/jsonio.py", "dumps_pretty", None),
+        ("core/jsonio.py", "write_pretty", None),
+    ),
+}
+
+# Alloc: the innermost stack frame whose file belongs to a stage decides it.
+_STAGE_FILES: dict[str, tuple[str, ...]] = {
+    "load_jsonl": ("core/dataset.py", "core/dataset_index.py"),
+    "adapter": ("eval_harness/adapters/", "/openai/", "/httpx/", "/httpcore/"),
+    "validate_or_errors": ("core/schemas.py", "/jsonschema/"),
+    "metrics": (
+        "core/metrics.py",
+        "core/scorers.py",
+        "core/batch.py",
+        "core/canonical.py",
+        "core/assignment.py",
+    ),
+    "serialization": ("core/jsonio.py", "/json/", "orjson"),
+}
+
+
+def _norm(filename: str) -> str:
+    return filename.replace("\\", "/")
+
+
+def _entry_for(func: tuple[str, int, str], entries: tuple[_Entry, ...]) -> Optional[_Entry]:
+    filename, _, name = func
+    filename = _norm(filename)
+    for entry in entries:
+        if name == entry[1] and filename.endswith(entry[0]):
+            return entry
+    return None
+
+
+def stage_times(stats: pstats.Stats) -> dict[str, float]:
+    """Seconds spent under each stage's entry functions (see _STAGES)."""
+    raw: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+    out: dict[str, float] = {}
+    for stage, entries in _STAGES.items():
+        total = 0.0
+        for func, (_, _, _, _, callers) in raw.items():
+            entry = _entry_for(func, entries)
+            if entry is None:
+                continue
+            for caller, (_, _, _, ct) in callers.items():
+                if entry[2] is not None and caller[2] != entry[2]:
+                    continue
+                if _entry_for(caller, entries) is None:
+                    total += ct
+        out[stage] = total
+    return out
+
+
+class RunProfiler:
+    """
+    Profiles the harness side of a run (see make_profiler()).
+
+    start() / stop() bracket the run; the runner calls results_ready() once all
+    rows are scored, which the allocation profiler uses to snapshot live data.
+    """
+
+    mode = "none"
+
+    def start(self) -> None:
+        pass
+
+    def results_ready(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def write(self, base: Path) -> list[Path]:
+        """Write artifacts as <base>.<mode>.*; returns their paths."""
+        return []
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        return []
+
+
+class CpuProfiler(RunProfiler):
+    """
+    cProfile over the calling thread and every thread started while it runs
+    (adapter calls run on a thread pool when --concurrency > 1). Work done in
+    --score-workers processes is not included.
+    """
+
+    mode = "cpu"
+
+    def __init__(self) -> None:
+        self._main = cProfile.Profile()
+        self._threads: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+        self._t0 = 0.0
+        self._wall_s = 0.0
+
+    def _thread_hook(self, frame: Any, event: str, arg: Any) -> None:
+        # Installed via threading.setprofile: runs once at the start of each new
+        # thread, then hands that thread over to its own cProfile instance.
+        sys.setprofile(None)
+        prof = cProfile.Profile()
+        with self._lock:
+            self._threads.append(prof)
+        prof.enable()
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter()
+        threading.setprofile(self._thread_hook)
+        self._main.enable()
+
+    def stop(self) -> None:
+        self._main.disable()
+        threading.setprofile(None)  # type: ignore[arg-type]
+        self._wall_s = time.perf_counter() - self._t0
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            for prof in self._threads:
+                prof.create_stats()
+                if prof.stats:  # type: ignore[attr-defined]
+                    stats.add(prof)
+        self._stats = stats
+
+    @property
+    def stats(self) -> pstats.Stats:
+        if self._stats is None:
+            raise ValueError("profiler has not been stopped")
+        return self._stats
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        stats = self.stats
+        lines = [f"CPU profile: {self._wall_s:.3f}s wall"]
+        lines.append("  by stage (cumulative s):")
+        for stage, seconds in stage_times(stats).items():
+            lines.append(f"    {stage:<20} {seconds:>9.3f}")
+        lines.append(f"  top {top} functions by own time (s, calls):")
+        raw: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+        hottest = sorted(raw.items(), key=lambda kv: kv[1][2], reverse=True)[:top]
+        for (filename, lineno, name), (_, nc, tt, _, _) in hottest:
+            lines.append(f"    {tt:>9.3f} {nc:>9}  {_short(filename)}:{lineno}({name})")
+        return lines
+
+    def write(self, base: Path) -> list[Path]:
+        pstats_path = base.with_name(base.name + ".cpu.pstats")
+        text_path = base.with_name(base.name + ".cpu.txt")
+        self.stats.dump_stats(str(pstats_path))
+
+        buf = io.StringIO()
+        pstats.Stats(str(pstats_path), stream=buf).sort_stats("cumulative").print_stats(60)
+        text = "\n".join(self.summary_lines(25)) + "\n\n" + buf.getvalue()
+        text_path.write_text(text, encoding="utf-8")
+        return [pstats_path, text_path]
+
+
+class AllocProfiler(RunProfiler):
+    """
+    tracemalloc over the whole run (all threads). The snapshot is taken at results_ready(),
+    when every result row is live; peak covers the entire run.
+    """
+
+    mode = "alloc"
+
+    def __init__(self, nframes: int = 25) -> None:
+        self.nframes = nframes
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak = 0
+        self._was_tracing = False
+
+    def start(self) -> None:
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.nframes)
+        tracemalloc.reset_peak()
+
+    def results_ready(self) -> None:
+        self._snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        if self._snapshot is None:
+            self._snapshot = tracemalloc.take_snapshot()
+        self._peak = tracemalloc.get_traced_memory()[1]
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    @property
+    def snapshot(self) -> tracemalloc.Snapshot:
+        if self._snapshot is None:
+            raise ValueError("profiler has not been stopped")
+        return self._snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+
+    def stage_bytes(self) -> dict[str, int]:
+        out = dict.fromkeys(_STAGE_FILES, 0)
+        out["other"] = 0
+        for stat in self.snapshot.statistics("traceback"):
+            out[_alloc_stage(stat.traceback)] += stat.size
+        return out
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        snapshot = self.snapshot
+        live = sum(s.size for s in snapshot.statistics("filename"))
+        lines = [
+            f"Allocation profile: peak {_mib(self._peak)}, "
+            f"live when results were complete {_mib(live)}"
+        ]
+        lines.append("  live memory by stage:")
+        for stage, size in self.stage_bytes().items():
+            lines.append(f"    {stage:<20} {_mib(size):>12}")
+        lines.append(f"  top {top} allocation sites (live size, blocks):")
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"    {_mib(stat.size):>12} {stat.count:>9}  "
+                f"{_short(frame.filename)}:{frame.lineno}"
+            )
+        return lines
+
+    def write(self, base: Path) -> list[Path]:
+        snap_path = base.with_name(base.name + ".alloc.snapshot")
+        text_path = base.with_name(base.name + ".alloc.txt")
+        self.snapshot.dump(str(snap_path))
+        text_path.write_text("\n".join(self.summary_lines(40)) + "\n", encoding="utf-8")
+        return [snap_path, text_path]
+
+
+def _alloc_stage(traceback: tracemalloc.Traceback) -> str:
+    # tracemalloc tracebacks run from the oldest frame to the most recent one; walk
+    # them backwards so the innermost matching frame decides.
+    for frame in reversed(traceback):
+        filename = _norm(frame.filename)
+        for stage, parts in _STAGE_FILES.items():
+            if any(part in filename for part in parts):
+                return stage
+    return "other"
+
+
+def _short(filename: str) -> str:
+    filename = _norm(filename)
+    for marker in ("/site-packages/", "/src/", "/lib/python"):
+        idx = filename.rfind(marker)
+        if idx >= 0:
+            return filename[idx + len(marker) :]
+    return filename
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
+
+
+def make_profiler(mode: Optional[str]) -> RunProfiler:
+    """Profiler for --profile: "cpu", "alloc", or None for a no-op."""
+    if mode is None:
+        return RunProfiler()
+    if mode == "cpu":
+        return CpuProfiler()
+    if mode == "alloc":
+        return AllocProfiler()
+    raise ValueError(f"Unknown profile mode: {mode}. Expected one of: {', '.join(PROFILE_MODES)}")
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+from eval_harness.core import jsonio
+
+# Latency bucket upper bounds in ms: powers of sqrt(2) from 1 ms to ~17 minutes.
+# Fine enough for a useful p95, coarse enough to render as a Prometheus histogram.
+LATENCY_BUCKETS_MS: tuple[float, ...] = tuple(round(2 ** (i / 2), 1) for i in range(41))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram; O(log buckets) to record, percentiles by interpolation."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        # One extra bucket for values above the last bound (+Inf).
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def discard(self, value: float) -> None:
+        """Undo record(value), for a histogram over a sliding window."""
+        self.counts[bisect_left(self.bounds, value)] -= 1
+        self.count -= 1
+        self.sum -= value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0..1), or None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lo + (hi - lo) * ((rank - seen) / n)
+            seen += n
+        return self.bounds[-1]
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class RunTelemetry:
+    """
+    Live progress for a run: a rate-limited stderr status line and/or a metrics
+    snapshot file (Prometheus text format, or JSON when the path ends in .json)
+    rewritten atomically for node_exporter's textfile collector.
+
+    The runner calls begin() once, case_completed() per adapter result,
+    rows_scored() per scored chunk and finish() at the end. Per-case work is a
+    few counter updates and one clock read; rendering and file writes happen at
+    most once per interval_s.
+    """
+
+    def __init__(
+        self,
+        *,
+        stream: Optional[TextIO] = None,
+        snapshot_path: Optional[str | Path] = None,
+        interval_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.stream = stream
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.interval_s = interval_s
+        self.clock = clock
+        # Overwrite one line on a terminal; print a line per update in logs.
+        self._end = "\r" if stream is not None and stream.isatty() else "\n"
+
+        self.run_id = ""
+        self.total = 0
+        self.completed = 0
+        self.scored = 0
+        self.in_flight = 0
+        self.parse_errors = 0
+        self.schema_invalid = 0
+        self.cost_usd = 0.0
+        self.latency = LatencyHistogram()
+        self._start = 0.0
+        self._next_render = 0.0
+
+    def begin(self, *, run_id: str, total: int) -> None:
+        self.run_id = run_id
+        self.total = total
+        self._start = self.clock()
+        self._next_render = self._start + self.interval_s
+        self._render()
+
+    def case_completed(
+        self,
+        *,
+        latency_ms: Optional[float],
+        parse_error: bool,
+        cost_usd: Optional[float],
+        in_flight: int,
+    ) -> None:
+        self.completed += 1
+        self.in_flight = in_flight
+        if latency_ms is not None:
+            self.latency.record(latency_ms)
+        if parse_error:
+            self.parse_errors += 1
+        if cost_usd:
+            self.cost_usd += cost_usd
+        if self.clock() >= self._next_render:
+            self._render()
+
+    def rows_scored(self, scored: int, schema_invalid: int) -> None:
+        self.scored += scored
+        self.schema_invalid += schema_invalid
+
+    def finish(self) -> None:
+        self.in_flight = 0
+        self._render(final=True)
+
+    def elapsed_s(self) -> float:
+        return max(self.clock() - self._start, 0.0)
+
+    def rate(self) -> float:
+        elapsed = self.elapsed_s()
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_s(self) -> Optional[float]:
+        rate = self.rate()
+        if rate <= 0:
+            return None
+        return max(self.total - self.completed, 0) / rate
+
+    def snapshot(self) -> dict[str, Any]:
+        p95 = self.latency.percentile(0.95)
+        return {
+            "run_id": self.run_id,
+            "cases_total": self.total,
+            "cases_completed": self.completed,
+            "cases_scored": self.scored,
+            "in_flight": self.in_flight,
+            "cases_per_second": self.rate(),
+            "eta_seconds": self.eta_s(),
+            "elapsed_seconds": self.elapsed_s(),
+            "latency_p50_ms": self.latency.percentile(0.5),
+            "latency_p95_ms": p95,
+            "parse_errors": self.parse_errors,
+            "schema_invalid": self.schema_invalid,
+            "cost_usd": self.cost_usd,
+        }
+
+    def status_line(self) -> str:
+        width = len(str(self.total))
+        p95 = self.latency.percentile(0.95)
+        eta = self.eta_s()
+        return (
+            f"[{self.completed:>{width}}/{self.total}] "
+            f"{self.rate():.1f} cases/s | in-flight {self.in_flight} | "
+            f"p95 {'-' if p95 is None else f'{p95:.0f} ms'} | "
+            f"parse errors {self.parse_errors} | schema invalid {self.schema_invalid} | "
+            f"ETA {'-' if eta is None else _format_duration(eta)}"
+        )
+
+    def _render(self, final: bool = False) -> None:
+        self._next_render = self.clock() + self.interval_s
+        if self.stream is not None:
+            self.stream.write(self.status_line() + ("\n" if final else self._end))
+            self.stream.flush()
+        if self.snapshot_path is not None:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        assert self.snapshot_path is not None
+        if self.snapshot_path.suffix == ".json":
+            text = jsonio.dumps_pretty(self.snapshot())
+        else:
+            text = self.prometheus_text()
+        tmp = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.snapshot_path)
+
+    def prometheus_text(self) -> str:
+        label = f'run_id="{self.run_id}"'
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, value: float) -> None:
+            lines.append(f"# HELP eval_harness_{name} {help_text}")
+            lines.append(f"# TYPE eval_harness_{name} {kind}")
+            lines.append(f"eval_harness_{name}{{{label}}} {value}")
+
+        metric("cases", "gauge", "Cases selected for the run.", self.total)
+        metric("cases_completed_total", "counter", "Adapter results received.", self.completed)
+        metric("cases_scored_total", "counter", "Rows validated and scored.", self.scored)
+        metric("in_flight", "gauge", "Adapter calls in flight.", self.in_flight)
+        metric("cases_per_second", "gauge", "Mean completion rate.", round(self.rate(), 3))
+        eta = self.eta_s()
+        metric("eta_seconds", "gauge", "Estimated time to completion.", round(eta or 0.0, 1))
+        metric("parse_errors_total", "counter", "Outputs that were not JSON.", self.parse_errors)
+        metric(
+            "schema_invalid_total", "counter", "Outputs failing the schema.", self.schema_invalid
+        )
+        metric("cost_usd_total", "counter", "Model spend so far.", self.cost_usd)
+
+        name = "eval_harness_adapter_latency_ms"
+        lines.append(f"# HELP {name} Adapter call latency.")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, n in zip(self.latency.bounds, self.latency.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {self.latency.count}')
+        lines.append(f"{name}_sum{{{label}}} {self.latency.sum}")
+        lines.append(f"{name}_count{{{label}}} {self.latency.count}")
+        return "\n".join(lines) + "\n"
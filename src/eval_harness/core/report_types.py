@@ -10,18 +10,94 @@ class ReportMeta(TypedDict):
     dataset_path: str
     prompt_path: str
     schema_path: str
+    # Present when the run covered a subset of the dataset (--only / --shard).
+    only_ids: NotRequired[list[str]]
+    shard: NotRequired[str]
+    # Outputs drawn per case (--samples), when more than one.
+    samples: NotRequired[int]
 
 
 class ReportSummary(TypedDict):
     run_id: str
     started_at_utc: str
     adapter: str
+    scorer: str
     total: int
     schema_valid_rate: float
     exact_match_rate: float
     avg_f1: float
     avg_latency_ms: float
     parse_error_count: int
+    # None when no call reported a cost (no pricing for the model).
+    total_cost_usd: float | None
+    # Spend per exact-match case; None when nothing matched or the cost is unknown.
+    cost_per_correct_usd: float | None
+    # True when --max-cost-usd halted the run before every case was dispatched.
+    budget_exhausted: bool
+    skipped_count: int
+    # Model calls avoided by sharing one call across cases with identical requests.
+    coalesced_calls_saved: int
+    total_input_tokens: int
+    total_cached_input_tokens: int
+    # Share of input tokens served from the provider's prompt cache (0 when unknown).
+    cache_hit_rate: float
+    # Mean per-field precision/recall, present for field-aware scorers only.
+    field_scores: NotRequired[dict[str, dict[str, float]]]
+    # Present when the adapter streamed (EVAL_HARNESS_STREAM=on|abort).
+    avg_ttft_ms: NotRequired[float]
+    avg_output_tokens_per_s: NotRequired[float]
+    stream_aborted_count: NotRequired[int]
+    # Estimated output tokens not generated thanks to early aborts.
+    stream_tokens_saved: NotRequired[int]
+    # Means of the per-case SampleReport values, present with --samples > 1.
+    samples_per_case: NotRequired[int]
+    pass_at_1: NotRequired[float]
+    pass_at_k: NotRequired[float]
+    avg_sample_f1: NotRequired[float]
+    avg_f1_variance: NotRequired[float]
+    avg_agreement: NotRequired[float]
+    # Present when the adapter is the multi-endpoint router.
+    routing: NotRequired[RoutingReport]
+
+
+class EndpointReport(TypedDict):
+    weight: float
+    requests: int
+    errors: int
+    # Requests sent to this endpoint as a hedge of a slow call elsewhere.
+    hedges: int
+    # Calls whose result was used, and their share of all calls.
+    wins: int
+    share: float
+    # Losing requests of hedged pairs.
+    cancelled: int
+    p50_ms: float | None
+    p95_ms: float | None
+
+
+class RoutingReport(TypedDict):
+    endpoints: dict[str, EndpointReport]
+    hedges: int
+    hedge_wins: int
+    hedge_win_rate: float
+    # Hedges not sent because the cost budget had no room for them.
+    hedges_skipped: int
+    # Billed cost of the calls that lost a hedge (already in total_cost_usd), and
+    # losers still running when the report was made (not yet counted).
+    hedge_loser_cost_usd: float
+    hedge_losers_pending: int
+
+
+class SampleReport(TypedDict):
+    n: int
+    pass_at_1: float
+    # Any of the n samples matched exactly (k = n).
+    pass_at_k: float
+    f1_mean: float
+    f1_variance: float
+    # Share of samples identical to the most common output.
+    agreement: float
+    schema_valid_rate: float
 
 
 class ReportResultRow(TypedDict):
@@ -33,6 +109,22 @@ class ReportResultRow(TypedDict):
     latency_ms: int
     usage: Any
     cost_usd: NotRequired[float | None]
+    # Canonical-JSON hash of the output; differing values across runs of the same
+    # case expose model nondeterminism.
+    output_fingerprint: str
+    # Id of the case whose model call this row reused (request coalescing).
+    coalesced_from: NotRequired[str]
+    # Streaming calls only (see ModelResult).
+    ttft_ms: NotRequired[int]
+    output_tokens_per_s: NotRequired[float]
+    stream_aborted: NotRequired[str]
+    tokens_saved: NotRequired[int]
+    # Stability over all samples when --samples > 1; the other metrics in the row
+    # are for the first sample, and usage/cost cover all of them.
+    samples: NotRequired[SampleReport]
+    # Endpoint that served the call (router adapter).
+    endpoint: NotRequired[str]
+    field_scores: NotRequired[dict[str, dict[str, float]]]
 
 
 class EvalReport(TypedDict):
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterator
+from itertools import islice
+from typing import Any, Optional, cast
+
+from eval_harness.core.report_types import ReportResultRow
+
+# Keys every runner row starts with, in report order. Whatever follows them
+# (coalescing, streaming, samples, routing, field scores) is the row's tail.
+_HEAD_KEYS = (
+    "id",
+    "schema_valid",
+    "schema_errors",
+    "exact_match",
+    "f1",
+    "latency_ms",
+    "usage",
+    "cost_usd",
+    "output_fingerprint",
+)
+
+# Bits of the per-row flags byte.
+_SCHEMA_VALID = 1
+_EXACT_MATCH = 2
+_HAS_COST = 4
+
+# Leaf kinds of a shape signature; constants are ("c", value) and objects are
+# ("d", ((key, signature), ...)).
+_INT = 0
+_FLOAT = 1
+_STR = 2
+
+# Integers stored in the float column must round-trip exactly.
+_MAX_EXACT_INT = 2**53
+# Distinct usage/tail layouts before further rows are kept as plain dicts.
+_MAX_SHAPES = 4096
+_FINGERPRINT_BYTES = 16
+
+
+class _Shape:
+    """The layout of a JSON value whose numbers and strings are stored as slots."""
+
+    def __init__(self, sig: Any):
+        self.sig = sig
+        self.width = _width(sig)
+        # Top-level keys of an object layout: key -> (first slot, signature).
+        self.fields: dict[str, tuple[int, Any]] = {}
+        if isinstance(sig, tuple) and sig[0] == "d":
+            offset = 0
+            for key, sub in sig[1]:
+                self.fields[key] = (offset, sub)
+                offset += _width(sub)
+
+
+def _number(value: Any) -> float:
+    """An irregular row's value for a summary column: the number it holds, else 0.0."""
+    if isinstance(value, (int, float)):
+        try:
+            return float(value)
+        except OverflowError:
+            return 0.0
+    return 0.0
+
+
+def _width(sig: Any) -> int:
+    if isinstance(sig, int):
+        return 1
+    if sig[0] == "d":
+        return sum(_width(sub) for _, sub in sig[1])
+    return 0
+
+
+class ResultStore:
+    """
+    Report rows held column-wise instead of as one dict per case.
+
+    Booleans share a flags byte; f1, latency and cost are float arrays; the
+    output fingerprint is kept as its 16 raw bytes and the id as UTF-8 bytes.
+    Schema error messages are interned, so a row holds only their indices.
+    `usage` and the row's tail are flattened: their layout (keys, constants) is
+    stored once per distinct shape and their numbers, plus indices of interned
+    strings, go into one float array.
+
+    Iterating yields rows equal to the appended ones, with the same key order
+    and value types, so a report written from the store is byte-identical to
+    one written from the dicts. Rows that do not fit the layout (unexpected
+    keys or types, lists in usage, ids that are not valid UTF-8) are kept as
+    they are.
+    """
+
+    def __init__(self) -> None:
+        self._ids = bytearray()
+        self._id_ends = array("Q")
+        self._flags = array("B")
+        self.f1 = array("d")
+        self.latency_ms = array("d")
+        self._cost = array("d")
+        self._fingerprints = bytearray()
+        self._errors = array("I")
+        self._error_ends = array("Q")
+        self._usage_shape = array("H")
+        self._tail_shape = array("H")
+        self._numbers = array("d")
+        self._number_ends = array("Q")
+
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._shapes: list[_Shape] = []
+        self._shape_ids: dict[Hashable, int] = {}
+        self._irregular: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    @property
+    def schema_valid_count(self) -> int:
+        return sum(1 for f in self._flags if f & _SCHEMA_VALID)
+
+    @property
+    def exact_match_count(self) -> int:
+        return sum(1 for f in self._flags if f & _EXACT_MATCH)
+
+    def _intern(self, s: str) -> int:
+        index = self._string_ids.get(s)
+        if index is None:
+            index = self._string_ids[s] = len(self._strings)
+            self._strings.append(s)
+        return index
+
+    def _flatten(self, value: Any, slots: list[float]) -> Optional[Hashable]:
+        if type(value) is not dict:
+            return self._flatten_leaf(value, slots)
+        items = []
+        for key, sub in value.items():
+            if type(key) is not str:
+                return None
+            cls = type(sub)
+            # Leaves inline: usage objects are mostly flat numbers.
+            if cls is int and -_MAX_EXACT_INT <= sub <= _MAX_EXACT_INT:
+                slots.append(sub)
+                sig = _INT
+            elif cls is float:
+                slots.append(sub)
+                sig = _FLOAT
+            else:
+                sig = self._flatten(sub, slots)
+                if sig is None:
+                    return None
+            items.append((key, sig))
+        return ("d", tuple(items))
+
+    def _flatten_leaf(self, value: Any, slots: list[float]) -> Optional[Hashable]:
+        cls = type(value)
+        if cls is int:
+            if not -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                return None
+            slots.append(value)
+            return _INT
+        if cls is float:
+            slots.append(value)
+            return _FLOAT
+        if cls is str:
+            slots.append(self._intern(value))
+            return _STR
+        if value is None or cls is bool:
+            return ("c", value)
+        return None
+
+    def _shape_id(self, sig: Hashable) -> Optional[int]:
+        index = self._shape_ids.get(sig)
+        if index is None:
+            if len(self._shapes) >= _MAX_SHAPES:
+                return None
+            index = self._shape_ids[sig] = len(self._shapes)
+            self._shapes.append(_Shape(sig))
+        return index
+
+    def _build(self, sig: Any, slots: Iterator[float]) -> Any:
+        if type(sig) is int:
+            value = next(slots)
+            return (
+                int(value) if sig == _INT else value if sig == _FLOAT else self._strings[int(value)]
+            )
+        if sig[0] == "c":
+            return sig[1]
+        out = {}
+        for key, sub in sig[1]:
+            if sub == _FLOAT:
+                out[key] = next(slots)
+            elif sub == _INT:
+                out[key] = int(next(slots))
+            else:
+                out[key] = self._build(sub, slots)
+        return out
+
+    def _encode(
+        self, row: ReportResultRow
+    ) -> Optional[tuple[bytes, list[int], int, int, list[float]]]:
+        """(UTF-8 id, error indices, usage shape, tail shape, slots), or None for an irregular row."""
+        if tuple(islice(row, len(_HEAD_KEYS))) != _HEAD_KEYS:
+            return None
+        if not (
+            type(row["id"]) is str
+            and type(row["schema_valid"]) is bool
+            and type(row["exact_match"]) is bool
+            and type(row["f1"]) is float
+            and type(row["latency_ms"]) is int
+            and type(row.get("cost_usd")) in (float, type(None))
+            and type(row["schema_errors"]) is list
+            and all(type(e) is str for e in row["schema_errors"])
+        ):
+            return None
+        fingerprint = row["output_fingerprint"]
+        if type(fingerprint) is not str or len(fingerprint) != 2 * _FINGERPRINT_BYTES:
+            return None
+        try:
+            if bytes.fromhex(fingerprint).hex() != fingerprint:
+                return None
+        except ValueError:
+            return None
+        try:
+            row_id = row["id"].encode("utf-8")
+        except UnicodeEncodeError:  # lone surrogates
+            return None
+
+        slots: list[float] = []
+        usage_sig = self._flatten(row["usage"], slots)
+        tail = dict(islice(row.items(), len(_HEAD_KEYS), None))
+        tail_sig = self._flatten(tail, slots)
+        if usage_sig is None or tail_sig is None:
+            return None
+        usage_shape = self._shape_id(usage_sig)
+        tail_shape = self._shape_id(tail_sig)
+        if usage_shape is None or tail_shape is None:
+            return None
+        errors = [self._intern(e) for e in row["schema_errors"]]
+        return row_id, errors, usage_shape, tail_shape, slots
+
+    def append(self, row: ReportResultRow) -> None:
+        encoded = self._encode(row)
+        cost: Any = row.get("cost_usd")
+        if encoded is None:
+            # The dict is kept as it is; summary columns get its values where they
+            # are numbers, and placeholders (0.0, no cost) where they are not.
+            self._irregular[len(self)] = dict(row)
+            row_id = b""
+            errors: list[int] = []
+            usage_shape = tail_shape = 0
+            slots: list[float] = []
+            fingerprint = bytes(_FINGERPRINT_BYTES)
+            f1 = _number(row.get("f1"))
+            latency_ms = _number(row.get("latency_ms"))
+            if not isinstance(cost, (int, float)):
+                cost = None
+        else:
+            row_id, errors, usage_shape, tail_shape, slots = encoded
+            fingerprint = bytes.fromhex(row["output_fingerprint"])
+            f1 = row["f1"]
+            latency_ms = row["latency_ms"]
+
+        self._flags.append(
+            (_SCHEMA_VALID if row.get("schema_valid") else 0)
+            | (_EXACT_MATCH if row.get("exact_match") else 0)
+            | (_HAS_COST if cost is not None else 0)
+        )
+        self.f1.append(f1)
+        self.latency_ms.append(latency_ms)
+        self._cost.append(_number(cost))
+        self._ids += row_id
+        self._id_ends.append(len(self._ids))
+        self._fingerprints += fingerprint
+        self._errors.extend(errors)
+        self._error_ends.append(len(self._errors))
+        self._usage_shape.append(usage_shape)
+        self._tail_shape.append(tail_shape)
+        self._numbers.extend(slots)
+        self._number_ends.append(len(self._numbers))
+
+    def extend(self, rows: list[ReportResultRow]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def _start(self, ends: array[int], i: int) -> int:
+        return ends[i - 1] if i else 0
+
+    def __getitem__(self, i: int) -> ReportResultRow:
+        irregular = self._irregular.get(i)
+        if irregular is not None:
+            return cast(ReportResultRow, dict(irregular))
+        flags = self._flags[i]
+        cost = self._cost[i] if flags & _HAS_COST else None
+        slots = iter(self._numbers[self._start(self._number_ends, i) : self._number_ends[i]])
+        row: ReportResultRow = {
+            "id": self._ids[self._start(self._id_ends, i) : self._id_ends[i]].decode("utf-8"),
+            "schema_valid": bool(flags & _SCHEMA_VALID),
+            "schema_errors": [
+                self._strings[e]
+                for e in self._errors[self._start(self._error_ends, i) : self._error_ends[i]]
+            ],
+            "exact_match": bool(flags & _EXACT_MATCH),
+            "f1": self.f1[i],
+            "latency_ms": int(self.latency_ms[i]),
+            "usage": self._build(self._shapes[self._usage_shape[i]].sig, slots),
+            "cost_usd": cost,
+            "output_fingerprint": self._fingerprints[
+                i * _FINGERPRINT_BYTES : (i + 1) * _FINGERPRINT_BYTES
+            ].hex(),
+        }
+        row.update(self._build(self._shapes[self._tail_shape[i]].sig, slots))
+        return row
+
+    def __iter__(self) -> Iterator[ReportResultRow]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def costs(self) -> Iterator[Optional[float]]:
+        for i, flags in enumerate(self._flags):
+            yield self._cost[i] if flags & _HAS_COST else None
+
+    def usages(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            irregular = self._irregular.get(i)
+            if irregular is not None:
+                yield irregular.get("usage")
+                continue
+            start = self._start(self._number_ends, i)
+            shape = self._shapes[self._usage_shape[i]]
+            yield self._build(shape.sig, iter(self._numbers[start : start + shape.width]))
+
+    def values(self, key: str) -> Iterator[tuple[int, Any]]:
+        """(row index, value) of an optional tail key, for the rows that have it."""
+        for i, shape_id in enumerate(self._tail_shape):
+            irregular = self._irregular.get(i)
+            if irregular is not None:
+                if key in irregular:
+                    yield i, irregular[key]
+                continue
+            field = self._shapes[shape_id].fields.get(key)
+            if field is None:
+                continue
+            offset, sig = field
+            start = (
+                self._start(self._number_ends, i)
+                + self._shapes[self._usage_shape[i]].width
+                + offset
+            )
+            yield i, self._build(sig, iter(self._numbers[start : start + _width(sig)]))
@@ -1,55 +1,282 @@
 from __future__ import annotations
 
-import json
-import os
 import uuid
+from collections import deque
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Callable, Optional, cast
 
-from eval_harness.adapters.base import ModelAdapter
-from eval_harness.adapters.mock import MockModel
-from eval_harness.adapters.openai_v1 import OpenAIV1Model
-from eval_harness.core.dataset import load_jsonl
-from eval_harness.core.metrics import exact_match, f1_for_titles
-from eval_harness.core.report_types import EvalReport, ReportResultRow, ReportSummary
-from eval_harness.core.schemas import load_schema, validate_or_errors
+from jsonschema import Draft202012Validator
+
+from eval_harness.adapters.base import ModelAdapter, ModelResult
+from eval_harness.adapters.cassette import RecordingAdapter
+from eval_harness.adapters.pricing import token_counts
+from eval_harness.adapters.registry import build_adapter
+from eval_harness.core import jsonio
+from eval_harness.core.batch import BatchScores, ChunkScorer
+from eval_harness.core.budget import CostBudget
+from eval_harness.core.dataset import DatasetCase, load_jsonl
+from eval_harness.core.dataset_index import DatasetIndex, select_positions
+from eval_harness.core.metrics import TASK_FIELDS
+from eval_harness.core.profiling import RunProfiler
+from eval_harness.core.progress import RunTelemetry
+from eval_harness.core.report_types import (
+    ReportMeta,
+    ReportResultRow,
+    ReportSummary,
+    RoutingReport,
+)
+from eval_harness.core.result_store import ResultStore
+from eval_harness.core.sampling import SampleStats, combined_cost, combined_usage
+from eval_harness.core.scheduler import Dispatched, RequestScheduler
+from eval_harness.core.schemas import load_schema
+from eval_harness.core.scorers import DEFAULT_SCORER
+from eval_harness.core.tracing import Span, Tracer
 
 
 def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _require_env(name: str) -> str:
-    v = os.environ.get(name, "").strip()
-    if not v:
-        raise ValueError(f"Missing required environment variable: {name}")
-    return v
-
-
 def _build_adapter(adapter_name: str) -> ModelAdapter:
     """
-    Adapter factory.
+    Adapter factory; see adapters/registry.py.
 
     - mock: offline deterministic adapter (CI-safe)
     - openai: OpenAI public endpoint via OpenAI SDK
     - azure: Azure OpenAI / Foundry OpenAI-compatible v1 endpoint via OpenAI SDK
+    - anything registered via register_adapter() or the eval_harness.adapters
+      entry-point group
+    - replay: responses recorded with --record (see adapters/cassette.py)
+    """
+    return build_adapter(adapter_name)
+
+
+@dataclass(frozen=True)
+class _Generated:
+    case: DatasetCase
+    model_result: ModelResult
+    output: dict[str, Any]
+    coalesced_from: Optional[str] = None
+    span: Optional[Span] = None
+    # With samples > 1: running stats over the samples after model_result (their
+    # scores, while a worker still has them) and usage/cost across all samples.
+    sample_stats: Optional[SampleStats] = None
+    sample_scores: Optional[Future[BatchScores]] = None
+    usage: Any = None
+    cost_usd: Optional[float] = None
+
+
+class RunLoader:
     """
-    if adapter_name == "mock":
-        return MockModel()
+    Loads the inputs of a run. This default reads everything from disk on every
+    call; the serve daemon substitutes a warm cache (see core/daemon.py).
+    """
+
+    def cases(
+        self,
+        dataset_path: str,
+        only_ids: Optional[Sequence[str]] = None,
+        shard: Optional[tuple[int, int]] = None,
+    ) -> list[DatasetCase]:
+        if not only_ids and shard is None:
+            return load_jsonl(dataset_path)
+        # Fetch only the requested cases through the byte-offset index.
+        with DatasetIndex.open(dataset_path) as index:
+            positions = select_positions(
+                len(index), index.locate, only_ids=only_ids, shard=shard, source=dataset_path
+            )
+            return [index.case_at(i) for i in positions]
+
+    def prompt(self, prompt_path: str) -> str:
+        return Path(prompt_path).read_text(encoding="utf-8")
+
+    def validator(self, schema_path: str) -> Draft202012Validator:
+        return load_schema(schema_path)
 
-    if adapter_name == "openai":
-        api_key = _require_env("OPENAI_API_KEY")
-        model = _require_env("OPENAI_MODEL")
-        base_url = os.environ.get("OPENAI_BASE_URL", "").strip() or None  # optional
-        return OpenAIV1Model(api_key=api_key, model=model, base_url=base_url)
+    def adapter(self, adapter_name: str) -> ModelAdapter:
+        return _build_adapter(adapter_name)
 
-    if adapter_name == "azure":
-        api_key = _require_env("AZURE_OPENAI_API_KEY")
-        model = _require_env("AZURE_OPENAI_MODEL")
-        base_url = _require_env("AZURE_OPENAI_BASE_URL")
-        return OpenAIV1Model(api_key=api_key, model=model, base_url=base_url)
 
-    raise ValueError(f"Unknown adapter: {adapter_name}. Expected one of: mock, openai, azure")
+def _fold_samples(stats: SampleStats, scores: BatchScores, indices: Iterable[int]) -> None:
+    for j in indices:
+        stats.add(
+            f1=scores.f1[j],
+            exact_match=scores.exact_match[j],
+            schema_valid=scores.schema_valid[j],
+            fingerprint=scores.output_fingerprint[j],
+        )
+
+
+def _generated(d: Dispatched, output: dict[str, Any], chunk_scorer: ChunkScorer) -> _Generated:
+    """Keeps a case for chunk scoring; its extra samples are scored now and dropped."""
+    if not d.samples:
+        return _Generated(d.case, d.model_result, output, d.coalesced_from, d.span)
+    rest = d.samples[1:]
+    stats = SampleStats()
+    scores: Optional[Future[BatchScores]] = chunk_scorer.submit(
+        [r.output or {} for r in rest], [d.case.expected] * len(rest)
+    )
+    if scores.done():  # scored in-process
+        _fold_samples(stats, scores.result(), range(len(rest)))
+        scores = None
+    return _Generated(
+        d.case,
+        d.model_result,
+        output,
+        d.coalesced_from,
+        d.span,
+        sample_stats=stats,
+        sample_scores=scores,
+        usage=combined_usage(d.samples),
+        cost_usd=combined_cost(d.samples),
+    )
+
+
+def _rows_for_chunk(chunk: list[_Generated], scores: BatchScores) -> list[ReportResultRow]:
+    rows: list[ReportResultRow] = []
+    for i, g in enumerate(chunk):
+        row: ReportResultRow = {
+            "id": g.case.id,
+            "schema_valid": scores.schema_valid[i],
+            "schema_errors": scores.schema_errors[i],
+            "exact_match": scores.exact_match[i],
+            "f1": scores.f1[i],
+            "latency_ms": g.model_result.latency_ms,
+            "usage": g.model_result.usage,
+            "cost_usd": getattr(g.model_result, "cost_usd", None),
+            "output_fingerprint": scores.output_fingerprint[i],
+        }
+        stats = g.sample_stats
+        if stats is not None:
+            row["usage"] = g.usage
+            row["cost_usd"] = g.cost_usd
+            if g.sample_scores is not None:
+                extra = g.sample_scores.result()
+                _fold_samples(stats, extra, range(len(extra.f1)))
+            _fold_samples(stats, scores, (i,))
+            row["samples"] = stats.report()
+        if g.coalesced_from is not None:
+            # The call (and its usage/cost) belongs to the case that made it.
+            row["usage"] = None
+            row["cost_usd"] = 0.0
+            row["coalesced_from"] = g.coalesced_from
+        else:
+            _add_call_fields(row, g.model_result)
+        field_scores = scores.field_scores[i]
+        if field_scores is not None:
+            row["field_scores"] = field_scores
+        rows.append(row)
+    return rows
+
+
+def _add_call_fields(row: ReportResultRow, result: ModelResult) -> None:
+    if result.ttft_ms is not None:
+        row["ttft_ms"] = result.ttft_ms
+    if result.output_tokens_per_s is not None:
+        row["output_tokens_per_s"] = result.output_tokens_per_s
+    if result.stream_aborted is not None:
+        row["stream_aborted"] = result.stream_aborted
+    if result.tokens_saved is not None:
+        row["tokens_saved"] = result.tokens_saved
+    if result.endpoint is not None:
+        row["endpoint"] = result.endpoint
+
+
+def _mean(values: Iterable[tuple[int, Any]]) -> tuple[int, float]:
+    """(count, mean) of store.values(); sums in row order like sum() over the rows."""
+    n, total = 0, 0
+    for _, value in values:
+        n += 1
+        total += value
+    return n, total / n if n else 0.0
+
+
+def _stream_summary(store: ResultStore, summary: ReportSummary) -> None:
+    n_ttft, avg_ttft = _mean(store.values("ttft_ms"))
+    aborted = {i for i, _ in store.values("stream_aborted")}
+    if not n_ttft and not aborted:
+        return
+    summary["avg_ttft_ms"] = avg_ttft
+    summary["avg_output_tokens_per_s"] = _mean(store.values("output_tokens_per_s"))[1]
+    summary["stream_aborted_count"] = len(aborted)
+    summary["stream_tokens_saved"] = sum(
+        saved for i, saved in store.values("tokens_saved") if i in aborted
+    )
+
+
+def _sample_summary(store: ResultStore, summary: ReportSummary) -> None:
+    n = samples_per_case = 0
+    pass_at_1 = pass_at_k = f1_mean = f1_variance = agreement = 0
+    for _, rep in store.values("samples"):
+        n += 1
+        samples_per_case = max(samples_per_case, rep["n"])
+        pass_at_1 += rep["pass_at_1"]
+        pass_at_k += rep["pass_at_k"]
+        f1_mean += rep["f1_mean"]
+        f1_variance += rep["f1_variance"]
+        agreement += rep["agreement"]
+    if not n:
+        return
+    summary["samples_per_case"] = samples_per_case
+    summary["pass_at_1"] = pass_at_1 / n
+    summary["pass_at_k"] = pass_at_k / n
+    summary["avg_sample_f1"] = f1_mean / n
+    summary["avg_f1_variance"] = f1_variance / n
+    summary["avg_agreement"] = agreement / n
+
+
+def _field_score_summary(store: ResultStore, summary: ReportSummary) -> None:
+    n = 0
+    totals = {name: {"precision": 0.0, "recall": 0.0} for name in TASK_FIELDS}
+    for _, fs in store.values("field_scores"):
+        n += 1
+        for name, metrics in totals.items():
+            for metric in metrics:
+                metrics[metric] += fs[name][metric]
+    if n:
+        summary["field_scores"] = {
+            name: {metric: total / n for metric, total in metrics.items()}
+            for name, metrics in totals.items()
+        }
+
+
+def _trace_chunk(
+    tracer: Tracer, chunk: list[_Generated], scores: BatchScores, rows: list[ReportResultRow]
+) -> None:
+    # Validation and scoring run per chunk, so each case's validate/score spans
+    # cover the phase of the chunk it was scored in.
+    validate_start, validate_end, score_start, score_end = scores.phase_ns
+    batch = {"eval.batch_size": len(chunk)}
+    for g, row in zip(chunk, rows):
+        if g.span is None:
+            continue
+        tracer.record(
+            "validate",
+            parent=g.span,
+            start_ns=validate_start,
+            end_ns=validate_end,
+            attributes={**batch, "eval.schema_valid": row["schema_valid"]},
+        )
+        tracer.record(
+            "score",
+            parent=g.span,
+            start_ns=score_start,
+            end_ns=score_end,
+            attributes={**batch, "eval.f1": row["f1"], "eval.exact_match": row["exact_match"]},
+        )
+        g.span.set_attributes(
+            {
+                "eval.schema_valid": row["schema_valid"],
+                "eval.f1": row["f1"],
+                "eval.exact_match": row["exact_match"],
+                "eval.parse_error": g.output.get("_parse_error") is True,
+            }
+        )
+        tracer.end_span(g.span)
 
 
 def run_eval(
@@ -58,6 +285,21 @@ def run_eval(
     schema_path: str,
     adapter_name: str = "mock",
     out_dir: str = "reports",
+    max_cost_usd: Optional[float] = None,
+    scorer: str = DEFAULT_SCORER,
+    score_chunk_size: int = 64,
+    score_workers: int = 0,
+    concurrency: int = 1,
+    coalesce: bool = True,
+    only_ids: Optional[Sequence[str]] = None,
+    shard: Optional[tuple[int, int]] = None,
+    loader: Optional[RunLoader] = None,
+    on_result: Optional[Callable[[ReportResultRow], None]] = None,
+    profiler: Optional[RunProfiler] = None,
+    tracer: Optional[Tracer] = None,
+    telemetry: Optional[RunTelemetry] = None,
+    samples: int = 1,
+    record_path: Optional[str] = None,
 ) -> tuple[str, ReportSummary]:
     """
     Run an evaluation over a JSONL dataset using a prompt + JSON schema.
@@ -68,76 +310,250 @@ def run_eval(
     Notes:
     - mock adapter is deterministic and should remain the default for CI
     - openai/azure adapters allow realistic runs with environment variables
+    - max_cost_usd halts the run before a call whose projected cost would exceed it;
+      it needs an adapter with pricing (ValueError otherwise)
+    - scorer selects the F1 implementation by name (see core/scorers.py)
+    - outputs are validated and scored in chunks of score_chunk_size (>= 1); with
+      score_workers > 0 that work runs in a process pool, off the adapter loop
+    - concurrency sets how many adapter calls are in flight; with coalesce, cases
+      with an identical request share a single call (see core/scheduler.py)
+    - only_ids / shard (I, N) run a subset; the cases are fetched through the
+      dataset's byte-offset index without parsing the rest (see core/dataset_index.py)
+    - loader supplies cases, prompt, validator and adapter (default: from disk)
+    - on_result is called with each row, in dataset order, as soon as it is scored
+    - profiler is told when all rows are scored (see core/profiling.py); the
+      caller starts and stops it
+    - tracer records an "eval.run" span with one "eval.case" span per case and
+      adapter/validate/score children (see core/tracing.py); the caller shuts it down
+    - telemetry receives live progress (see core/progress.py)
+    - samples > 1 draws that many outputs per case; each row adds pass@k, F1
+      mean/variance and output agreement, with a case's extra samples scored and
+      folded into its aggregate as they arrive (see core/sampling.py)
+    - record_path appends every adapter response to a cassette that the replay
+      adapter can serve later (see adapters/cassette.py)
+    - rows are kept column-wise in a ResultStore, which the summary is computed
+      from and the report is streamed out of (see core/result_store.py)
     """
-    cases = load_jsonl(dataset_path)
-    prompt = Path(prompt_path).read_text(encoding="utf-8")
-    validator = load_schema(schema_path)
-    adapter = _build_adapter(adapter_name)
+    if score_chunk_size < 1:
+        raise ValueError("score_chunk_size must be >= 1")
+    if score_workers < 0:
+        raise ValueError("score_workers must be >= 0")
+    loader = loader if loader is not None else RunLoader()
+    cases = loader.cases(dataset_path, only_ids, shard)
+    prompt = loader.prompt(prompt_path)
+    validator = loader.validator(schema_path)
+    adapter = base_adapter = loader.adapter(adapter_name)
+    recorder = RecordingAdapter(adapter, record_path) if record_path else None
+    if recorder is not None:
+        adapter = recorder
+    pricing = getattr(adapter, "pricing", None)
+    if max_cost_usd is not None and pricing is None:
+        # Unpriced calls cost None, so the budget would never see spend.
+        raise ValueError(
+            f"max_cost_usd needs model pricing, and adapter {adapter_name!r} has none "
+            "(set OPENAI_PRICING_MODEL / AZURE_OPENAI_PRICING_MODEL to a known model)"
+        )
 
     run_id = f"run-{uuid.uuid4().hex[:8]}"
     started_at_utc = _now_utc_iso()
+    run_span = (
+        tracer.start_span(
+            "eval.run",
+            attributes={
+                "eval.run_id": run_id,
+                "eval.adapter": adapter_name,
+                "eval.scorer": scorer,
+                "eval.dataset_path": dataset_path,
+                "gen_ai.request.model": getattr(adapter, "model", None),
+            },
+        )
+        if tracer is not None
+        else None
+    )
+
+    budget = (
+        CostBudget(max_cost_usd, pricing)
+        if max_cost_usd is not None and pricing is not None
+        else None
+    )
+    use_budget = getattr(base_adapter, "use_budget", None)
+    if budget is not None and callable(use_budget):
+        # Calls the adapter makes on its own (router hedges) are reserved too.
+        use_budget(budget)
+
+    chunk_scorer = ChunkScorer(
+        validator, schema_path=schema_path, scorer=scorer, workers=score_workers
+    )
+    # Chunks whose scoring is in flight, oldest first; drained in order so rows
+    # keep dataset order.
+    pending: deque[tuple[list[_Generated], Future[BatchScores]]] = deque()
+    max_pending = 2 * score_workers
+
+    scheduler = RequestScheduler(
+        adapter,
+        prompt,
+        concurrency=concurrency,
+        coalesce=coalesce,
+        budget=budget,
+        tracer=tracer,
+        trace_parent=run_span,
+        samples=samples,
+    )
 
-    results: list[ReportResultRow] = []
+    store = ResultStore()
     parse_error_count = 0
 
-    for c in cases:
-        model_result = adapter.generate_structured(prompt=prompt, input_obj=c.input)
+    def flush(chunk: list[_Generated]) -> None:
+        fut = chunk_scorer.submit([g.output for g in chunk], [g.case.expected for g in chunk])
+        pending.append((chunk, fut))
 
-        output = model_result.output or {}
-        if isinstance(output, dict) and output.get("_parse_error") is True:
-            parse_error_count += 1
+    def drain(keep: int) -> None:
+        while len(pending) > keep:
+            chunk, fut = pending.popleft()
+            scores = fut.result()
+            rows = _rows_for_chunk(chunk, scores)
+            if tracer is not None:
+                _trace_chunk(tracer, chunk, scores, rows)
+            if telemetry is not None:
+                telemetry.rows_scored(len(rows), scores.schema_valid.count(False))
+            store.extend(rows)
+            if on_result is not None:
+                for row in rows:
+                    on_result(row)
 
-        schema_ok, schema_errors = validate_or_errors(validator, output)
+    if telemetry is not None:
+        telemetry.begin(run_id=run_id, total=len(cases))
 
-        em = exact_match(output, c.expected)
-        f1 = f1_for_titles(output, c.expected)
+    try:
+        chunk: list[_Generated] = []
+        for d in scheduler.run(cases):
+            output = d.model_result.output or {}
+            parse_error = isinstance(output, dict) and output.get("_parse_error") is True
+            if parse_error:
+                parse_error_count += 1
+            if telemetry is not None:
+                fresh = d.coalesced_from is None
+                telemetry.case_completed(
+                    latency_ms=d.model_result.latency_ms if fresh else None,
+                    parse_error=parse_error,
+                    cost_usd=(combined_cost(d.samples or (d.model_result,)) if fresh else None),
+                    in_flight=scheduler.in_flight,
+                )
 
-        results.append(
-            {
-                "id": c.id,
-                "schema_valid": schema_ok,
-                "schema_errors": schema_errors,
-                "exact_match": em,
-                "f1": f1,
-                "latency_ms": model_result.latency_ms,
-                "usage": model_result.usage,
-                "cost_usd": getattr(model_result, "cost_usd", None),
-            }
-        )
+            chunk.append(_generated(d, output, chunk_scorer))
+            if len(chunk) >= score_chunk_size:
+                flush(chunk)
+                chunk = []
+                drain(max_pending)
+
+        if chunk:
+            flush(chunk)
+        drain(0)
+    except BaseException as e:
+        if tracer is not None and run_span is not None:
+            run_span.set_error(f"{type(e).__name__}: {e}")
+            tracer.end_span(run_span)
+            tracer.flush()
+        raise
+    finally:
+        chunk_scorer.close()
+        if recorder is not None:
+            recorder.close()
 
-    total = len(results)
+    if telemetry is not None:
+        telemetry.finish()
+    if profiler is not None:
+        profiler.results_ready()
+
+    total = len(store)
     denom = total if total > 0 else 1
+    # None when no call reported a cost (an adapter without pricing): unknown, not free.
+    # Coalesced rows carry 0.0 for the call they reused, so they do not count.
+    coalesced = {i for i, _ in store.values("coalesced_from")}
+    priced = False
+    total_cost = 0.0
+    for i, cost in enumerate(store.costs()):
+        if cost is not None and i not in coalesced:
+            priced = True
+        total_cost += cost or 0.0
+    total_cost_usd = total_cost if priced else None
+    routing_report = getattr(base_adapter, "routing_report", None)
+    routing = cast(RoutingReport, routing_report()) if callable(routing_report) else None
+    if routing is not None and routing["hedge_loser_cost_usd"]:
+        # Calls that lost a hedge are billed too, though no row carries them.
+        total_cost_usd = (total_cost_usd or 0.0) + routing["hedge_loser_cost_usd"]
+    correct = store.exact_match_count
+
+    total_input_tokens = 0
+    total_cached_input_tokens = 0
+    for usage in store.usages():
+        counts = token_counts(usage)
+        if counts is not None:
+            total_input_tokens += counts.input_tokens
+            total_cached_input_tokens += counts.cached_input_tokens
 
     summary: ReportSummary = {
         "run_id": run_id,
         "started_at_utc": started_at_utc,
         "adapter": adapter_name,
+        "scorer": scorer,
         "total": total,
-        "schema_valid_rate": sum(1 for r in results if r["schema_valid"]) / denom,
-        "exact_match_rate": sum(1 for r in results if r["exact_match"]) / denom,
-        "avg_f1": (sum(r["f1"] for r in results) / denom) if total else 0.0,
-        "avg_latency_ms": (sum(r["latency_ms"] for r in results) / denom) if total else 0.0,
+        "schema_valid_rate": store.schema_valid_count / denom,
+        "exact_match_rate": correct / denom,
+        "avg_f1": (sum(store.f1) / denom) if total else 0.0,
+        "avg_latency_ms": (sum(store.latency_ms) / denom) if total else 0.0,
         "parse_error_count": parse_error_count,
+        "total_cost_usd": total_cost_usd,
+        "cost_per_correct_usd": (
+            total_cost_usd / correct if total_cost_usd is not None and correct else None
+        ),
+        "budget_exhausted": budget is not None and budget.exhausted,
+        "skipped_count": scheduler.skipped_count,
+        "coalesced_calls_saved": scheduler.calls_saved,
+        "total_input_tokens": total_input_tokens,
+        "total_cached_input_tokens": total_cached_input_tokens,
+        "cache_hit_rate": (
+            total_cached_input_tokens / total_input_tokens if total_input_tokens else 0.0
+        ),
     }
 
-    report: EvalReport = {
-        "meta": {
-            "run_id": run_id,
-            "started_at_utc": started_at_utc,
-            "adapter": adapter_name,
-            "dataset_path": dataset_path,
-            "prompt_path": prompt_path,
-            "schema_path": schema_path,
-        },
-        "summary": summary,
-        "results": results,
+    _stream_summary(store, summary)
+    _sample_summary(store, summary)
+    if routing is not None:
+        summary["routing"] = routing
+    _field_score_summary(store, summary)
+
+    meta: ReportMeta = {
+        "run_id": run_id,
+        "started_at_utc": started_at_utc,
+        "adapter": adapter_name,
+        "dataset_path": dataset_path,
+        "prompt_path": prompt_path,
+        "schema_path": schema_path,
     }
+    if only_ids:
+        meta["only_ids"] = list(dict.fromkeys(only_ids))
+    if shard is not None:
+        meta["shard"] = f"{shard[0]}/{shard[1]}"
+    if samples > 1:
+        meta["samples"] = samples
 
+    # The EvalReport layout, with rows streamed from the store.
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     out_path = Path(out_dir) / f"{run_id}.json"
-    out_path.write_text(
-        json.dumps(report, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    with out_path.open("w", encoding="utf-8") as f:
+        jsonio.write_pretty(f, {"meta": meta, "summary": summary}, "results", store)
+
+    if tracer is not None and run_span is not None:
+        run_span.set_attributes(
+            {
+                "eval.total": total,
+                "eval.schema_valid_rate": summary["schema_valid_rate"],
+                "eval.avg_f1": summary["avg_f1"],
+                "eval.total_cost_usd": total_cost_usd,
+            }
+        )
+        tracer.end_span(run_span)
+        tracer.flush()
 
     return str(out_path), summary
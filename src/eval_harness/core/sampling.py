@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.adapters.pricing import token_counts
+from eval_harness.core.report_types import SampleReport
+
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """Unbiased pass@k from n samples with c correct (Chen et al., 2021)."""
+    if n - c < k:
+        return 1.0
+    prob_all_fail = 1.0
+    for i in range(n - c + 1, n + 1):
+        prob_all_fail *= 1.0 - k / i
+    return 1.0 - prob_all_fail
+
+
+class SampleStats:
+    """
+    Running aggregate over one case's samples: F1 mean/variance (Welford), exact
+    and schema-valid counts, and output fingerprint counts for agreement. Samples
+    are added one at a time and never stored.
+    """
+
+    __slots__ = ("n", "correct", "valid", "_mean", "_m2", "_outputs")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.correct = 0
+        self.valid = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._outputs: Counter[str] = Counter()
+
+    def add(self, *, f1: float, exact_match: bool, schema_valid: bool, fingerprint: str) -> None:
+        self.n += 1
+        self.correct += exact_match
+        self.valid += schema_valid
+        delta = f1 - self._mean
+        self._mean += delta / self.n
+        self._m2 += delta * (f1 - self._mean)
+        self._outputs[fingerprint] += 1
+
+    @property
+    def f1_mean(self) -> float:
+        return self._mean
+
+    @property
+    def f1_variance(self) -> float:
+        """Sample variance (n - 1); 0 for a single sample."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def agreement(self) -> float:
+        """Share of samples identical to the most common output."""
+        return max(self._outputs.values()) / self.n if self.n else 0.0
+
+    def report(self) -> SampleReport:
+        return {
+            "n": self.n,
+            "pass_at_1": pass_at_k(self.n, self.correct, 1),
+            "pass_at_k": pass_at_k(self.n, self.correct, self.n),
+            "f1_mean": self.f1_mean,
+            "f1_variance": self.f1_variance,
+            "agreement": self.agreement,
+            "schema_valid_rate": self.valid / self.n,
+        }
+
+
+def combined_cost(results: Sequence[ModelResult]) -> Optional[float]:
+    costs = [r.cost_usd for r in results if r.cost_usd is not None]
+    return sum(costs) if costs else None
+
+
+def combined_usage(results: Sequence[ModelResult]) -> Any:
+    """Token totals across samples (Responses API shape), or the first usage as-is."""
+    counts = [c for c in (token_counts(r.usage) for r in results) if c is not None]
+    if not counts:
+        return results[0].usage
+    input_tokens = sum(c.input_tokens for c in counts)
+    output_tokens = sum(c.output_tokens for c in counts)
+    return {
+        "input_tokens": input_tokens,
+        "input_tokens_details": {"cached_tokens": sum(c.cached_input_tokens for c in counts)},
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
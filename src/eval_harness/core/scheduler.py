@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from eval_harness.adapters.base import ModelAdapter, ModelResult
+from eval_harness.adapters.pricing import token_counts
+from eval_harness.core.budget import CostBudget
+from eval_harness.core.canonical import fingerprint
+from eval_harness.core.dataset import DatasetCase
+from eval_harness.core.tracing import KIND_CLIENT, Span, Tracer
+
+
+@dataclass(frozen=True)
+class Dispatched:
+    case: DatasetCase
+    model_result: ModelResult
+    # Case id whose model call this case reused, or None if it made its own call.
+    coalesced_from: Optional[str] = None
+    # Open "eval.case" span when the run is traced; the runner ends it once scored.
+    span: Optional[Span] = None
+    # All samples, model_result first, when the scheduler draws more than one.
+    samples: tuple[ModelResult, ...] = ()
+
+
+@dataclass
+class _Queued:
+    case: DatasetCase
+    flight: _Flight
+    span: Optional[Span]
+
+
+@dataclass
+class _Flight:
+    leader: DatasetCase
+    # One future per adapter request; each yields that request's samples.
+    futures: list[Future[list[ModelResult]]]
+    # Projected cost of one sample.
+    projected_usd: float
+    # Coalescing key, or None when coalescing is off.
+    key: Optional[str] = None
+    settled: bool = field(default=False)
+    # Queued cases (leader and duplicates) not yet yielded.
+    waiting: int = 0
+
+
+class _InlineExecutor(Executor):
+    """Runs calls on the submitting thread; keeps concurrency=1 strictly sequential."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        fut: Future[Any] = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+
+def _result_attributes(result: ModelResult) -> dict[str, Any]:
+    attrs: dict[str, Any] = {"eval.latency_ms": result.latency_ms, "eval.cost_usd": result.cost_usd}
+    if result.ttft_ms is not None:
+        attrs["eval.ttft_ms"] = result.ttft_ms
+    if result.stream_aborted is not None:
+        attrs["eval.stream_aborted"] = result.stream_aborted
+    counts = token_counts(result.usage)
+    if counts is not None:
+        attrs["gen_ai.usage.input_tokens"] = counts.input_tokens
+        attrs["gen_ai.usage.output_tokens"] = counts.output_tokens
+        attrs["eval.usage.cached_input_tokens"] = counts.cached_input_tokens
+    return attrs
+
+
+def request_key(prompt: str, input_obj: dict[str, Any]) -> str:
+    """Identity of the composed model request: same key, same call."""
+    return fingerprint({"prompt": prompt, "input": input_obj})
+
+
+class RequestScheduler:
+    """
+    Dispatches adapter calls for a run and yields results in dataset order.
+
+    - concurrency: number of adapter calls in flight at once (1 = sequential,
+      on the calling thread)
+    - coalesce: cases whose composed request is identical share one model call;
+      a duplicate that arrives while the first call is in flight waits on it
+      (single-flight), and later duplicates reuse the finished result while it is
+      among the last coalesce_cache finished calls
+    - budget: each new call reserves its projected cost before dispatch; when
+      a reservation fails no further calls are made and the remaining cases
+      are counted in skipped_count (the refused case's span is ended as an error)
+    - tracer: each case gets an "eval.case" span under trace_parent, and each
+      model call an "adapter" span under it (see core/tracing.py)
+    - samples: outputs drawn per case; one generate_samples() request when the
+      adapter has it (a provider-side `n`), otherwise that many parallel
+      generate_structured() requests sharing the concurrency limit
+    """
+
+    def __init__(
+        self,
+        adapter: ModelAdapter,
+        prompt: str,
+        *,
+        concurrency: int = 1,
+        coalesce: bool = True,
+        budget: Optional[CostBudget] = None,
+        tracer: Optional[Tracer] = None,
+        trace_parent: Optional[Span] = None,
+        samples: int = 1,
+        coalesce_cache: int = 1024,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if samples < 1:
+            raise ValueError("samples must be >= 1")
+        self.adapter = adapter
+        self.prompt = prompt
+        self.concurrency = concurrency
+        self.coalesce = coalesce
+        self.budget = budget
+        self.tracer = tracer
+        self.trace_parent = trace_parent
+        self.samples = samples
+        self.coalesce_cache = coalesce_cache
+        self._native_samples = samples > 1 and callable(getattr(adapter, "generate_samples", None))
+
+        self.calls_made = 0
+        self.calls_saved = 0
+        self.skipped_count = 0
+        self._calls_finished = 0
+        self._finished_lock = threading.Lock()
+        # Calls with cases still queued, and the most recently finished ones. A
+        # finished flight holds its results, so only a bounded number are kept.
+        self._flights: dict[str, _Flight] = {}
+        self._finished: OrderedDict[str, _Flight] = OrderedDict()
+
+    @property
+    def in_flight(self) -> int:
+        """Adapter calls dispatched and not yet returned."""
+        return self.calls_made - self._calls_finished
+
+    def run(self, cases: Sequence[DatasetCase]) -> Iterator[Dispatched]:
+        executor: Executor = (
+            ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="eval-adapter")
+            if self.concurrency > 1
+            else _InlineExecutor()
+        )
+        queue: deque[_Queued] = deque()
+
+        try:
+            for idx, case in enumerate(cases):
+                span = (
+                    self.tracer.start_span(
+                        "eval.case",
+                        parent=self.trace_parent,
+                        attributes={"eval.case_id": case.id},
+                    )
+                    if self.tracer is not None
+                    else None
+                )
+                key = request_key(self.prompt, case.input) if self.coalesce else None
+                flight = self._coalesced(key) if key is not None else None
+                if flight is not None:
+                    self.calls_saved += 1
+                else:
+                    flight = self._dispatch(executor, case, span, key)
+                    if flight is None:
+                        self.skipped_count = len(cases) - idx
+                        if self.tracer is not None and span is not None:
+                            span.set_attribute("eval.skipped", True)
+                            span.set_error("cost budget exhausted")
+                            self.tracer.end_span(span)
+                        break
+                    if key is not None:
+                        self._flights[key] = flight
+                flight.waiting += 1
+                queue.append(_Queued(case, flight, span))
+
+                while len(queue) >= self.concurrency:
+                    yield self._complete(queue.popleft())
+
+            while queue:
+                yield self._complete(queue.popleft())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._flights.clear()
+            self._finished.clear()
+
+    def _coalesced(self, key: str) -> Optional[_Flight]:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._finished.get(key)
+            if flight is not None:
+                self._finished.move_to_end(key)
+        return flight
+
+    def _release(self, flight: _Flight) -> None:
+        """Called once per yielded case; retires the flight after its last one."""
+        flight.waiting -= 1
+        if flight.waiting or flight.key is None:
+            return
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+        if self.coalesce_cache > 0:
+            self._finished[flight.key] = flight
+            self._finished.move_to_end(flight.key)
+            while len(self._finished) > self.coalesce_cache:
+                self._finished.popitem(last=False)
+
+    def _dispatch(
+        self, executor: Executor, case: DatasetCase, span: Optional[Span], key: Optional[str]
+    ) -> Optional[_Flight]:
+        projected = 0.0
+        if self.budget is not None:
+            projected = self.budget.projected_cost_usd(prompt=self.prompt, input_obj=case.input)
+            if not self.budget.try_reserve(projected * self.samples):
+                return None
+
+        if self._native_samples:
+            requests = [self.samples]
+        else:
+            requests = [1] * self.samples
+        self.calls_made += len(requests)
+        futures = [executor.submit(self._generate, case, span, n) for n in requests]
+        return _Flight(leader=case, futures=futures, projected_usd=projected, key=key)
+
+    def _generate(self, case: DatasetCase, case_span: Optional[Span], n: int) -> list[ModelResult]:
+        try:
+            return self._call_adapter(case, case_span, n)
+        finally:
+            with self._finished_lock:
+                self._calls_finished += 1
+
+    def _request(self, case: DatasetCase, n: int) -> list[ModelResult]:
+        if n == 1:
+            return [self.adapter.generate_structured(prompt=self.prompt, input_obj=case.input)]
+        return self.adapter.generate_samples(  # type: ignore[attr-defined]
+            prompt=self.prompt, input_obj=case.input, n=n
+        )
+
+    def _call_adapter(
+        self, case: DatasetCase, case_span: Optional[Span], n: int
+    ) -> list[ModelResult]:
+        if self.tracer is None:
+            return self._request(case, n)
+
+        attributes = {
+            "eval.adapter": getattr(self.adapter, "name", None),
+            "gen_ai.request.model": getattr(self.adapter, "model", None),
+            "eval.samples": n if n > 1 else None,
+        }
+        # Adapter code can add child spans (compose, request, parse) via tracing.span().
+        with self.tracer.span(
+            "adapter", parent=case_span, attributes=attributes, kind=KIND_CLIENT
+        ) as span:
+            results = self._request(case, n)
+            span.set_attributes(_result_attributes(results[0]))
+        return results
+
+    def _complete(self, queued: _Queued) -> Dispatched:
+        case, flight = queued.case, queued.flight
+        results = [r for fut in flight.futures for r in fut.result()]
+        if self.budget is not None and not flight.settled:
+            for result in results:
+                self.budget.settle(
+                    flight.projected_usd, result, prompt=self.prompt, input_obj=flight.leader.input
+                )
+        flight.settled = True
+        self._release(flight)
+
+        result = results[0]
+        samples = tuple(results) if self.samples > 1 else ()
+        if case is flight.leader:
+            return Dispatched(case, result, span=queued.span, samples=samples)
+        if queued.span is not None:
+            queued.span.set_attribute("eval.coalesced_from", flight.leader.id)
+        return Dispatched(
+            case, result, coalesced_from=flight.leader.id, span=queued.span, samples=samples
+        )
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import json
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
 from jsonschema import Draft202012Validator
 
+from eval_harness.core import jsonio
+
 
 def load_schema(path: str) -> Draft202012Validator:
-    schema = json.loads(Path(path).read_text(encoding="utf-8"))
+    schema = jsonio.loads(Path(path).read_bytes())
     return Draft202012Validator(schema)
 
 
@@ -21,3 +23,16 @@ def validate_or_errors(
         key=lambda e: (getattr(e, "json_path", "") or "", e.message),
     )
     return len(errors) == 0, [e.message for e in errors]
+
+
+def validate_batch(
+    validator: Draft202012Validator, outputs: Sequence[dict[str, Any]]
+) -> tuple[list[bool], list[list[str]]]:
+    """Validate a chunk of outputs; results are identical to per-output `validate_or_errors`."""
+    oks: list[bool] = []
+    errors: list[list[str]] = []
+    for output in outputs:
+        ok, errs = validate_or_errors(validator, output)
+        oks.append(ok)
+        errors.append(errs)
+    return oks, errors
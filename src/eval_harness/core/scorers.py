@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from eval_harness.core.metrics import f1_for_titles, task_match
+
+
+@dataclass(frozen=True)
+class CaseScore:
+    f1: float
+    # Per-field precision/recall, for scorers that look beyond titles.
+    field_scores: Optional[dict[str, dict[str, float]]] = None
+
+
+Scorer = Callable[[dict[str, Any], dict[str, Any]], CaseScore]
+
+DEFAULT_SCORER = "title_f1"
+
+
+def _title_f1(pred: dict[str, Any], exp: dict[str, Any]) -> CaseScore:
+    return CaseScore(f1=f1_for_titles(pred, exp))
+
+
+def _task_f1(pred: dict[str, Any], exp: dict[str, Any]) -> CaseScore:
+    score = task_match(pred, exp)
+    return CaseScore(f1=score.f1, field_scores=score.fields)
+
+
+_SCORERS: dict[str, Scorer] = {
+    "title_f1": _title_f1,
+    "task_f1": _task_f1,
+}
+
+
+def register_scorer(name: str, scorer: Scorer) -> None:
+    _SCORERS[name] = scorer
+
+
+def available_scorers() -> list[str]:
+    return sorted(_SCORERS)
+
+
+def score_batch(
+    name: str, preds: Sequence[dict[str, Any]], exps: Sequence[dict[str, Any]]
+) -> list[CaseScore]:
+    scorer = get_scorer(name)
+    return [scorer(p, e) for p, e in zip(preds, exps, strict=True)]
+
+
+def get_scorer(name: str) -> Scorer:
+    try:
+        return _SCORERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown scorer: {name}. Expected one of: {', '.join(available_scorers())}"
+        ) from None
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import contextlib
+import random
+import threading
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Optional, Protocol
+
+from eval_harness.core import jsonio
+
+AttributeValue = Any  # str | bool | int | float (other values are exported as strings)
+
+# OTLP span kinds and status codes.
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    kind: int = KIND_INTERNAL
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    status_code: int = STATUS_UNSET
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Mapping[str, AttributeValue]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+# The tracer and span that adapter code nests under (see span()). Set by the
+# scheduler around each adapter call, including on pool threads.
+_TRACER: ContextVar[Optional[Tracer]] = ContextVar("eval_harness_tracer", default=None)
+_CURRENT: ContextVar[Optional[Span]] = ContextVar("eval_harness_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to an exporter in batches.
+
+    Parents are explicit in the harness (run -> case -> adapter/validate/score);
+    code running inside an adapter call nests via the module-level span().
+    Thread-safe.
+    """
+
+    def __init__(self, exporter: SpanExporter, *, batch_size: int = 512):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self._buffer: list[Span] = []
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+    def _new_id(self, nbytes: int) -> str:
+        with self._lock:
+            return f"{self._rng.getrandbits(nbytes * 8):0{nbytes * 2}x}"
+
+    def start_span(
+        self,
+        name: str,
+        *,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+        start_ns: Optional[int] = None,
+        kind: int = KIND_INTERNAL,
+    ) -> Span:
+        span = Span(
+            trace_id=parent.trace_id if parent is not None else self._new_id(16),
+            span_id=self._new_id(8),
+            parent_span_id=parent.span_id if parent is not None else None,
+            name=name,
+            start_ns=start_ns if start_ns is not None else time.time_ns(),
+            kind=kind,
+        )
+        if attributes:
+            span.set_attributes(attributes)
+        return span
+
+    def end_span(self, span: Span, end_ns: Optional[int] = None) -> None:
+        span.end_ns = end_ns if end_ns is not None else time.time_ns()
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self.exporter.export(batch)
+
+    def record(
+        self,
+        name: str,
+        *,
+        parent: Optional[Span],
+        start_ns: int,
+        end_ns: int,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ) -> Span:
+        """Add an already-timed span (e.g. one phase of a scored batch)."""
+        span = self.start_span(name, parent=parent, attributes=attributes, start_ns=start_ns)
+        self.end_span(span, end_ns)
+        return span
+
+    @contextlib.contextmanager
+    def activate(self, span: Optional[Span]) -> Iterator[Optional[Span]]:
+        """Make `span` the parent for span() calls in this context."""
+        t_token = _TRACER.set(self)
+        s_token = _CURRENT.set(span)
+        try:
+            yield span
+        finally:
+            _CURRENT.reset(s_token)
+            _TRACER.reset(t_token)
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        name: str,
+        *,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+        kind: int = KIND_INTERNAL,
+    ) -> Iterator[Span]:
+        """Time a block as a child of `parent` (default: the current span)."""
+        span = self.start_span(
+            name,
+            parent=parent if parent is not None else _CURRENT.get(),
+            attributes=attributes,
+            kind=kind,
+        )
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self.end_span(span)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self.exporter.export(batch)
+
+    def shutdown(self) -> None:
+        self.flush()
+        self.exporter.shutdown()
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, AttributeValue]) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(
+    name: str,
+    *,
+    attributes: Optional[Mapping[str, AttributeValue]] = None,
+    kind: int = KIND_INTERNAL,
+) -> contextlib.AbstractContextManager[Any]:
+    """
+    Child span of the current span, for use inside adapters:
+
+        with tracing.span("compose"):
+            ...
+
+    A no-op (yielding an object with the Span setters) when the run is not traced.
+    """
+    tracer = _TRACER.get()
+    if tracer is None:
+        return contextlib.nullcontext(_NOOP_SPAN)
+    return tracer.span(name, attributes=attributes, kind=kind)
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Mapping[str, AttributeValue]) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+def otlp_request(
+    spans: Sequence[Span], resource_attributes: Mapping[str, AttributeValue]
+) -> dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest in its JSON encoding."""
+    out = []
+    for s in spans:
+        item: dict[str, Any] = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": s.kind,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": _otlp_attributes(s.attributes),
+            "status": {"code": s.status_code},
+        }
+        if s.parent_span_id is not None:
+            item["parentSpanId"] = s.parent_span_id
+        if s.status_message:
+            item["status"]["message"] = s.status_message
+        out.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes(resource_attributes)},
+                "scopeSpans": [{"scope": {"name": "eval_harness"}, "spans": out}],
+            }
+        ]
+    }
+
+
+class OtlpJsonFileExporter:
+    """
+    Appends one OTLP/JSON ExportTraceServiceRequest per line, the format the
+    OpenTelemetry Collector's file exporter writes and its otlpjsonfile receiver
+    reads.
+    """
+
+    def __init__(
+        self, path: str | Path, *, resource_attributes: Optional[Mapping[str, Any]] = None
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.resource_attributes = {"service.name": "eval-harness", **(resource_attributes or {})}
+        self._file: IO[str] = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = jsonio.dumps_line(otlp_request(spans, self.resource_attributes))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list (tests, or post-processing in-process)."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        pass
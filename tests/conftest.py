@@ -0,0 +1,66 @@
+import json
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import pytest
+
+from eval_harness.core import runner
+from eval_harness.core.runner import run_eval
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATASET = REPO_ROOT / "datasets" / "sample_tasks.jsonl"
+PROMPT = REPO_ROOT / "prompts" / "task_extraction" / "v1.md"
+SCHEMA = REPO_ROOT / "schemas" / "task_extraction.schema.json"
+
+
+def _write_dataset(
+    path: Path, texts: Mapping[str, str] | Sequence[str], *, blank_every: int = 0
+) -> Path:
+    """
+    One case per text, expecting no tasks. Ids are the mapping's keys, or c0, c1, ...
+    for a sequence. With blank_every, a blank line follows every blank_every-th case
+    (starting with the first); loaders skip it but it still counts for line numbers.
+    """
+    if isinstance(texts, Mapping):
+        items = list(texts.items())
+    else:
+        items = [(f"c{i}", text) for i, text in enumerate(texts)]
+    lines = []
+    for i, (case_id, text) in enumerate(items):
+        lines.append(
+            json.dumps({"id": case_id, "input": {"text": text}, "expected": {"tasks": []}})
+        )
+        if blank_every and i % blank_every == 0:
+            lines.append("")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def write_dataset():
+    """write_dataset(path, texts, *, blank_every=0) -> path; see _write_dataset."""
+    return _write_dataset
+
+
+@pytest.fixture
+def run_report(tmp_path, monkeypatch):
+    """
+    run_report(*, adapter=None, **run_eval_kwargs) -> (report, summary).
+
+    Runs run_eval on the sample dataset, prompt and schema (each overridable) and
+    returns the written report, parsed, with the returned summary. An adapter
+    object is served for any adapter_name.
+    """
+
+    def run(*, adapter=None, **kwargs):
+        if adapter is not None:
+            monkeypatch.setattr(runner, "_build_adapter", lambda name: adapter)
+        kwargs.setdefault("dataset_path", str(DATASET))
+        kwargs.setdefault("prompt_path", str(PROMPT))
+        kwargs.setdefault("schema_path", str(SCHEMA))
+        kwargs.setdefault("out_dir", str(tmp_path / "reports"))
+        report_path, summary = run_eval(**kwargs)
+        report = json.loads(Path(report_path).read_text(encoding="utf-8"))
+        return report, summary
+
+    return run
@@ -0,0 +1,78 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from eval_harness.cli import main
+from eval_harness.core.batch import score_chunk
+from eval_harness.core.dataset import load_jsonl
+from eval_harness.core.metrics import exact_match
+from eval_harness.core.runner import run_eval
+from eval_harness.core.schemas import load_schema, validate_or_errors
+from eval_harness.core.scorers import get_scorer
+
+
+def test_score_chunk_matches_per_case_scoring():
+    validator = load_schema("schemas/task_extraction.schema.json")
+    cases = load_jsonl("datasets/sample_tasks.jsonl")
+    outputs = [c.expected for c in cases[1:]] + [{"tasks": [{"title": "x"}]}]
+    expected = [c.expected for c in cases]
+
+    batch = score_chunk(validator, "task_f1", outputs, expected)
+    scorer = get_scorer("task_f1")
+    for i, (out, exp) in enumerate(zip(outputs, expected)):
+        ok, errors = validate_or_errors(validator, out)
+        score = scorer(out, exp)
+        assert batch.schema_valid[i] == ok
+        assert batch.schema_errors[i] == errors
+        assert batch.exact_match[i] == exact_match(out, exp)
+        assert batch.f1[i] == score.f1
+        assert batch.field_scores[i] == score.field_scores
+
+
+def _results(report_path):
+    return json.loads(Path(report_path).read_text(encoding="utf-8"))["results"]
+
+
+def test_process_pool_scoring_gives_identical_rows(tmp_path):
+    args = (
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+    )
+    inline_path, _ = run_eval(*args, out_dir=str(tmp_path), scorer="task_f1")
+    pooled_path, _ = run_eval(
+        *args, out_dir=str(tmp_path), scorer="task_f1", score_chunk_size=5, score_workers=2
+    )
+
+    def strip(rows):
+        return [{k: v for k, v in r.items() if k != "latency_ms"} for r in rows]
+
+    assert strip(_results(inline_path)) == strip(_results(pooled_path))
+
+
+def test_score_chunk_size_must_be_positive(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="score_chunk_size must be >= 1"):
+        run_eval(
+            "datasets/sample_tasks.jsonl",
+            "prompts/task_extraction/v1.md",
+            "schemas/task_extraction.schema.json",
+            out_dir=str(tmp_path),
+            score_chunk_size=0,
+        )
+    argv = ["eval-harness", "run", "--dataset", "d", "--prompt", "p", "--schema", "s"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--score-chunk-size", "0"])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+
+
+@pytest.mark.parametrize("value", ["-1", "two"])
+def test_cli_rejects_bad_score_workers(monkeypatch, capsys, value):
+    argv = ["eval-harness", "run", "--dataset", "d", "--prompt", "p", "--schema", "s"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--score-workers", value])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "--score-workers" in capsys.readouterr().err
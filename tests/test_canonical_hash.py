@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from eval_harness.core.batch import ScoreMemo, score_chunk
+from eval_harness.core.canonical import canonical_json, fingerprint
+from eval_harness.core.metrics import exact_match
+from eval_harness.core.runner import run_eval
+from eval_harness.core.schemas import load_schema
+
+
+def test_canonical_json_sorts_keys_and_normalizes_floats():
+    a = {"b": [1.0, {"y": 2, "x": -0.0}], "a": 0.5}
+    b = {"a": 0.5, "b": [1, {"x": 0, "y": 2.0}]}
+    assert canonical_json(a) == canonical_json(b) == '{"a":0.5,"b":[1,{"x":0,"y":2}]}'
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint({"a": True}) != fingerprint({"a": 1})
+
+
+def test_exact_match_is_python_equality_in_both_paths():
+    pred = {"tasks": [{"title": "x", "confidence": 1.0, "done": True}]}
+    same = {"tasks": [{"confidence": 1, "title": "x", "done": 1}]}
+    other = {"tasks": []}
+    assert exact_match(pred, same) is True
+    assert exact_match(pred, other) is False
+
+    # The batch path shortcuts on fingerprints, which tell True from 1.
+    assert fingerprint(pred) != fingerprint(same)
+    batch = score_chunk(
+        load_schema("schemas/task_extraction.schema.json"), "title_f1", [pred, pred], [same, other]
+    )
+    assert batch.exact_match == [True, False]
+
+
+class CountingValidator:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def iter_errors(self, instance):
+        self.calls += 1
+        return self.inner.iter_errors(instance)
+
+
+def test_identical_outputs_are_validated_once():
+    validator = CountingValidator(load_schema("schemas/task_extraction.schema.json"))
+    output = {"tasks": [{"title": "x"}]}
+    memo = ScoreMemo()
+    first = score_chunk(validator, "title_f1", [output, dict(output)], [{}, {}], memo)  # type: ignore[arg-type]
+    second = score_chunk(validator, "title_f1", [output], [{}], memo)  # type: ignore[arg-type]
+    assert validator.calls == 1
+    assert first.schema_errors[0] == first.schema_errors[1] == second.schema_errors[0]
+    assert first.output_fingerprint[0] == second.output_fingerprint[0] == fingerprint(output)
+
+
+def test_rows_carry_output_fingerprint(tmp_path):
+    report_path, _ = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="mock",
+        out_dir=str(tmp_path),
+    )
+    rows = json.loads(Path(report_path).read_text(encoding="utf-8"))["results"]
+    assert all(len(r["output_fingerprint"]) == 32 for r in rows)
@@ -0,0 +1,179 @@
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.adapters.cassette import RecordingAdapter, ReplayAdapter
+from eval_harness.adapters.mock import MockModel
+from eval_harness.adapters.openai_v1 import OpenAIV1Model
+from eval_harness.adapters.stub_server import StubConfig, make_stub_server
+from eval_harness.cli import main
+
+_VOLATILE = {"run_id", "started_at_utc", "adapter"}
+
+
+def _stable(summary):
+    return {k: v for k, v in summary.items() if k not in _VOLATILE}
+
+
+@pytest.fixture
+def recorded(tmp_path, monkeypatch, run_report):
+    """A cassette of a run against the stub server (some outputs malformed)."""
+    stub = make_stub_server(config=StubConfig(malformed_rate=0.3, seed=5))
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    try:
+        model = OpenAIV1Model(api_key="test", model="gpt-4o-mini", base_url=stub.base_url)
+        cassette = tmp_path / "run.cassette.jsonl"
+        report, _ = run_report(
+            adapter=model,
+            adapter_name="openai",
+            record_path=str(cassette),
+            out_dir=str(tmp_path / "recorded"),
+        )
+    finally:
+        stub.shutdown()
+        stub.server_close()
+    monkeypatch.undo()
+    return cassette, report
+
+
+def test_replay_reproduces_the_recorded_report(recorded, tmp_path, run_report):
+    cassette, original = recorded
+    lines = cassette.read_text(encoding="utf-8").splitlines()
+    header = json.loads(lines[0])
+    assert header == {"cassette": 1, "adapter": "openai_v1", "model": "gpt-4o-mini"}
+    entry = json.loads(lines[1])
+    assert {"key", "output", "raw_text", "latency_ms", "usage", "cost_usd"} <= set(entry)
+    assert lines[1].startswith('{"key":"')  # compact separators
+
+    replay = ReplayAdapter(cassette)
+    assert replay.model == "gpt-4o-mini" and replay.pricing is not None
+    assert len(replay) == len(lines) - 1
+
+    replayed, _ = run_report(
+        adapter=replay, adapter_name="replay", out_dir=str(tmp_path / "replayed")
+    )
+
+    assert _stable(replayed["summary"]) == _stable(original["summary"])
+    assert replayed["summary"]["parse_error_count"] > 0
+    assert replayed["results"] == original["results"]
+
+
+def test_cli_replay_with_quality_gates(recorded, tmp_path, monkeypatch, capsys):
+    cassette, _ = recorded
+    monkeypatch.setenv("EVAL_HARNESS_CASSETTE", str(cassette))
+    argv = [
+        "eval-harness",
+        "run",
+        "--dataset",
+        "datasets/sample_tasks.jsonl",
+        "--prompt",
+        "prompts/task_extraction/v1.md",
+        "--schema",
+        "schemas/task_extraction.schema.json",
+        "--out",
+        str(tmp_path / "cli"),
+        "--adapter",
+        "replay",
+        "--min-schema-valid-rate",
+        "0.99",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "schema_valid_rate" in capsys.readouterr().out
+
+
+def test_missing_recording_is_an_error(tmp_path):
+    cassette = tmp_path / "c.jsonl"
+    cassette.write_text('{"cassette":1,"adapter":"x","model":null}\n', encoding="utf-8")
+    replay = ReplayAdapter(cassette)
+    with pytest.raises(ValueError, match="No recording"):
+        replay.generate_structured(prompt="p", input_obj={"text": "hello"})
+
+
+def test_invalid_entry_reports_line(tmp_path):
+    cassette = tmp_path / "c.jsonl"
+    cassette.write_text('{"cassette":1}\n{"output": {}}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"c.jsonl:2"):
+        ReplayAdapter(cassette)
+
+
+class _Counter:
+    name = "counter"
+
+    def __init__(self):
+        self.n = 0
+
+    def generate_structured(self, *, prompt, input_obj):
+        self.n += 1
+        return ModelResult(output={"tasks": [], "n": self.n}, raw_text=None, latency_ms=40)
+
+
+def test_repeated_requests_replay_in_order_and_latency_is_optional(tmp_path):
+    cassette = tmp_path / "c.jsonl"
+    recorder = RecordingAdapter(_Counter(), cassette)
+    for _ in range(3):
+        recorder.generate_structured(prompt="p", input_obj={"text": "x"})
+    recorder.close()
+
+    replay = ReplayAdapter(cassette)
+    got = [replay.generate_structured(prompt="p", input_obj={"text": "x"}) for _ in range(4)]
+    assert [r.output["n"] for r in got] == [1, 2, 3, 1]
+
+    t0 = time.perf_counter()
+    ReplayAdapter(cassette).generate_structured(prompt="p", input_obj={"text": "x"})
+    assert time.perf_counter() - t0 < 0.03
+
+    t0 = time.perf_counter()
+    ReplayAdapter(cassette, replay_latency=True).generate_structured(
+        prompt="p", input_obj={"text": "x"}
+    )
+    assert time.perf_counter() - t0 >= 0.04
+
+
+def test_recording_appends(tmp_path):
+    cassette = tmp_path / "c.jsonl"
+    for _ in range(2):
+        recorder = RecordingAdapter(_Counter(), cassette)
+        recorder.generate_structured(prompt="p", input_obj={"text": "x"})
+        recorder.close()
+    lines = cassette.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3  # one header, two entries
+
+
+def test_native_samples_are_recorded_and_replayed(tmp_path, run_report):
+    cassette = tmp_path / "samples.cassette.jsonl"
+    model = MockModel()
+    recorded, summary = run_report(
+        adapter=model,
+        samples=3,
+        record_path=str(cassette),
+        out_dir=str(tmp_path / "recorded"),
+    )
+    lines = cassette.read_text(encoding="utf-8").splitlines()
+    calls = summary["total"] - summary["coalesced_calls_saved"]
+    assert len(lines) == 1 + 3 * calls
+
+    replay = ReplayAdapter(cassette)
+    replayed, _ = run_report(
+        adapter=replay, adapter_name="replay", samples=3, out_dir=str(tmp_path / "replayed")
+    )
+    assert replayed["results"] == recorded["results"]
+    assert all(r["samples"]["n"] == 3 for r in replayed["results"])
+
+
+def test_recording_forwards_generate_samples_only_when_wrapped_adapter_has_it(tmp_path):
+    plain = RecordingAdapter(_Counter(), tmp_path / "a.jsonl")
+    plain.close()
+    assert not hasattr(plain, "generate_samples")
+    recorder = RecordingAdapter(MockModel(), tmp_path / "b.jsonl")
+    samples = recorder.generate_samples(prompt="p", input_obj={"text": "Send it"}, n=2)
+    recorder.close()
+    assert len(samples) == 2
+    replay = ReplayAdapter(tmp_path / "b.jsonl")
+    assert replay.generate_samples(prompt="p", input_obj={"text": "Send it"}, n=2) == samples
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+HEAVY_SDK_MODULES = ("openai", "httpx", "pydantic")
+
+
+def _loaded_modules(code: str) -> set[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(out.split())
+
+
+def test_help_does_not_load_runner_or_sdks():
+    modules = _loaded_modules(
+        "import sys\n"
+        "from eval_harness.cli import main\n"
+        "sys.argv = ['eval-harness', '--help']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert "eval_harness.core.runner" not in modules
+    assert "jsonschema" not in modules
+    for name in HEAVY_SDK_MODULES:
+        assert name not in modules
+
+
+def test_mock_run_does_not_import_heavy_sdks(tmp_path):
+    modules = _loaded_modules(
+        "import sys\n"
+        "from eval_harness.cli import main\n"
+        "sys.argv = ['eval-harness', 'run',\n"
+        "    '--dataset', 'datasets/sample_tasks.jsonl',\n"
+        "    '--prompt', 'prompts/task_extraction/v1.md',\n"
+        "    '--schema', 'schemas/task_extraction.schema.json',\n"
+        f"    '--adapter', 'mock', '--out', {str(tmp_path)!r}]\n"
+        "main()"
+    )
+    assert "eval_harness.adapters.mock" in modules
+    for name in HEAVY_SDK_MODULES:
+        assert name not in modules
+
+
+def test_registered_adapter_is_built_without_touching_runner(monkeypatch):
+    from eval_harness.adapters import registry
+    from eval_harness.adapters.mock import MockModel
+
+    monkeypatch.setitem(registry._registered, "mock-alias", MockModel)
+    assert isinstance(registry.build_adapter("mock-alias"), MockModel)
+    assert "mock-alias" in registry.available_adapters()
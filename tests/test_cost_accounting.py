@@ -0,0 +1,152 @@
+import dataclasses
+
+import pytest
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.adapters.pricing import (
+    ModelPricing,
+    cost_from_usage,
+    lookup_pricing,
+    token_counts,
+)
+from eval_harness.core import runner
+from eval_harness.core.runner import run_eval
+
+PRICING = ModelPricing(input_per_1m=1.0, cached_input_per_1m=0.5, output_per_1m=4.0)
+
+
+class PricedFakeModel:
+    name = "fake"
+    pricing = PRICING
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_structured(self, *, prompt, input_obj):
+        self.calls += 1
+        usage = {
+            "input_tokens": 1000,
+            "input_tokens_details": {"cached_tokens": 400},
+            "output_tokens": 250,
+        }
+        return ModelResult(
+            output={"tasks": []},
+            raw_text="{}",
+            latency_ms=1,
+            usage=usage,
+            cost_usd=cost_from_usage(usage, self.pricing),
+        )
+
+
+def test_cost_from_responses_usage_prices_cached_tokens_separately():
+    usage = {
+        "input_tokens": 1000,
+        "input_tokens_details": {"cached_tokens": 400},
+        "output_tokens": 250,
+    }
+    # 600 uncached * 1.0 + 400 cached * 0.5 + 250 output * 4.0 = 1800 per 1M
+    cost = cost_from_usage(usage, PRICING)
+    assert cost is not None
+    assert abs(cost - 0.0018) < 1e-12
+
+
+def test_token_counts_reads_chat_completions_shape():
+    counts = token_counts(
+        {
+            "prompt_tokens": 10,
+            "prompt_tokens_details": {"cached_tokens": 4},
+            "completion_tokens": 3,
+        }
+    )
+    assert counts is not None
+    assert (counts.input_tokens, counts.cached_input_tokens, counts.output_tokens) == (10, 4, 3)
+
+
+def test_unknown_usage_or_model_has_no_cost():
+    assert cost_from_usage({"mock_tokens": 12}, PRICING) is None
+    assert lookup_pricing("my-custom-deployment") is None
+    assert lookup_pricing("gpt-4o-mini-2024-07-18") == lookup_pricing("gpt-4o-mini")
+
+
+def test_summary_reports_total_cost(monkeypatch, tmp_path):
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: PricedFakeModel())
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="fake",
+        out_dir=str(tmp_path),
+    )
+    assert summary["total_cost_usd"] == pytest.approx(0.0018 * summary["total"], abs=1e-9)
+    assert summary["budget_exhausted"] is False
+    assert summary["skipped_count"] == 0
+
+
+def test_budget_halts_before_exceeding(monkeypatch, tmp_path):
+    fake = PricedFakeModel()
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: fake)
+    budget = 0.0018 * 3.5
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="fake",
+        out_dir=str(tmp_path),
+        max_cost_usd=budget,
+    )
+    assert summary["budget_exhausted"] is True
+    spent = summary["total_cost_usd"]
+    assert spent is not None and spent <= budget
+    assert summary["total"] == fake.calls
+    assert summary["total"] + summary["skipped_count"] == 12
+
+
+def test_mock_run_costs_nothing(tmp_path):
+    # The mock declares zero pricing, so a budget run is allowed and never halts.
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="mock",
+        out_dir=str(tmp_path),
+        max_cost_usd=0.0,
+    )
+    assert summary["total_cost_usd"] == 0.0
+    assert summary["cost_per_correct_usd"] == 0.0
+    assert summary["budget_exhausted"] is False
+
+
+class UnpricedFakeModel(PricedFakeModel):
+    pricing = None
+
+    def generate_structured(self, *, prompt, input_obj):
+        result = super().generate_structured(prompt=prompt, input_obj=input_obj)
+        return dataclasses.replace(result, cost_usd=None)
+
+
+def test_budget_without_pricing_fails_fast(monkeypatch, tmp_path):
+    fake = UnpricedFakeModel()
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: fake)
+    with pytest.raises(ValueError, match="max_cost_usd needs model pricing"):
+        run_eval(
+            "datasets/sample_tasks.jsonl",
+            "prompts/task_extraction/v1.md",
+            "schemas/task_extraction.schema.json",
+            adapter_name="fake",
+            out_dir=str(tmp_path),
+            max_cost_usd=0.0001,
+        )
+    assert fake.calls == 0
+
+
+def test_unknown_cost_is_reported_as_none(monkeypatch, tmp_path):
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: UnpricedFakeModel())
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="fake",
+        out_dir=str(tmp_path),
+    )
+    assert summary["total_cost_usd"] is None
+    assert summary["cost_per_correct_usd"] is None
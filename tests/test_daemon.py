@@ -0,0 +1,176 @@
+import http.client
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from eval_harness.core import runner
+from eval_harness.core.daemon import WarmCache, make_server
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMA = str(REPO_ROOT / "schemas" / "task_extraction.schema.json")
+
+
+def _touch_later(path: Path) -> None:
+    # Guarantee a new mtime even on filesystems with coarse timestamps.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def server():
+    srv = make_server("127.0.0.1", 0, watch_interval_s=0.02)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post_run(srv, body):
+    conn = http.client.HTTPConnection("127.0.0.1", srv.server_address[1], timeout=10)
+    conn.request(
+        "POST", "/run", body=json.dumps(body), headers={"Content-Type": "application/json"}
+    )
+    return conn, conn.getresponse()
+
+
+def _read_until(resp, event):
+    events = []
+    while True:
+        line = resp.readline()
+        assert line, f"stream ended before {event!r}: {events}"
+        events.append(json.loads(line))
+        if events[-1]["event"] in (event, "error"):
+            return events
+
+
+def test_warm_cache_reuses_loaded_inputs(tmp_path, monkeypatch, write_dataset):
+    dataset = tmp_path / "d.jsonl"
+    write_dataset(dataset, {"a": "Send the email", "b": "Review the doc"})
+    builds = []
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: builds.append(name) or object())
+
+    cache = WarmCache()
+    v1 = cache.validator(SCHEMA)
+    ds1 = cache.dataset(str(dataset))
+    cache.adapter("mock")
+    cache.adapter("mock")
+    assert cache.validator(SCHEMA) is v1
+    assert cache.dataset(str(dataset)) is ds1
+    assert builds == ["mock"]
+    assert [c.id for c in cache.cases(str(dataset), only_ids=["b"])] == ["b"]
+
+    write_dataset(dataset, {"a": "Send the email", "b": "Review the doc", "c": "Book it"})
+    _touch_later(dataset)
+    assert cache.dataset(str(dataset)) is not ds1
+
+
+def test_run_streams_rows_then_summary(server, tmp_path, write_dataset):
+    dataset = tmp_path / "d.jsonl"
+    write_dataset(dataset, {"a": "Send the email", "b": "Review the doc"})
+    conn, resp = _post_run(
+        server,
+        {
+            "dataset": str(dataset),
+            "prompt": str(REPO_ROOT / "prompts" / "task_extraction" / "v1.md"),
+            "schema": SCHEMA,
+            "out_dir": str(tmp_path / "reports"),
+        },
+    )
+    assert resp.status == 200
+    events = _read_until(resp, "summary")
+    conn.close()
+
+    assert [e["event"] for e in events] == ["result", "result", "summary"]
+    assert [e["row"]["id"] for e in events[:2]] == ["a", "b"]
+    assert events[-1]["summary"]["total"] == 2
+    assert Path(events[-1]["report_path"]).exists()
+
+
+def test_bad_request_is_rejected(server):
+    conn, resp = _post_run(server, {"dataset": "x.jsonl"})
+    assert resp.status == 400
+    assert "prompt" in json.loads(resp.read())["error"]
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("concurrency", "8"),
+        ("concurrency", True),
+        ("only_ids", "x"),
+        ("only_ids", [1]),
+        ("shard", [0, "2"]),
+        ("max_cost_usd", "1"),
+        ("watch", 1),
+        ("adapter", None),
+    ],
+)
+def test_badly_typed_field_is_rejected_before_streaming(server, field, value):
+    conn, resp = _post_run(
+        server, {"dataset": "d.jsonl", "prompt": "p.md", "schema": SCHEMA, field: value}
+    )
+    assert resp.status == 400
+    assert field in json.loads(resp.read())["error"]
+    conn.close()
+
+
+def test_unexpected_run_failure_is_an_error_event(server, tmp_path, monkeypatch, write_dataset):
+    class Broken:
+        def generate_structured(self, *args, **kwargs):
+            raise RuntimeError("adapter blew up")
+
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: Broken())
+    dataset = tmp_path / "d.jsonl"
+    write_dataset(dataset, {"a": "Send the email"})
+    conn, resp = _post_run(
+        server,
+        {
+            "dataset": str(dataset),
+            "prompt": str(REPO_ROOT / "prompts" / "task_extraction" / "v1.md"),
+            "schema": SCHEMA,
+            "adapter": "broken",
+            "out_dir": str(tmp_path / "reports"),
+        },
+    )
+    assert resp.status == 200
+    events = _read_until(resp, "summary")
+    conn.close()
+    assert events == [{"event": "error", "error": "RuntimeError: adapter blew up"}]
+
+
+def test_watch_reruns_only_changed_cases(server, tmp_path, write_dataset):
+    dataset = tmp_path / "d.jsonl"
+    prompt = tmp_path / "prompt.md"
+    prompt.write_text("Extract tasks.", encoding="utf-8")
+    texts = {"a": "Send the email", "b": "Review the doc", "c": "Book the room"}
+    write_dataset(dataset, texts)
+
+    conn, resp = _post_run(
+        server,
+        {
+            "dataset": str(dataset),
+            "prompt": str(prompt),
+            "schema": SCHEMA,
+            "out_dir": str(tmp_path / "reports"),
+            "watch": True,
+        },
+    )
+    assert _read_until(resp, "summary")[-1]["summary"]["total"] == 3
+
+    write_dataset(dataset, {**texts, "b": "Review the updated doc", "d": "Deploy it"})
+    _touch_later(dataset)
+    events = _read_until(resp, "summary")
+    assert events[0] == {"event": "change", "files": ["dataset"], "case_ids": ["b", "d"]}
+    assert [e["row"]["id"] for e in events if e["event"] == "result"] == ["b", "d"]
+
+    prompt.write_text("Extract all tasks.", encoding="utf-8")
+    _touch_later(prompt)
+    events = _read_until(resp, "summary")
+    assert events[0]["files"] == ["prompt"]
+    assert events[-1]["summary"]["total"] == 4
+    conn.close()
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from eval_harness.core import dataset_index
+from eval_harness.core.dataset import load_jsonl
+from eval_harness.core.dataset_index import DatasetIndex, index_path_for
+
+
+def _tasks(n):
+    return [f"Task {i}" for i in range(n)]
+
+
+def test_index_matches_load_jsonl(tmp_path, write_dataset):
+    dataset = tmp_path / "d.jsonl"
+    write_dataset(dataset, _tasks(25), blank_every=3)
+    cases = load_jsonl(str(dataset))
+
+    with DatasetIndex.open(dataset) as index:
+        assert len(index) == len(cases)
+        assert [index.case_at(i) for i in range(len(index))] == cases
+        assert index.get("c17") == cases[17]
+        assert index.get("missing") is None
+        shards = [list(index.iter_shard(i, 4)) for i in range(4)]
+    assert [c for shard in shards for c in shard] == cases
+
+    assert index_path_for(dataset).exists()
+
+
+def test_sidecar_is_reused_and_rebuilt_when_dataset_changes(tmp_path, monkeypatch, write_dataset):
+    dataset = tmp_path / "d.jsonl"
+    write_dataset(dataset, _tasks(5), blank_every=3)
+    DatasetIndex.open(dataset).close()
+
+    builds = []
+    real_build = dataset_index.build_index
+    monkeypatch.setattr(dataset_index, "build_index", lambda *a: builds.append(1) or real_build(*a))
+
+    DatasetIndex.open(dataset).close()
+    assert builds == []
+
+    write_dataset(dataset, _tasks(6), blank_every=3)
+    st = dataset.stat()
+    os.utime(dataset, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    with DatasetIndex.open(dataset) as index:
+        assert builds == [1]
+        case = index.get("c5")
+        assert case is not None
+        assert case.input == {"text": "Task 5"}
+
+
+def test_duplicate_ids_resolve_to_first_occurrence(tmp_path):
+    dataset = tmp_path / "d.jsonl"
+    dataset.write_text(
+        '{"id": "a", "input": {"text": "first"}}\n'
+        '{"input": {"text": "no id"}}\n'
+        '{"id": "a", "input": {"text": "second"}}\n',
+        encoding="utf-8",
+    )
+    with DatasetIndex.open(dataset) as index:
+        first, no_id = index.get("a"), index.get("case-2")
+    assert first is not None and first.input == {"text": "first"}
+    assert no_id is not None and no_id.input == {"text": "no id"}
+
+
+def test_empty_dataset_and_unwritable_sidecar(tmp_path, monkeypatch):
+    dataset = tmp_path / "empty.jsonl"
+    dataset.write_bytes(b"")
+    monkeypatch.setattr(dataset_index, "_write_atomic", lambda *a: None)
+    with DatasetIndex.open(dataset) as index:
+        assert len(index) == 0
+        assert list(index.iter_shard(0, 2)) == []
+    assert not index_path_for(dataset).exists()
+
+
+def test_run_eval_only_and_shard(tmp_path, write_dataset, run_report):
+    dataset = write_dataset(tmp_path / "d.jsonl", _tasks(10), blank_every=3)
+
+    report, _ = run_report(dataset_path=str(dataset), only_ids=["c7", "c2"])
+    assert [r["id"] for r in report["results"]] == ["c2", "c7"]
+    assert report["meta"]["only_ids"] == ["c7", "c2"]
+
+    report, _ = run_report(dataset_path=str(dataset), shard=(1, 3))
+    assert [r["id"] for r in report["results"]] == ["c3", "c4", "c5"]
+    assert report["meta"]["shard"] == "1/3"
+
+    with pytest.raises(ValueError, match="Unknown case id"):
+        run_report(dataset_path=str(dataset), only_ids=["nope"])
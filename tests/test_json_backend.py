@@ -0,0 +1,88 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from eval_harness.core import jsonio
+from eval_harness.core.runner import run_eval
+
+orjson = pytest.importorskip("orjson")
+
+
+def _stdlib_bytes(obj):
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def test_report_serialization_is_byte_compatible(tmp_path):
+    report_path, _ = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="mock",
+        out_dir=str(tmp_path),
+        scorer="task_f1",
+    )
+    report = json.loads(Path(report_path).read_text(encoding="utf-8"))
+    # Realistic per-row costs are tiny floats that repr() writes in scientific form.
+    for i, row in enumerate(report["results"]):
+        row["cost_usd"] = 1.8e-05 * (i + 1)
+    fast = jsonio.get_backend("orjson")
+    assert fast.dumps_pretty(report).encode("utf-8") == _stdlib_bytes(report)
+
+
+def test_float_and_string_edge_cases_match_stdlib():
+    rng = random.Random(3)
+    fast = jsonio.get_backend("orjson")
+    for _ in range(2000):
+        floats = [rng.random() * 10 ** rng.randint(-12, 25) * rng.choice([1, -1]) for _ in range(4)]
+        doc = {
+            "floats": floats,
+            "text": 'looks like 1e5 and 0.00001, "quoted" \\ é   \x01',
+            "nested": {"k": floats[0], "empty": [], "obj": {}},
+            "ints": [0, -1, 2**40],
+        }
+        assert fast.dumps_pretty(doc) == json.dumps(doc, indent=2, ensure_ascii=False)
+
+
+def test_floats_orjson_writes_differently_match_stdlib():
+    fast = jsonio.get_backend("orjson")
+    floats = [1e-05, -2.5e-09, 9.999e-05, 1e16, -1.5e20, 5e-324, float("nan"), float("inf")]
+    for doc in ({"x": floats, "y": tuple(floats)}, floats, floats[0], float("-inf"), [[[]], {}]):
+        assert fast.dumps_pretty(doc) == json.dumps(doc, indent=2, ensure_ascii=False)
+
+
+def test_strings_that_look_like_markers_are_left_alone():
+    fast = jsonio.get_backend("orjson")
+    for text in ["\x001e-05\x00", "\\u00001e-05\\u0000", '"\x00']:
+        doc = {"text": text, "cost": 1.8e-05, "keys": {text: [text, 2e-07]}}
+        assert fast.dumps_pretty(doc) == json.dumps(doc, indent=2, ensure_ascii=False)
+
+
+def test_backend_is_resolved_on_first_use(monkeypatch):
+    monkeypatch.setattr(jsonio, "_backend", None)
+    monkeypatch.setenv("EVAL_HARNESS_JSON", "stdlib")
+    assert jsonio.current_backend() is jsonio.STDLIB
+    jsonio.set_backend("orjson")
+    assert jsonio.current_backend().name == "orjson"
+    monkeypatch.setenv("EVAL_HARNESS_JSON", "stdlib")
+    jsonio.set_backend(None)
+    assert jsonio.current_backend() is jsonio.STDLIB
+
+
+def test_orjson_falls_back_for_unsupported_values():
+    fast = jsonio.get_backend("orjson")
+    doc = {"big": 2**70, 1: "non-str key"}
+    assert fast.dumps_pretty(doc) == json.dumps(doc, indent=2, ensure_ascii=False)
+
+
+def test_loads_parity_on_dataset_lines():
+    fast = jsonio.get_backend("orjson")
+    for line in Path("datasets/sample_tasks.jsonl").read_bytes().splitlines():
+        if line.strip():
+            assert fast.loads(line) == jsonio.STDLIB.loads(line)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        jsonio.get_backend("simdjson")
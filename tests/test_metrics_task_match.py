@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import pytest
+
+from eval_harness.core import metrics
+from eval_harness.core.assignment import greedy_assignment, max_weight_assignment
+from eval_harness.core.metrics import task_match
+from eval_harness.core.runner import run_eval
+from eval_harness.core.scorers import get_scorer
+
+
+def _task(title, assignee="unknown", due_date=None):
+    return {"title": title, "assignee": assignee, "due_date": due_date, "confidence": 0.8}
+
+
+def test_task_match_perfect_and_empty():
+    obj = {"tasks": [_task("Send email", "Marc")]}
+    assert task_match(obj, obj).f1 == 1.0
+    assert task_match({"tasks": []}, {"tasks": []}).f1 == 1.0
+    assert task_match({"tasks": []}, obj).f1 == 0.0
+
+
+def test_task_match_credits_partial_titles_and_fields():
+    pred = {"tasks": [_task("Send the email to client", "Marc")]}
+    exp = {"tasks": [_task("Send email to client", "Nina")]}
+    score = task_match(pred, exp)
+    assert 0.0 < score.f1 < 1.0
+    assert score.fields["assignee"] == {"precision": 0.0, "recall": 0.0}
+    assert score.fields["due_date"] == {"precision": 1.0, "recall": 1.0}
+    assert score.fields["title"]["precision"] == pytest.approx(0.8)
+
+
+def test_task_match_keeps_duplicates():
+    pred = {"tasks": [_task("Send email"), _task("Send email")]}
+    exp = {"tasks": [_task("Send email")]}
+    score = task_match(pred, exp)
+    assert score.precision == pytest.approx(0.5)
+    assert score.recall == pytest.approx(1.0)
+
+
+def test_assignment_is_optimal_against_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        rows, cols = rng.randint(1, 5), rng.randint(1, 5)
+        w = [[rng.random() for _ in range(cols)] for _ in range(rows)]
+        pairs = max_weight_assignment(w)
+        assert len(pairs) == min(rows, cols)
+        got = sum(w[r][c] for r, c in pairs)
+        if rows <= cols:
+            best = max(
+                sum(w[r][c] for r, c in enumerate(perm))
+                for perm in itertools.permutations(range(cols), rows)
+            )
+        else:
+            best = max(
+                sum(w[r][c] for c, r in enumerate(perm))
+                for perm in itertools.permutations(range(rows), cols)
+            )
+        assert got == pytest.approx(best)
+
+
+def test_unknown_scorer_is_rejected():
+    with pytest.raises(ValueError):
+        get_scorer("nope")
+
+
+def test_runner_selects_scorer_by_name(tmp_path):
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="mock",
+        out_dir=str(tmp_path),
+        scorer="task_f1",
+    )
+    assert summary["scorer"] == "task_f1"
+    assert set(summary.get("field_scores", {})) == {"title", "assignee", "due_date"}
+    assert 0.0 <= summary["avg_f1"] <= 1.0
+
+
+def test_greedy_assignment_takes_heaviest_edges_first():
+    edges = {(0, 0): 0.9, (0, 1): 0.8, (1, 0): 0.85, (1, 1): 0.1, (2, 1): 0.0}
+    assert greedy_assignment(edges) == [(0, 0), (1, 1)]
+
+
+def test_large_component_is_matched_greedily(monkeypatch):
+    rng = random.Random(3)
+    words = [f"w{i}" for i in range(30)]
+
+    def case(n):
+        return {"tasks": [_task("follow up " + " ".join(rng.sample(words, 2))) for _ in range(n)]}
+
+    for _ in range(10):
+        pred, exp = case(8), case(8)
+        exact = task_match(pred, exp)
+        monkeypatch.setattr(metrics, "MAX_EXACT_ASSIGNMENT_WORK", 8)
+        greedy = task_match(pred, exp)
+        monkeypatch.undo()
+        assert exact.precision / 2 <= greedy.precision <= exact.precision + 1e-9
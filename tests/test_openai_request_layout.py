@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from eval_harness.adapters.openai_v1 import OpenAIV1Model
+from eval_harness.core import runner
+from eval_harness.core.runner import run_eval
+
+
+class FakeResponses:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        # Everything after the first call is served from the cached prefix.
+        cached = 80 if len(self.calls) > 1 else 0
+        return SimpleNamespace(
+            output_text='{"tasks": []}',
+            usage={
+                "input_tokens": 100,
+                "input_tokens_details": {"cached_tokens": cached},
+                "output_tokens": 5,
+            },
+        )
+
+
+def _fake_model():
+    model = OpenAIV1Model(api_key="sk-test", model="gpt-4o-mini")
+    fake = FakeResponses()
+    model.client = SimpleNamespace(responses=fake)  # type: ignore[assignment]
+    return model, fake
+
+
+def test_prompt_is_sent_as_stable_instructions_prefix():
+    model, fake = _fake_model()
+    model.generate_structured(prompt="PROMPT", input_obj={"text": "first case"})
+    model.generate_structured(prompt="PROMPT", input_obj={"text": "second case"})
+
+    first, second = fake.calls
+    assert first["instructions"] == second["instructions"] == "PROMPT"
+    assert "PROMPT" not in first["input"]
+    assert first["input"].endswith("first case")
+    assert second["input"].endswith("second case")
+
+
+def test_summary_surfaces_cache_hit_rate(monkeypatch, tmp_path):
+    model, _ = _fake_model()
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: model)
+    _, summary = run_eval(
+        "datasets/sample_tasks.jsonl",
+        "prompts/task_extraction/v1.md",
+        "schemas/task_extraction.schema.json",
+        adapter_name="openai",
+        out_dir=str(tmp_path),
+    )
+    total = summary["total"]
+    assert summary["total_input_tokens"] == 100 * total
+    assert summary["total_cached_input_tokens"] == 80 * (total - 1)
+    assert abs(summary["cache_hit_rate"] - 0.8 * (total - 1) / total) < 1e-9
+    cost = summary["total_cost_usd"]
+    assert cost is not None and cost > 0.0
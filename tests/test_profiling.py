@@ -0,0 +1,101 @@
+import pstats
+import sys
+import tracemalloc
+
+import pytest
+
+from eval_harness.cli import main
+from eval_harness.core.profiling import AllocProfiler, CpuProfiler, make_profiler, stage_times
+from eval_harness.core.schemas import load_schema, validate_or_errors
+
+
+def _run(run_report, profiler, **kwargs):
+    profiler.start()
+    try:
+        return run_report(profiler=profiler, **kwargs)
+    finally:
+        profiler.stop()
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_cpu_profile_attributes_stages(tmp_path, concurrency, run_report):
+    profiler = CpuProfiler()
+    _run(run_report, profiler, concurrency=concurrency)
+
+    times = stage_times(profiler.stats)
+    assert set(times) == {
+        "load_jsonl",
+        "adapter",
+        "validate_or_errors",
+        "metrics",
+        "serialization",
+    }
+    # Adapter calls on pool threads are merged into the profile.
+    assert times["adapter"] > 0
+    assert times["validate_or_errors"] > 0
+
+    base = tmp_path / "run"
+    pstats_path, text_path = profiler.write(base)
+    assert pstats.Stats(str(pstats_path)).get_stats_profile().func_profiles
+    assert "by stage" in text_path.read_text(encoding="utf-8")
+
+
+def test_alloc_profile_writes_loadable_snapshot(tmp_path, run_report):
+    profiler = AllocProfiler()
+    _run(run_report, profiler)
+    assert not tracemalloc.is_tracing()
+
+    sizes = profiler.stage_bytes()
+    assert sizes["load_jsonl"] > 0
+    snap_path, text_path = profiler.write(tmp_path / "run")
+    assert tracemalloc.Snapshot.load(str(snap_path)).traces
+    assert text_path.read_text(encoding="utf-8").startswith("Allocation profile: peak")
+
+
+def test_alloc_stage_is_decided_by_the_innermost_frame():
+    validator = load_schema("schemas/task_extraction.schema.json")
+    # An outer frame of another stage, as when core/batch.py validates a chunk.
+    outer: dict = {}
+    exec(compile("def call(f, *a):\n    return f(*a)\n", "core/batch.py", "exec"), outer)
+    outputs = [{"tasks": [{"title": i} for i in range(20)]} for _ in range(20)]
+
+    profiler = AllocProfiler()
+    profiler.start()
+    try:
+        kept = [outer["call"](validate_or_errors, validator, o) for o in outputs]
+    finally:
+        profiler.stop()
+
+    assert all(errors for _, errors in kept)
+    sizes = profiler.stage_bytes()
+    assert sizes["validate_or_errors"] > 0
+    assert sizes["metrics"] == 0
+
+
+def test_unknown_profile_mode():
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        make_profiler("gpu")
+
+
+def test_cli_profile_flag(monkeypatch, tmp_path, capsys):
+    argv = [
+        "eval-harness",
+        "run",
+        "--dataset",
+        "datasets/sample_tasks.jsonl",
+        "--prompt",
+        "prompts/task_extraction/v1.md",
+        "--schema",
+        "schemas/task_extraction.schema.json",
+        "--out",
+        str(tmp_path),
+        "--profile",
+        "cpu",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+
+    out = capsys.readouterr().out
+    assert "CPU profile:" in out
+    assert "load_jsonl" in out
+    assert len(list(tmp_path.glob("run-*.cpu.pstats"))) == 1
@@ -0,0 +1,134 @@
+import io
+import json
+import sys
+import time
+
+import pytest
+
+from eval_harness.cli import main
+from eval_harness.core.progress import LatencyHistogram, RunTelemetry
+from eval_harness.core.runner import run_eval
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    assert hist.percentile(0.95) is None
+    for ms in range(1, 101):
+        hist.record(float(ms))
+    p50 = hist.percentile(0.5)
+    p95 = hist.percentile(0.95)
+    assert p50 is not None and p95 is not None
+    # sqrt(2)-spaced buckets: within one bucket width of the true value.
+    assert 50 / 1.42 <= p50 <= 50 * 1.42
+    assert 95 / 1.42 <= p95 <= 95 * 1.42
+    assert hist.count == 100 and hist.sum == 5050.0
+
+    for ms in range(1, 51):
+        hist.discard(float(ms))
+    low = hist.percentile(0.05)
+    assert low is not None and low >= 50 / 1.42
+    assert hist.count == 50 and hist.sum == 5050.0 - 1275.0
+
+
+def test_status_line_and_rate_limited_rendering():
+    clock = _Clock()
+    stream = io.StringIO()
+    telemetry = RunTelemetry(stream=stream, interval_s=1.0, clock=clock)
+    telemetry.begin(run_id="r", total=100)
+
+    for i in range(50):
+        clock.now += 0.1
+        telemetry.case_completed(latency_ms=200.0, parse_error=i == 0, cost_usd=0.01, in_flight=4)
+    telemetry.rows_scored(50, 2)
+
+    # One line at begin() plus at most one per simulated second.
+    assert len(stream.getvalue().splitlines()) <= 1 + 5
+    line = telemetry.status_line()
+    assert line.startswith("[ 50/100] 10.0 cases/s | in-flight 4 | p95 ")
+    assert "parse errors 1 | schema invalid 2 | ETA 5s" in line
+
+    telemetry.finish()
+    assert stream.getvalue().endswith(telemetry.status_line() + "\n")
+    assert telemetry.snapshot()["cost_usd"] == pytest.approx(0.5)
+
+
+def test_snapshot_files_are_written_atomically(tmp_path):
+    prom = tmp_path / "eval.prom"
+    telemetry = RunTelemetry(snapshot_path=prom)
+    telemetry.begin(run_id="run-1", total=2)
+    telemetry.case_completed(latency_ms=12.0, parse_error=False, cost_usd=None, in_flight=1)
+    telemetry.finish()
+
+    text = prom.read_text(encoding="utf-8")
+    assert 'eval_harness_cases_completed_total{run_id="run-1"} 1' in text
+    assert 'eval_harness_adapter_latency_ms_bucket{run_id="run-1",le="+Inf"} 1' in text
+    assert "# TYPE eval_harness_adapter_latency_ms histogram" in text
+    assert [p.name for p in tmp_path.iterdir()] == ["eval.prom"]
+
+    path = tmp_path / "eval.json"
+    telemetry = RunTelemetry(snapshot_path=path)
+    telemetry.begin(run_id="run-2", total=3)
+    snap = json.loads(path.read_text(encoding="utf-8"))
+    assert snap["cases_total"] == 3 and snap["latency_p95_ms"] is None
+
+
+def test_per_case_overhead_is_small():
+    # Never renders during the loop, so this measures the per-case bookkeeping.
+    telemetry = RunTelemetry(stream=io.StringIO(), interval_s=3600.0)
+    telemetry.begin(run_id="r", total=100_000)
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        telemetry.case_completed(latency_ms=150.0, parse_error=False, cost_usd=0.001, in_flight=8)
+    per_case_us = (time.perf_counter() - t0) / n * 1e6
+    assert per_case_us < 20
+
+
+def test_run_eval_reports_progress(tmp_path):
+    telemetry = RunTelemetry(snapshot_path=tmp_path / "m.json")
+    _, summary = run_eval(
+        dataset_path="datasets/sample_tasks.jsonl",
+        prompt_path="prompts/task_extraction/v1.md",
+        schema_path="schemas/task_extraction.schema.json",
+        out_dir=str(tmp_path),
+        concurrency=4,
+        telemetry=telemetry,
+    )
+    snap = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert snap["run_id"] == summary["run_id"]
+    assert snap["cases_completed"] == snap["cases_scored"] == summary["total"]
+    assert snap["in_flight"] == 0
+    assert telemetry.latency.count == summary["total"] - summary["coalesced_calls_saved"]
+
+
+def test_cli_progress_flags(monkeypatch, tmp_path, capsys):
+    metrics = tmp_path / "eval.prom"
+    argv = [
+        "eval-harness",
+        "run",
+        "--dataset",
+        "datasets/sample_tasks.jsonl",
+        "--prompt",
+        "prompts/task_extraction/v1.md",
+        "--schema",
+        "schemas/task_extraction.schema.json",
+        "--out",
+        str(tmp_path),
+        "--progress",
+        "--metrics-file",
+        str(metrics),
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+
+    err = capsys.readouterr().err
+    assert "[12/12]" in err
+    assert "eval_harness_cases_scored_total" in metrics.read_text(encoding="utf-8")
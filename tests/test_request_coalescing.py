@@ -0,0 +1,99 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.cli import main
+from eval_harness.core.dataset import DatasetCase
+from eval_harness.core.scheduler import RequestScheduler
+
+
+class CountingModel:
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_structured(self, *, prompt, input_obj):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        return ModelResult(
+            output={"tasks": []},
+            raw_text="{}",
+            latency_ms=20,
+            usage={"input_tokens": 10, "output_tokens": 2},
+            cost_usd=0.001,
+        )
+
+
+def _run(run_report, dataset, **kwargs):
+    model = CountingModel()
+    report, summary = run_report(
+        adapter=model, adapter_name="counting", dataset_path=str(dataset), **kwargs
+    )
+    return model, summary, report["results"]
+
+
+def test_duplicate_requests_share_one_call(run_report, write_dataset, tmp_path):
+    dataset = write_dataset(tmp_path / "dups.jsonl", ["a", "a", "b", "a", "b", "c"])
+    model, summary, rows = _run(run_report, dataset, concurrency=4)
+
+    assert model.calls == 3
+    assert summary["coalesced_calls_saved"] == 3
+    assert summary["total"] == 6
+    assert [r["id"] for r in rows] == [f"c{i}" for i in range(6)]
+    assert [r.get("coalesced_from") for r in rows] == [None, "c0", None, "c0", "c2", None]
+    assert summary["total_cost_usd"] == pytest.approx(0.003, abs=1e-12)
+    assert summary["total_input_tokens"] == 30
+
+
+def test_concurrency_runs_calls_in_parallel(run_report, write_dataset, tmp_path):
+    dataset = write_dataset(tmp_path / "distinct.jsonl", [str(i) for i in range(8)])
+    model, summary, _ = _run(run_report, dataset, concurrency=4)
+    assert model.calls == 8
+    assert model.max_in_flight > 1
+    assert summary["coalesced_calls_saved"] == 0
+
+
+def test_coalescing_can_be_disabled(run_report, write_dataset, tmp_path):
+    dataset = write_dataset(tmp_path / "dups.jsonl", ["a", "a", "a"])
+    model, summary, rows = _run(run_report, dataset, coalesce=False)
+    assert model.calls == 3
+    assert summary["coalesced_calls_saved"] == 0
+    assert all("coalesced_from" not in r for r in rows)
+
+
+def test_finished_calls_are_not_kept_past_the_cache():
+    model = CountingModel()
+    scheduler = RequestScheduler(model, "p", concurrency=3, coalesce_cache=2)
+    texts = [str(i) for i in range(20)] + ["18", "0"]
+    cases = [DatasetCase(f"c{i}", {"text": t}, {}, {}) for i, t in enumerate(texts)]
+    coalesced = []
+    for d in scheduler.run(cases):
+        assert len(scheduler._flights) <= 3
+        assert len(scheduler._finished) <= 2
+        coalesced.append(d.coalesced_from)
+    assert not scheduler._flights and not scheduler._finished
+    # "18" was still cached; "0" had been evicted, so it made a new call.
+    assert coalesced[-2:] == ["c18", None]
+    assert model.calls == 21
+
+
+@pytest.mark.parametrize("value", ["0", "-2"])
+def test_cli_rejects_non_positive_concurrency(monkeypatch, capsys, value):
+    argv = ["eval-harness", "run", "--dataset", "d", "--prompt", "p", "--schema", "s"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--concurrency", value])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "--concurrency" in capsys.readouterr().err
@@ -0,0 +1,158 @@
+import io
+import json
+
+import pytest
+
+from eval_harness.core import jsonio
+from eval_harness.core.result_store import ResultStore
+from eval_harness.core.runner import run_eval
+
+
+def _row(i, **tail):
+    row = {
+        "id": f"case-{i:03d}",
+        "schema_valid": i % 4 != 0,
+        "schema_errors": [] if i % 4 else ["'title' is a required property", "extra"],
+        "exact_match": i % 3 == 0,
+        "f1": i / 7,
+        "latency_ms": 40 + i,
+        "usage": {
+            "input_tokens": 300 + i,
+            "input_tokens_details": {"cached_tokens": 128},
+            "output_tokens": 60,
+            "total_tokens": 360 + i,
+        },
+        "cost_usd": 1.5e-05 * i,
+        "output_fingerprint": f"{i:032x}",
+    }
+    row.update(tail)
+    return row
+
+
+ROWS = [
+    _row(0),
+    _row(1, usage=None, cost_usd=None),
+    _row(2, usage={"mock_tokens": 7}, coalesced_from="case-001"),
+    _row(3, usage={"input_tokens": 10, "output_tokens": 2, "estimated": True}),
+    _row(4, ttft_ms=120, output_tokens_per_s=55.5, endpoint="eastus"),
+    _row(5, stream_aborted="'tasks' is not an array", tokens_saved=40),
+    _row(
+        6,
+        samples={
+            "n": 3,
+            "pass_at_1": 1 / 3,
+            "pass_at_k": 1.0,
+            "f1_mean": 0.5,
+            "f1_variance": 0.25,
+            "agreement": 2 / 3,
+            "schema_valid_rate": 1.0,
+        },
+    ),
+    _row(7, field_scores={"title": {"precision": 0.5, "recall": 1.0}}),
+    # Irregular rows: kept as they are.
+    _row(8, usage={"per_call": [1, 2]}),
+    _row(9, f1=1),
+    {"id": "odd", "f1": 0.0, "latency_ms": 1, "schema_valid": True, "exact_match": False},
+    _row(10, output_fingerprint="not-a-hash"),
+    _row(11, latency_ms=-0, f1=-0.0, usage={"big": 2**60}),
+]
+
+
+def _store(rows=ROWS):
+    store = ResultStore()
+    store.extend(rows)
+    return store
+
+
+def test_rows_round_trip_with_key_order_and_types():
+    store = _store()
+    assert len(store) == len(ROWS)
+    for got, want in zip(store, ROWS):
+        assert json.dumps(got) == json.dumps(want)
+    assert store[6] == ROWS[6]
+    assert set(store._irregular) == {8, 9, 10, 11, 12}
+
+
+def test_columns_feed_the_summary():
+    store = _store()
+    assert store.schema_valid_count == sum(1 for r in ROWS if r["schema_valid"])
+    assert store.exact_match_count == sum(1 for r in ROWS if r["exact_match"])
+    assert sum(store.f1) == sum(r["f1"] for r in ROWS)
+    assert sum(store.latency_ms) == sum(r["latency_ms"] for r in ROWS)
+    assert list(store.costs()) == [r.get("cost_usd") for r in ROWS]
+    assert list(store.usages()) == [r.get("usage") for r in ROWS]
+    assert list(store.values("tokens_saved")) == [(5, 40)]
+    assert [i for i, _ in store.values("coalesced_from")] == [2]
+    assert dict(store.values("samples"))[6]["n"] == 3
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        _row(0, f1=None),
+        _row(0, latency_ms=None, cost_usd="n/a"),
+        _row(0, id="case-\ud800"),
+        {"id": "partial"},
+    ],
+)
+def test_irregular_rows_get_placeholder_columns(row):
+    store = _store([_row(1), row])
+    assert list(store) == [_row(1), row]
+    assert 1 in store._irregular
+    f1, latency = row.get("f1"), row.get("latency_ms")
+    assert store.f1[1] == (f1 if isinstance(f1, float) else 0.0)
+    assert store.latency_ms[1] == (latency if isinstance(latency, int) else 0.0)
+    cost = row.get("cost_usd")
+    assert list(store.costs())[1] == (cost if isinstance(cost, float) else None)
+
+
+def test_schema_errors_are_interned():
+    store = _store([_row(0), _row(4), _row(8)])
+    assert [r["schema_errors"] for r in store] == [["'title' is a required property", "extra"]] * 3
+    assert len(store._strings) == 2
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+@pytest.mark.parametrize("count", [0, 1, 5, len(ROWS)])
+def test_streamed_report_is_byte_identical(monkeypatch, backend, count):
+    try:
+        monkeypatch.setattr(jsonio, "_backend", jsonio.get_backend(backend))
+    except ValueError:
+        pytest.skip("orjson not installed")
+    head = {"meta": {"run_id": "run-x"}, "summary": {"avg_f1": 0.1, "tags": []}}
+    out = io.StringIO()
+    jsonio.write_pretty(out, head, "results", _store(ROWS[:count]), batch=2)
+    assert out.getvalue() == json.dumps(
+        {**head, "results": ROWS[:count]}, indent=2, ensure_ascii=False
+    )
+
+
+def test_write_pretty_rejects_key_in_obj():
+    with pytest.raises(ValueError, match="must not be in obj"):
+        jsonio.write_pretty(io.StringIO(), {"results": []}, "results", [])
+
+
+def test_run_report_matches_the_scored_rows(tmp_path):
+    rows = []
+    report_path, summary = run_eval(
+        dataset_path="datasets/sample_tasks.jsonl",
+        prompt_path="prompts/task_extraction/v1.md",
+        schema_path="schemas/task_extraction.schema.json",
+        out_dir=str(tmp_path),
+        scorer="task_f1",
+        on_result=rows.append,
+    )
+    with open(report_path, encoding="utf-8") as f:
+        text = f.read()
+    report = json.loads(text)
+    assert text == json.dumps(
+        {"meta": report["meta"], "summary": summary, "results": rows},
+        indent=2,
+        ensure_ascii=False,
+    )
+    assert summary["avg_f1"] == sum(r["f1"] for r in rows) / len(rows)
+    field_scores = summary.get("field_scores")
+    assert field_scores is not None
+    assert field_scores["title"]["recall"] == pytest.approx(
+        sum(r["field_scores"]["title"]["recall"] for r in rows) / len(rows)
+    )
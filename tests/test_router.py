@@ -0,0 +1,260 @@
+import json
+import threading
+import time
+
+import pytest
+
+from eval_harness.adapters.base import CANCEL_EVENT, ModelResult
+from eval_harness.adapters.pricing import ModelPricing
+from eval_harness.adapters.router import Endpoint, RouterAdapter, from_env, load_router
+from eval_harness.core import runner
+from eval_harness.core.budget import CostBudget
+from eval_harness.core.runner import run_eval
+
+
+class FakeEndpoint:
+    """Answers after delay_s (longer for inputs containing "slow"); may fail."""
+
+    name = "fake"
+
+    def __init__(self, delay_s=0.0, slow_s=0.0, fail=False, cost_usd=None):
+        self.delay_s = delay_s
+        self.slow_s = slow_s
+        self.fail = fail
+        self.cost_usd = cost_usd
+        self.calls = 0
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def generate_structured(self, *, prompt, input_obj):
+        with self._lock:
+            self.calls += 1
+        if self.fail:
+            raise RuntimeError("endpoint down")
+        delay = self.slow_s if "slow" in input_obj["text"] else self.delay_s
+        cancel = CANCEL_EVENT.get()
+        deadline = time.monotonic() + delay
+        while time.monotonic() < deadline:
+            # Like a streaming adapter checking between chunks.
+            if cancel is not None and cancel.is_set():
+                self.cancelled.set()
+                break
+            time.sleep(0.002)
+        return ModelResult(
+            output={"tasks": []},
+            raw_text=None,
+            latency_ms=int(delay * 1000),
+            cost_usd=self.cost_usd,
+        )
+
+
+def _call(router, text="x"):
+    return router.generate_structured(prompt="p", input_obj={"text": text})
+
+
+def test_weighted_spread_without_hedging():
+    a, b = FakeEndpoint(), FakeEndpoint()
+    router = RouterAdapter(
+        [Endpoint("a", a, weight=3), Endpoint("b", b, weight=1)], hedge_percentile=None, seed=1
+    )
+    served = [_call(router).endpoint for _ in range(400)]
+    share_a = served.count("a") / len(served)
+    assert 0.65 < share_a < 0.85
+    report = router.routing_report()
+    assert report["endpoints"]["a"]["wins"] == served.count("a")
+    assert report["hedges"] == 0
+
+
+def test_failing_endpoint_fails_over_and_loses_traffic():
+    good, bad = FakeEndpoint(), FakeEndpoint(fail=True)
+    router = RouterAdapter(
+        [Endpoint("good", good), Endpoint("bad", bad)], hedge_percentile=None, seed=2
+    )
+    results = [_call(router) for _ in range(200)]
+    assert all(r.endpoint == "good" for r in results)
+
+    report = router.routing_report()["endpoints"]
+    assert report["bad"]["errors"] == bad.calls > 0
+    # Error health steers new calls away; only occasional probes still reach it.
+    assert bad.calls < 40
+
+
+def test_all_endpoints_failing_raises():
+    router = RouterAdapter(
+        [Endpoint("a", FakeEndpoint(fail=True)), Endpoint("b", FakeEndpoint(fail=True))],
+        hedge_percentile=None,
+    )
+    with pytest.raises(RuntimeError, match="endpoint down"):
+        _call(router)
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+    slow, fast = FakeEndpoint(delay_s=0.005, slow_s=2.0), FakeEndpoint(delay_s=0.005)
+    router = RouterAdapter(
+        [Endpoint("slow", slow, weight=1000), Endpoint("fast", fast, weight=1)],
+        hedge_percentile=0.9,
+        hedge_min_samples=10,
+        seed=3,
+    )
+    for _ in range(10):
+        _call(router)
+    deadline_ms = router.hedge_deadline_ms()
+    assert deadline_ms is not None and deadline_ms < 100
+
+    t0 = time.perf_counter()
+    result = _call(router, "slow request")
+    assert time.perf_counter() - t0 < 0.5
+    assert result.endpoint == "fast"
+    assert slow.cancelled.wait(1.0)
+
+    report = router.routing_report()
+    assert report["hedges"] == 1 and report["hedge_wins"] == 1
+    assert report["hedge_win_rate"] == 1.0
+    assert report["endpoints"]["fast"]["hedges"] == 1
+    assert report["endpoints"]["slow"]["cancelled"] == 1
+    router.close()
+
+
+def _hedging_router(slow_s, cost_usd=None):
+    slow = FakeEndpoint(delay_s=0.005, slow_s=slow_s, cost_usd=cost_usd)
+    fast = FakeEndpoint(delay_s=0.005, cost_usd=cost_usd)
+    router = RouterAdapter(
+        [Endpoint("slow", slow, weight=1000), Endpoint("fast", fast, weight=1)],
+        hedge_percentile=0.9,
+        hedge_min_samples=10,
+        seed=3,
+    )
+    for _ in range(10):
+        _call(router)
+    return router, slow
+
+
+def _settled(router):
+    deadline = time.monotonic() + 2.0
+    while router.routing_report()["hedge_losers_pending"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return router.routing_report()
+
+
+def test_hedged_winner_reports_whole_call_latency_and_loser_is_billed():
+    router, _ = _hedging_router(slow_s=2.0, cost_usd=0.01)
+    deadline_ms = router.hedge_deadline_ms()
+    assert deadline_ms is not None
+    budget = CostBudget(1.0, ModelPricing(0.0, 0.0, 10.0))
+    router.use_budget(budget)
+
+    result = _call(router, "slow request")
+    assert result.endpoint == "fast"
+    # Timed from the call, not from the hedge that answered right away.
+    assert result.latency_ms >= int(deadline_ms)
+    assert result.cost_usd == 0.01
+
+    report = _settled(router)
+    assert report["hedge_losers_pending"] == 0
+    assert report["hedge_loser_cost_usd"] == pytest.approx(0.01)
+    # The hedge's reservation was settled with the loser's cost.
+    assert budget.reserved_usd == 0.0
+    assert budget.spent_usd == pytest.approx(0.01)
+    router.close()
+
+
+def test_hedge_is_not_sent_without_budget_room():
+    router, _ = _hedging_router(slow_s=0.1, cost_usd=0.01)
+    budget = CostBudget(0.001, ModelPricing(0.0, 0.0, 10.0))
+    router.use_budget(budget)
+
+    result = _call(router, "slow request")
+    assert result.endpoint == "slow"
+    assert result.latency_ms >= 100
+    report = router.routing_report()
+    assert report["hedges"] == 0 and report["hedges_skipped"] == 1
+    assert not budget.exhausted and budget.reserved_usd == 0.0
+    router.close()
+
+
+def test_hedge_deadline_follows_the_window():
+    fast = FakeEndpoint(delay_s=0.0)
+    router = RouterAdapter(
+        [Endpoint("a", fast), Endpoint("b", fast)], hedge_min_samples=5, window=8, seed=1
+    )
+    for _ in range(8):
+        _call(router)
+    early = router.hedge_deadline_ms()
+    assert early is not None and early < 20
+    fast.delay_s = 0.05
+    for _ in range(8):
+        _call(router)
+    # Only the slow calls are left in the window.
+    late = router.hedge_deadline_ms()
+    assert late is not None and late >= 40
+    assert router._recent_latency.count == 8
+    router.close()
+
+
+def test_invalid_router_config():
+    with pytest.raises(ValueError, match="at least one endpoint"):
+        RouterAdapter([])
+    with pytest.raises(ValueError, match="weights must be > 0"):
+        RouterAdapter([Endpoint("a", FakeEndpoint(), weight=0)])
+
+
+def test_report_has_routing_and_endpoints(tmp_path, monkeypatch):
+    config = tmp_path / "router.json"
+    config.write_text(
+        json.dumps(
+            {
+                "endpoints": [
+                    {"name": "primary", "adapter": "mock", "weight": 2},
+                    {"name": "secondary", "adapter": "mock"},
+                ],
+                "hedge_min_samples": 5,
+            }
+        ),
+        encoding="utf-8",
+    )
+    router = load_router(config)
+    assert router.hedge_min_samples == 5
+
+    monkeypatch.setenv("EVAL_HARNESS_ROUTER", str(config))
+    router = from_env()
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: router)
+    report_path, summary = run_eval(
+        dataset_path="datasets/sample_tasks.jsonl",
+        prompt_path="prompts/task_extraction/v1.md",
+        schema_path="schemas/task_extraction.schema.json",
+        out_dir=str(tmp_path),
+        adapter_name="router",
+        concurrency=4,
+    )
+    routing = summary.get("routing")
+    assert routing is not None
+    assert set(routing["endpoints"]) == {"primary", "secondary"}
+    assert sum(ep["wins"] for ep in routing["endpoints"].values()) == (
+        summary["total"] - summary["coalesced_calls_saved"]
+    )
+    rows = json.loads(open(report_path, encoding="utf-8").read())["results"]
+    assert {r["endpoint"] for r in rows if "coalesced_from" not in r} <= {"primary", "secondary"}
+
+
+def test_summary_cost_includes_hedge_losers(tmp_path, monkeypatch):
+    router, _ = _hedging_router(slow_s=2.0, cost_usd=0.01)
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: router)
+    dataset = tmp_path / "slow.jsonl"
+    dataset.write_text('{"id": "a", "input": {"text": "slow request"}}\n', encoding="utf-8")
+
+    def wait_for_loser(row):
+        # Let the cancelled loser finish before the summary is made.
+        _settled(router)
+
+    _, summary = run_eval(
+        dataset_path=str(dataset),
+        prompt_path="prompts/task_extraction/v1.md",
+        schema_path="schemas/task_extraction.schema.json",
+        out_dir=str(tmp_path),
+        adapter_name="router",
+        on_result=wait_for_loser,
+    )
+    routing = summary.get("routing")
+    assert routing is not None and routing["hedge_loser_cost_usd"] == pytest.approx(0.01)
+    assert summary["total_cost_usd"] == pytest.approx(0.02)
+    router.close()
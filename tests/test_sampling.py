@@ -0,0 +1,165 @@
+import sys
+import threading
+import time
+from statistics import mean, variance
+
+import pytest
+
+from eval_harness.adapters.base import ModelResult
+from eval_harness.adapters.mock import MockModel
+from eval_harness.cli import main
+from eval_harness.core.sampling import SampleStats, pass_at_k
+
+
+class FlakyModel:
+    """Mock output on even calls per case, no tasks on odd ones; counts calls."""
+
+    name = "flaky"
+
+    def __init__(self, delay_s=0.0):
+        self.delay_s = delay_s
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._per_case = {}
+        self._mock = MockModel()
+
+    def generate_structured(self, *, prompt, input_obj):
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            nth = self._per_case[input_obj["text"]] = self._per_case.get(input_obj["text"], -1) + 1
+        time.sleep(self.delay_s)
+        try:
+            if nth % 2:
+                return ModelResult(output={"tasks": []}, raw_text=None, latency_ms=1, cost_usd=0.5)
+            result = self._mock.generate_structured(prompt=prompt, input_obj=input_obj)
+            return ModelResult(result.output, None, 1, cost_usd=0.5)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class NativeModel(FlakyModel):
+    def __init__(self):
+        super().__init__()
+        self.batched = []
+
+    def generate_samples(self, *, prompt, input_obj, n):
+        self.batched.append(n)
+        return [self.generate_structured(prompt=prompt, input_obj=input_obj) for _ in range(n)]
+
+
+def test_pass_at_k_estimator():
+    assert pass_at_k(5, 0, 1) == 0.0
+    assert pass_at_k(5, 5, 1) == 1.0
+    assert pass_at_k(4, 1, 1) == pytest.approx(0.25)
+    assert pass_at_k(4, 1, 4) == 1.0
+    # 1 - C(3,2)/C(4,2)
+    assert pass_at_k(4, 1, 2) == pytest.approx(0.5)
+
+
+def test_sample_stats_matches_batch_statistics():
+    f1s = [0.2, 0.9, 0.4, 0.4, 1.0]
+    stats = SampleStats()
+    for f1 in f1s:
+        stats.add(f1=f1, exact_match=f1 == 1.0, schema_valid=True, fingerprint=str(f1))
+    report = stats.report()
+    assert report["n"] == 5
+    assert report["f1_mean"] == pytest.approx(mean(f1s))
+    assert report["f1_variance"] == pytest.approx(variance(f1s))
+    assert report["agreement"] == pytest.approx(2 / 5)
+    assert report["pass_at_1"] == pytest.approx(1 / 5)
+    assert report["pass_at_k"] == 1.0
+
+
+def test_fan_out_runs_k_calls_in_parallel(run_report):
+    model = FlakyModel(delay_s=0.01)
+    report, summary = run_report(adapter=model, adapter_name="flaky", samples=4, concurrency=4)
+
+    cases = summary["total"]
+    # Identical requests are still coalesced, so count distinct case texts.
+    assert model.calls == 4 * (cases - summary["coalesced_calls_saved"])
+    assert model.max_in_flight > 1
+    assert report["meta"]["samples"] == 4
+    row = report["results"][0]
+    assert row["samples"]["n"] == 4
+    assert row["samples"]["agreement"] == 0.5
+    assert row["cost_usd"] == 2.0
+    assert summary.get("samples_per_case") == 4
+    assert summary.get("pass_at_k", 0) >= summary.get("pass_at_1", 1)
+    # Cases where the mock also finds no tasks agree on every sample.
+    assert 0.5 <= summary.get("avg_agreement", 0) < 1.0
+
+
+def test_native_n_is_one_request_per_case(run_report):
+    model = NativeModel()
+    _, summary = run_report(adapter=model, adapter_name="native", samples=3, coalesce=False)
+    assert model.batched == [3] * summary["total"]
+
+
+def test_single_sample_report_is_unchanged(run_report):
+    report, summary = run_report()
+    assert "samples" not in report["meta"]
+    assert "pass_at_k" not in summary
+    assert all("samples" not in r for r in report["results"])
+
+
+def test_deterministic_mock_agrees_with_itself(run_report):
+    report, summary = run_report(samples=3)
+    assert summary.get("avg_agreement") == 1.0
+    assert summary.get("avg_f1_variance") == 0.0
+    assert summary.get("pass_at_1") == summary["exact_match_rate"]
+
+
+def test_samples_scored_in_workers_match_in_process(run_report):
+    inline, _ = run_report(samples=3, adapter=FlakyModel(), adapter_name="flaky")
+    pooled, _ = run_report(samples=3, adapter=FlakyModel(), adapter_name="flaky", score_workers=1)
+    assert [r["samples"] for r in pooled["results"]] == [r["samples"] for r in inline["results"]]
+
+
+def test_mock_samples_are_distinct_objects():
+    samples = MockModel().generate_samples(
+        prompt="p", input_obj={"text": "Marc will send the email by 2025-03-01."}, n=3
+    )
+    assert len({id(s) for s in samples}) == 3
+    assert all(s == samples[0] for s in samples)
+    samples[1].output["tasks"].clear()
+    assert samples[0].output["tasks"] and samples[2].output["tasks"]
+
+
+def test_samples_must_be_positive(run_report):
+    with pytest.raises(ValueError, match="samples must be >= 1"):
+        run_report(samples=0)
+
+
+def test_cli_samples_flag(monkeypatch, tmp_path, capsys):
+    argv = [
+        "eval-harness",
+        "run",
+        "--dataset",
+        "datasets/sample_tasks.jsonl",
+        "--prompt",
+        "prompts/task_extraction/v1.md",
+        "--schema",
+        "schemas/task_extraction.schema.json",
+        "--out",
+        str(tmp_path),
+        "--samples",
+        "2",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+    assert "Samples: k=2, pass@1=" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("value", ["0", "-3"])
+def test_cli_rejects_non_positive_samples(monkeypatch, capsys, value):
+    argv = ["eval-harness", "run", "--dataset", "d", "--prompt", "p", "--schema", "s"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--samples", value])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "--samples" in capsys.readouterr().err
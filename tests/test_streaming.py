@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+
+import pytest
+
+from eval_harness.adapters.mock import MockModel
+from eval_harness.adapters.openai_v1 import OpenAIV1Model, from_openai_env
+from eval_harness.adapters.stub_server import StubConfig, make_stub_server
+from eval_harness.core import runner
+from eval_harness.core.partial_json import PartialJsonCheck
+from eval_harness.core.runner import run_eval
+
+
+@pytest.fixture
+def stub(request):
+    config = getattr(request, "param", StubConfig())
+    server = make_stub_server(config=config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _feed_chars(text, check=None):
+    check = check or PartialJsonCheck()
+    for ch in text:
+        if check.feed(ch) is not None:
+            break
+    return check
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"tasks": []}',
+        '{"note": "a \\"tasks\\" }{ value", "meta": {"tasks": 1}, "tasks": [{"title": "x"}]}',
+        '  {\n  "tasks" :\n [',
+    ],
+)
+def test_partial_check_accepts_valid_shapes(text):
+    check = _feed_chars(text)
+    assert check.violation is None
+    assert check.satisfied
+
+
+@pytest.mark.parametrize(
+    ("text", "reason", "consumed"),
+    [
+        ("Sure! Here is the JSON", "not an object", "S"),
+        ('[{"tasks": []}]', "not an object", "["),
+        ('{"tasks": {"title": "x"}}', "'tasks' is not an array", '{"tasks": {'),
+        ('{"items": [1, 2], "meta": {"tasks": []}}', "no 'tasks' array", None),
+    ],
+)
+def test_partial_check_rejects_as_soon_as_possible(text, reason, consumed):
+    check = PartialJsonCheck()
+    seen = ""
+    for ch in text:
+        seen += ch
+        if check.feed(ch) is not None:
+            break
+    assert reason in check.violation
+    assert seen == (consumed if consumed is not None else text)
+
+
+def test_partial_check_across_arbitrary_deltas():
+    text = json.dumps({"summary": "x" * 50, "tasks": [{"title": "t"}]})
+    for size in (1, 3, 7, len(text)):
+        check = PartialJsonCheck()
+        for i in range(0, len(text), size):
+            check.feed(text[i : i + size])
+        assert check.satisfied and check.violation is None
+
+
+def _adapter(server, **kwargs):
+    return OpenAIV1Model(api_key="test", model="gpt-4o-mini", base_url=server.base_url, **kwargs)
+
+
+def test_streaming_records_ttft_and_rate(stub):
+    text = "Marc will prepare the release notes by 2025-03-01."
+    result = _adapter(stub, stream=True).generate_structured(
+        prompt="Extract tasks.", input_obj={"text": text}
+    )
+    expected = MockModel().generate_structured(prompt="Extract tasks.", input_obj={"text": text})
+    assert result.output == expected.output
+    assert result.ttft_ms is not None and result.ttft_ms <= result.latency_ms
+    assert result.output_tokens_per_s is None or result.output_tokens_per_s > 0
+    assert result.stream_aborted is None
+    assert result.usage is not None and result.usage["output_tokens"] > 0
+
+
+@pytest.mark.parametrize("stub", [StubConfig(latency="30", token_latency_ms=2)], indirect=True)
+def test_ttft_is_before_the_last_token(stub):
+    result = _adapter(stub, stream=True).generate_structured(
+        prompt="p", input_obj={"text": "Marc will send the email by 2025-03-01."}
+    )
+    assert result.ttft_ms is not None
+    assert result.ttft_ms >= 30
+    assert result.latency_ms - result.ttft_ms >= 10
+
+
+@pytest.mark.parametrize("stub", [StubConfig(prose_rate=1.0, token_latency_ms=5)], indirect=True)
+def test_abort_stops_the_stream_and_reports_savings(stub):
+    adapter = _adapter(stub, abort_invalid=True)
+    # A completed stream first, so the adapter knows a typical output length.
+    adapter._record_output_tokens(40)
+
+    t0 = time.perf_counter()
+    result = adapter.generate_structured(prompt="p", input_obj={"text": "Send the email"})
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    assert result.output["_parse_error"] is True
+    assert result.stream_aborted == "top-level value is not an object"
+    assert result.raw_text == "Sure"
+    assert result.usage is not None
+    assert result.usage["estimated"] is True and result.usage["output_tokens"] == 1
+    assert result.tokens_saved == 39
+    # The whole output would take well over 100 ms at 5 ms per delta.
+    assert elapsed_ms < 100
+
+    deadline = time.monotonic() + 2
+    while stub.state.counts["stream_aborted"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stub.state.counts["output_tokens_unsent"] > 0
+
+
+@pytest.mark.parametrize("stub", [StubConfig(prose_rate=1.0)], indirect=True)
+def test_stream_without_abort_reads_everything(stub):
+    result = _adapter(stub, stream=True).generate_structured(
+        prompt="p", input_obj={"text": "Send the email"}
+    )
+    assert result.output["_parse_error"] is True
+    assert result.stream_aborted is None
+    assert result.raw_text is not None
+    assert result.raw_text.startswith("Sure! Here are the tasks")
+
+
+def test_stream_mode_from_env(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o-mini")
+    monkeypatch.setenv("EVAL_HARNESS_STREAM", "abort")
+    model = from_openai_env()
+    assert model.stream and model.abort_invalid
+
+    monkeypatch.setenv("EVAL_HARNESS_STREAM", "sometimes")
+    with pytest.raises(ValueError, match="Invalid EVAL_HARNESS_STREAM"):
+        from_openai_env()
+
+
+@pytest.mark.parametrize("stub", [StubConfig(prose_rate=0.5, seed=3)], indirect=True)
+def test_report_has_stream_fields(stub, tmp_path, monkeypatch):
+    adapter = _adapter(stub, abort_invalid=True)
+    monkeypatch.setattr(runner, "_build_adapter", lambda name: adapter)
+    report_path, summary = run_eval(
+        dataset_path="datasets/sample_tasks.jsonl",
+        prompt_path="prompts/task_extraction/v1.md",
+        schema_path="schemas/task_extraction.schema.json",
+        out_dir=str(tmp_path),
+    )
+    rows = json.loads(open(report_path, encoding="utf-8").read())["results"]
+
+    aborted = [r for r in rows if "stream_aborted" in r]
+    assert 0 < summary.get("stream_aborted_count", 0) == len(aborted) < len(rows)
+    assert summary.get("stream_tokens_saved") == sum(r.get("tokens_saved", 0) for r in aborted)
+    assert summary.get("avg_ttft_ms", -1) >= 0
+    assert all("ttft_ms" in r for r in rows if "coalesced_from" not in r)
+    assert all(not r["schema_valid"] for r in aborted)
@@ -0,0 +1,84 @@
+import random
+import threading
+
+import pytest
+
+from eval_harness.adapters.mock import MockModel
+from eval_harness.adapters.openai_v1 import OpenAIV1Model
+from eval_harness.adapters.stub_server import StubConfig, make_stub_server, parse_latency
+
+
+@pytest.fixture
+def stub(request):
+    config = getattr(request, "param", StubConfig())
+    server = make_stub_server(config=config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _adapter(server, **kwargs):
+    model = OpenAIV1Model(api_key="test", model="gpt-4o-mini", base_url=server.base_url)
+    model.client = model.client.with_options(**kwargs) if kwargs else model.client
+    return model
+
+
+def test_adapter_round_trip_matches_mock(stub):
+    text = "Marc will prepare the release notes by 2025-03-01."
+    result = _adapter(stub).generate_structured(prompt="Extract tasks.", input_obj={"text": text})
+
+    expected = MockModel().generate_structured(prompt="Extract tasks.", input_obj={"text": text})
+    assert result.output == expected.output
+    assert result.usage is not None
+    assert result.usage["input_tokens"] > 0
+    assert result.usage["output_tokens"] > 0
+    assert result.cost_usd is not None and result.cost_usd > 0
+
+
+def test_long_instructions_are_reported_as_cached_on_repeat(stub):
+    adapter = _adapter(stub)
+    prompt = "Extract tasks. " * 400  # > 1024 estimated tokens
+    first = adapter.generate_structured(prompt=prompt, input_obj={"text": "Send the email"})
+    second = adapter.generate_structured(prompt=prompt, input_obj={"text": "Book the room"})
+    assert first.usage is not None and second.usage is not None
+    assert first.usage["input_tokens_details"]["cached_tokens"] == 0
+    assert second.usage["input_tokens_details"]["cached_tokens"] > 1024
+
+
+@pytest.mark.parametrize("stub", [StubConfig(malformed_rate=1.0)], indirect=True)
+def test_malformed_output_surfaces_as_parse_error(stub):
+    result = _adapter(stub).generate_structured(prompt="p", input_obj={"text": "Send the email"})
+    assert result.output["_parse_error"] is True
+
+
+@pytest.mark.parametrize(
+    "stub", [StubConfig(rate_limit_rate=0.5, retry_after_ms=1, seed=7)], indirect=True
+)
+def test_rate_limits_are_retried_by_the_sdk(stub):
+    adapter = _adapter(stub, max_retries=10)
+    for i in range(10):
+        result = adapter.generate_structured(prompt="p", input_obj={"text": f"Send email {i}"})
+        assert "tasks" in result.output
+    counts = stub.state.counts
+    assert counts["ok"] == 10
+    assert counts["rate_limited"] > 0
+    assert counts["requests"] == counts["ok"] + counts["rate_limited"]
+
+
+@pytest.mark.parametrize("stub", [StubConfig(error_rate=1.0)], indirect=True)
+def test_server_errors_raise_after_retries(stub):
+    import openai
+
+    with pytest.raises(openai.InternalServerError):
+        _adapter(stub, max_retries=0).generate_structured(prompt="p", input_obj={"text": "x"})
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert parse_latency("25")(rng) == 25.0
+    assert all(20 <= parse_latency("uniform:20,80")(rng) <= 80 for _ in range(50))
+    draws = sorted(parse_latency("lognormal:50,0.5")(rng) for _ in range(2001))
+    assert 40 < draws[1000] < 60
+    with pytest.raises(ValueError, match="Invalid latency spec"):
+        parse_latency("gamma:1,2")
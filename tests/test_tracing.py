@@ -0,0 +1,130 @@
+import dataclasses
+import json
+import threading
+from collections import Counter
+
+from eval_harness.adapters.mock import MockModel
+from eval_harness.adapters.pricing import ModelPricing
+from eval_harness.adapters.stub_server import make_stub_server
+from eval_harness.core import tracing
+from eval_harness.core.tracing import (
+    STATUS_ERROR,
+    InMemoryExporter,
+    OtlpJsonFileExporter,
+    Tracer,
+)
+
+
+class PricedMockModel(MockModel):
+    # Projects 512 output tokens ($0.00512) per call; each call costs $0.005.
+    pricing = ModelPricing(input_per_1m=0.0, cached_input_per_1m=0.0, output_per_1m=10.0)
+
+    def generate_structured(self, *, prompt, input_obj):
+        result = super().generate_structured(prompt=prompt, input_obj=input_obj)
+        return dataclasses.replace(result, cost_usd=0.005)
+
+
+def test_one_span_per_case_with_children(run_report):
+    exporter = InMemoryExporter()
+    _, summary = run_report(tracer=Tracer(exporter, batch_size=7), concurrency=3)
+    spans = exporter.spans
+
+    names = Counter(s.name for s in spans)
+    total = summary["total"]
+    assert names == {
+        "eval.run": 1,
+        "eval.case": total,
+        "adapter": total,
+        "validate": total,
+        "score": total,
+    }
+    assert len({s.trace_id for s in spans}) == 1
+
+    (run,) = [s for s in spans if s.name == "eval.run"]
+    cases = {s.span_id: s for s in spans if s.name == "eval.case"}
+    assert all(c.parent_span_id == run.span_id for c in cases.values())
+    for s in spans:
+        if s.name in ("adapter", "validate", "score"):
+            assert s.parent_span_id is not None
+            case = cases[s.parent_span_id]
+            assert case.start_ns <= s.start_ns <= s.end_ns <= case.end_ns
+    assert all(s.end_ns >= s.start_ns > 0 for s in spans)
+
+    case = next(iter(cases.values()))
+    assert case.attributes["eval.case_id"].startswith("case-")
+    assert isinstance(case.attributes["eval.schema_valid"], bool)
+    assert run.attributes["eval.total"] == total
+
+
+def test_coalesced_case_has_no_adapter_span(tmp_path, run_report, write_dataset):
+    dataset = write_dataset(tmp_path / "dups.jsonl", ["Send the email"] * 3)
+    exporter = InMemoryExporter()
+    run_report(tracer=Tracer(exporter), dataset_path=str(dataset))
+
+    names = Counter(s.name for s in exporter.spans)
+    assert names["eval.case"] == 3
+    assert names["adapter"] == 1
+    coalesced = [s for s in exporter.spans if "eval.coalesced_from" in s.attributes]
+    assert [s.attributes["eval.coalesced_from"] for s in coalesced] == ["c0", "c0"]
+
+
+def test_budget_halted_run_ends_every_case_span(run_report):
+    exporter = InMemoryExporter()
+    _, summary = run_report(adapter=PricedMockModel(), tracer=Tracer(exporter), max_cost_usd=0.012)
+
+    assert summary["total"] == 2
+    assert summary.get("budget_exhausted") is True
+    cases = [s for s in exporter.spans if s.name == "eval.case"]
+    assert len(cases) == 3
+    assert all(s.end_ns >= s.start_ns > 0 for s in cases)
+    (refused,) = [s for s in cases if s.status_code == STATUS_ERROR]
+    assert refused.attributes["eval.skipped"] is True
+    assert refused.attributes["eval.case_id"] == "case-003"
+
+
+def test_openai_adapter_nests_compose_request_parse(run_report):
+    from eval_harness.adapters.openai_v1 import OpenAIV1Model
+
+    stub = make_stub_server()
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    try:
+        model = OpenAIV1Model(api_key="test", model="gpt-4o-mini", base_url=stub.base_url)
+        exporter = InMemoryExporter()
+        run_report(adapter=model, tracer=Tracer(exporter), only_ids=["case-001"])
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+    by_name = {s.name: s for s in exporter.spans}
+    adapter = by_name["adapter"]
+    for child in ("compose", "responses.create", "parse"):
+        assert by_name[child].parent_span_id == adapter.span_id
+    assert adapter.attributes["gen_ai.request.model"] == "gpt-4o-mini"
+    assert adapter.attributes["gen_ai.usage.input_tokens"] > 0
+
+
+def test_otlp_json_file_export(tmp_path, run_report):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(OtlpJsonFileExporter(path), batch_size=4)
+    _, summary = run_report(tracer=tracer)
+    tracer.shutdown()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) > 1  # flushed in batches
+    spans = []
+    for line in lines:
+        (resource,) = json.loads(line)["resourceSpans"]
+        assert resource["resource"]["attributes"][0] == {
+            "key": "service.name",
+            "value": {"stringValue": "eval-harness"},
+        }
+        spans.extend(resource["scopeSpans"][0]["spans"])
+    assert len(spans) == 1 + 4 * summary["total"]
+    case = next(s for s in spans if s["name"] == "eval.case")
+    assert len(case["traceId"]) == 32 and len(case["spanId"]) == 16
+    assert int(case["endTimeUnixNano"]) >= int(case["startTimeUnixNano"])
+
+
+def test_module_span_is_noop_without_tracer():
+    with tracing.span("compose") as span:
+        span.set_attribute("x", 1)
@@ -0,0 +1,111 @@
+import enum
+from collections import OrderedDict, UserDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from eval_harness.adapters.usage import normalize_usage
+
+
+def _reference(value: Any) -> Any:
+    """The original isinstance-chain implementation, kept as the parity oracle."""
+    if value is None:
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Mapping):
+        return {str(k): _reference(v) for k, v in value.items()}
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
+        return [_reference(v) for v in value]
+    model_dump = getattr(value, "model_dump", None)
+    if callable(model_dump):
+        try:
+            return _reference(model_dump())
+        except Exception:
+            pass
+    if hasattr(value, "__dict__"):
+        try:
+            return _reference(dict(value.__dict__))
+        except Exception:
+            pass
+    return str(value)
+
+
+class InputDetails(BaseModel):
+    cached_tokens: int
+
+
+class Usage(BaseModel):
+    """Same shape as the OpenAI SDK's Responses usage model."""
+
+    input_tokens: int
+    input_tokens_details: InputDetails
+    output_tokens: int
+    total_tokens: int
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+@dataclass
+class Details:
+    cached_tokens: int
+    extra: Any = None
+
+
+class BrokenDump:
+    def __init__(self):
+        self.tokens = 3
+
+    def model_dump(self):
+        raise RuntimeError("boom")
+
+
+class Slotted:
+    __slots__ = ("x",)
+
+    def __init__(self):
+        self.x = 1
+
+
+def _samples():
+    usage = Usage(
+        input_tokens=120,
+        input_tokens_details=InputDetails(cached_tokens=64),
+        output_tokens=30,
+        total_tokens=150,
+    )
+    return [
+        None,
+        usage,
+        {"usage": usage, 1: "int key", (1, 2): [usage, None]},
+        {"a": [1, 2.5, True, "s", b"bytes", bytearray(b"x"), {1, 2}, (3, 4)]},
+        OrderedDict(b=1, a=2),
+        UserDict({"k": Color.RED}),
+        Details(cached_tokens=5, extra=Details(1)),
+        BrokenDump(),
+        Slotted(),
+        [[[]], {}, ()],
+        range(3),
+        "plain",
+        Color.RED,
+    ]
+
+
+def test_normalize_usage_matches_reference_exactly():
+    for sample in _samples():
+        got = normalize_usage(sample)
+        want = _reference(sample)
+        assert got == want
+        assert type(got) is type(want)
+
+
+def test_normalize_usage_is_stable_across_repeated_calls():
+    # Second pass goes through the cached per-class handlers.
+    samples = _samples()
+    first = [normalize_usage(s) for s in samples]
+    second = [normalize_usage(s) for s in samples]
+    assert first == second